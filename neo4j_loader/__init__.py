@@ -4,15 +4,64 @@ Neo4j Data Loader Package
 A Python package for loading structured JSON data into Neo4j databases.
 """
 
+from .core.async_loader import AsyncNeo4jLoader
+from .core.binary import read_graph_file, write_graph_file
+from .core.bulk_import import BulkImportExporter
+from .core.catalog import CatalogTransformer
+from .core.checkpoint import Checkpoint
+from .core.dead_letter import DeadLetterFile
+from .core.delta import DeltaIndex
+from .core.graph import CompactGraph
 from .core.loader import Neo4jLoader
-from .utils.file_utils import load_json_file
+from .core.schema import SchemaManager
+from .core.service import LoaderService
+from .core.sizing import BatchSizer
+from .core.validation import validate_payload
+from .core.merge import merge_payloads
+from .core.metrics import LoadMetrics
+from .core.resolution import EntityResolver
+from .utils.file_utils import (
+    convert_to_ndjson,
+    find_json_files,
+    iter_json_array,
+    iter_json_arrays,
+    iter_json_batches,
+    iter_ndjson,
+    load_json_file,
+    open_input,
+    split_lines,
+)
 from .utils.logging_utils import setup_logging
 from .config.arguments import parse_args, get_password
 
 __version__ = "1.0.0"
 __all__ = [
     "Neo4jLoader",
+    "AsyncNeo4jLoader",
+    "BatchSizer",
+    "BulkImportExporter",
+    "CatalogTransformer",
+    "Checkpoint",
+    "CompactGraph",
+    "DeadLetterFile",
+    "DeltaIndex",
+    "EntityResolver",
+    "LoadMetrics",
+    "LoaderService",
+    "SchemaManager",
+    "validate_payload",
     "load_json_file",
+    "open_input",
+    "find_json_files",
+    "convert_to_ndjson",
+    "merge_payloads",
+    "read_graph_file",
+    "write_graph_file",
+    "iter_json_array",
+    "iter_json_arrays",
+    "iter_json_batches",
+    "iter_ndjson",
+    "split_lines",
     "setup_logging",
     "parse_args",
     "get_password",
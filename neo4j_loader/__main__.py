@@ -5,23 +5,273 @@ This module serves as the main entry point for the application, coordinating
 the interaction between different components and handling the main execution flow.
 """
 
+import os
 import sys
+import json
 import logging
+import argparse
+import itertools
+from typing import List, Optional
 
+from .core.binary import is_graph_file, read_graph_file, write_graph_file
+from .core.bulk_import import BulkImportExporter
+from .core.catalog import CATALOG_LABELS, CatalogTransformer
+from .core.checkpoint import Checkpoint
+from .core.dead_letter import DeadLetterFile, load_dead_letters
+from .core.delta import DeltaIndex
+from .core.graph import CompactGraph, load_graphs
 from .core.loader import Neo4jLoader
-from .utils.file_utils import load_json_file
+from .core.metrics import LoadMetrics
+from .core.resolution import EntityResolver
+from .core.schema import SchemaManager
+from .core.sizing import DEFAULT_MAX_BATCH_BYTES, BatchSizer
+from .core.service import LoaderService, serve
+from .core.validation import validate_payload
+from .utils.file_utils import (
+    STDIN,
+    convert_to_ndjson,
+    find_json_files,
+    iter_json_array,
+)
 from .utils.logging_utils import setup_logging
 from .config.arguments import parse_args, get_password
 
 logger = logging.getLogger(__name__)
 
 
+def input_paths(args: argparse.Namespace) -> List[str]:
+    """
+    Resolve the input files selected by ``--file``, ``--dir`` or ``--replay``.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Input file paths in load order
+    """
+    if args.dir:
+        return find_json_files(args.dir, args.pattern)
+    if args.replay:
+        return [args.replay]
+    return [args.file]
+
+
+def read_input(paths: List[str], replay: bool = False) -> CompactGraph:
+    """
+    Parse the input files into a single compact graph.
+
+    Files are parsed incrementally into the columns of the graph, so the
+    records never exist as a full list of dictionaries. Several files, and
+    the line-aligned shards of a large NDJSON file, are parsed in a process
+    pool and merged so that entities shared between them are written once.
+    Compiled graph files are mapped as they are, without parsing.
+
+    Args:
+        paths: Input file paths in load order
+        replay: Whether the single path is a dead-letter file
+
+    Returns:
+        Graph holding the nodes and relationships
+    """
+    if replay:
+        return CompactGraph.from_payload(load_dead_letters(paths[0]))
+    if len(paths) > 1:
+        logger.info(f"Parsing {len(paths)} files")
+    graphs: List[CompactGraph] = []
+    # A mapped graph cannot be sent to a worker process, so runs of compiled
+    # files are mapped here and the files between them parsed in the pool
+    for compiled, group in itertools.groupby(paths, is_graph_file):
+        if compiled:
+            graphs.extend(read_graph_file(path) for path in group)
+        else:
+            graphs.extend(load_graphs(list(group)))
+    return graphs[0] if len(graphs) == 1 else CompactGraph.merge(graphs)
+
+
+def batch_sizer(args: argparse.Namespace) -> Optional[BatchSizer]:
+    """
+    Build the batch sizer selected by the batch sizing arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Batch sizer, or None when batches keep a fixed ``--batch-size``;
+        the sizer keeps a byte ceiling even without ``--max-batch-bytes``
+    """
+    options = (args.target_latency, args.max_batch_bytes, args.max_write_rate)
+    if all(option is None for option in options):
+        return None
+    return BatchSizer(
+        args.batch_size,
+        target_latency=args.target_latency,
+        max_bytes=(
+            DEFAULT_MAX_BATCH_BYTES if args.max_batch_bytes is None else args.max_batch_bytes
+        ),
+        max_rows_per_second=args.max_write_rate,
+    )
+
+
+def resolve_entities(graph: CompactGraph, resolver: EntityResolver) -> CompactGraph:
+    """
+    Fold near-duplicate entities of a graph.
+
+    Args:
+        graph: Graph holding the nodes and relationships
+        resolver: Entity resolver to apply
+
+    Returns:
+        Graph holding the resolved nodes and relationships
+    """
+    return resolver.resolve_graph(graph)
+
+
+def run_service(args: argparse.Namespace, password: str) -> None:
+    """
+    Run the loader service until it is interrupted.
+
+    Args:
+        args: Parsed command line arguments
+        password: Neo4j password
+    """
+    dead_letters = DeadLetterFile(args.dead_letter_file)
+    try:
+        loader = Neo4jLoader(
+            uri=args.uri,
+            username=args.user,
+            password=password,
+            encrypted=args.secure,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            pipeline=not args.no_pipeline,
+            sizer=batch_sizer(args),
+            dead_letters=dead_letters,
+        )
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit(1)
+
+    try:
+        service = LoaderService(
+            loader,
+            ensure_schema=not args.skip_schema,
+            coalesce_window=args.coalesce_ms / 1000,
+        )
+        serve(service, args.host, args.port, args.socket)
+    finally:
+        dead_letters.close()
+        loader.close()
+
+
 def main() -> None:
     """Main function to execute the script."""
     args = parse_args()
     
     # Set logging level
     setup_logging(args.log_level)
+
+    catalog = args.format == "catalog"
+    compiled = bool(args.file) and is_graph_file(args.file)
+    if (args.dir or args.replay) and (
+        args.stream or catalog or args.mode in ("export-import", "convert")
+    ):
+        logger.error("--stream, --format catalog, export-import and convert read a single --file")
+        sys.exit(1)
+    if catalog and args.mode in ("export-import", "convert"):
+        logger.error(f"{args.mode} reads the nodes/relationships format")
+        sys.exit(1)
+    if args.file == STDIN and (
+        args.stream
+        or catalog
+        or args.checkpoint
+        or args.resume
+        or args.mode in ("export-import", "convert")
+    ):
+        logger.error(
+            "Standard input is read once, as NDJSON; it cannot be combined with "
+            "--stream, --format catalog, --checkpoint, --resume, export-import or convert"
+        )
+        sys.exit(1)
+    if compiled and (catalog or args.mode in ("export-import", "convert")):
+        logger.error(
+            f"{args.file} is a compiled graph file; it cannot be read with "
+            "--format catalog, export-import or convert"
+        )
+        sys.exit(1)
+    if args.mode == "compile" and (catalog or args.output == STDIN):
+        logger.error("compile reads the nodes/relationships format and needs an --output file")
+        sys.exit(1)
+    if args.resolve_entities and (args.stream or catalog or args.mode == "export-import"):
+        logger.error(
+            "--resolve-entities needs every node in memory; "
+            "it cannot be combined with --stream, --format catalog or export-import"
+        )
+        sys.exit(1)
+
+    resolver = None
+    if args.resolve_entities:
+        try:
+            resolver = EntityResolver.from_names(
+                name.strip() for name in args.normalizers.split(",") if name.strip()
+            )
+        except ValueError as e:
+            logger.error(f"An error occurred: {e}")
+            sys.exit(1)
+
+    # Pre-flight validation does not need a database connection
+    if args.validate_only:
+        try:
+            if args.dir or args.replay or resolver or compiled or args.file == STDIN:
+                json_data = read_input(input_paths(args), bool(args.replay))
+                if resolver:
+                    json_data = resolve_entities(json_data, resolver)
+                report = validate_payload(json_data.nodes, json_data.relationships)
+            elif catalog:
+                transformer = CatalogTransformer(args.file)
+                report = validate_payload(
+                    transformer.iter_nodes(), transformer.iter_relationships()
+                )
+            else:
+                report = validate_payload(
+                    iter_json_array(args.file, "nodes"),
+                    iter_json_array(args.file, "relationships"),
+                )
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            sys.exit(1)
+        if args.report:
+            with open(args.report, "w") as file:
+                json.dump(report, file, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        sys.exit(0 if report["valid"] else 1)
+
+    # Conversion, compilation and offline export do not need a database connection
+    if args.mode == "compile":
+        try:
+            graph = read_input(input_paths(args), bool(args.replay))
+            if resolver:
+                graph = resolve_entities(graph, resolver)
+            write_graph_file(graph, args.output)
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            sys.exit(1)
+        return
+    if args.mode == "convert":
+        try:
+            convert_to_ndjson(args.file, args.output)
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            sys.exit(1)
+        return
+    if args.mode == "export-import":
+        try:
+            BulkImportExporter(args.output_dir).export(args.file)
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            sys.exit(1)
+        return
     
     # Get password from args or environment
     password = get_password(args)
@@ -30,10 +280,28 @@ def main() -> None:
             "Neo4j password not provided. Use --password or set NEO4J_PASSWORD environment variable."
         )
         sys.exit(1)
+
+    if args.mode == "serve":
+        run_service(args, password)
+        return
     
+    metrics = LoadMetrics()
+
     try:
-        # Load JSON data
-        json_data = load_json_file(args.file)
+        # Load JSON data, unless it is streamed straight into the writer;
+        # a compiled graph is mapped rather than streamed
+        paths = input_paths(args)
+        if (args.stream and not compiled) or catalog:
+            json_data = None
+        else:
+            with metrics.phase("parse"):
+                json_data = read_input(paths, bool(args.replay))
+            if resolver:
+                with metrics.phase("resolve_entities"):
+                    json_data = resolve_entities(json_data, resolver)
+
+        # Records the database rejects are isolated and kept for --replay
+        dead_letters = DeadLetterFile(args.dead_letter_file)
         
         # Initialize loader
         loader = Neo4jLoader(
@@ -41,16 +309,72 @@ def main() -> None:
             username=args.user,
             password=password,
             encrypted=args.secure,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            pipeline=not args.no_pipeline,
+            sizer=batch_sizer(args),
+            metrics=metrics,
+            dead_letters=dead_letters,
         )
         
+        # Create constraints and indexes so that MERGE on name is index-backed;
+        # a streamed file gets them per label while its nodes are read
+        schema = None if args.skip_schema else SchemaManager(loader.driver)
+        if schema and (catalog or json_data is not None):
+            if catalog:
+                labels = set(CATALOG_LABELS)
+            else:
+                labels = SchemaManager.collect_labels({"nodes": json_data.nodes})
+            with metrics.phase("schema"):
+                schema.ensure_schema(labels)
+
+        # Record committed batches, when asked to, so an interrupted run can be resumed
+        checkpoint = (
+            Checkpoint.for_files(args.checkpoint_file, paths, resume=args.resume)
+            if (args.checkpoint or args.resume) and STDIN not in paths
+            else None
+        )
+
+        # Skip entities whose content is unchanged since the last run
+        delta = DeltaIndex(args.delta_index, args.uri) if args.incremental else None
+
         # Load data into Neo4j
-        nodes_count, rels_count = loader.load_data(json_data)
+        if catalog:
+            # The catalog is transformed on the fly, one industry at a time
+            transformer = CatalogTransformer(args.file, args.batch_size)
+            nodes_count, rels_count = loader.load_batches(
+                transformer.node_batches(),
+                transformer.relationship_batches(),
+                checkpoint,
+                delta,
+            )
+        elif json_data is None:
+            nodes_count, rels_count = loader.load_file_stream(
+                args.file, checkpoint, delta, schema
+            )
+        else:
+            nodes_count, rels_count = loader.load_data(json_data, checkpoint, delta)
         logger.info(f"Data loading completed. Created {nodes_count} nodes and {rels_count} relationships.")
+        metrics.log_summary()
+
+        # A fully replayed dead-letter file has nothing left to retry
+        if (
+            args.replay
+            and dead_letters.count == 0
+            and os.path.abspath(args.replay) == os.path.abspath(args.dead_letter_file)
+        ):
+            os.remove(args.replay)
+            logger.info(f"All records in {args.replay} were loaded; file removed")
         
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         sys.exit(1)
     finally:
+        # Metrics of a failed load show where it stopped
+        if args.metrics_file:
+            metrics.write_json(args.metrics_file)
+        if 'dead_letters' in locals():
+            dead_letters.close()
         # Ensure connection is closed
         if 'loader' in locals() and loader.driver:
             loader.close()
@@ -0,0 +1,16 @@
+"""
+Benchmarks for Neo4j data loading.
+"""
+
+from .fake_driver import AsyncFakeDriver, FakeDriver
+from .generator import generate_graph
+from .runner import MODES, BenchmarkRunner, format_results
+
+__all__ = [
+    "AsyncFakeDriver",
+    "BenchmarkRunner",
+    "FakeDriver",
+    "MODES",
+    "format_results",
+    "generate_graph",
+]
@@ -0,0 +1,169 @@
+"""
+Command line entry point for the loader benchmarks.
+
+This module generates a synthetic graph, runs the selected loader modes over
+it and prints a comparison table, optionally saving the results as JSON so
+runs can be compared over time.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from .generator import DEGREE_DISTRIBUTIONS, generate_graph
+from .runner import MODES, BenchmarkRunner, format_results
+from ..utils.logging_utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Neo4j loaders on a synthetic graph"
+    )
+    parser.add_argument(
+        "--nodes", type=int, default=10000, help="Number of nodes (default: 10000)"
+    )
+    parser.add_argument(
+        "--avg-degree",
+        type=float,
+        default=2.0,
+        help="Average outgoing relationships per node (default: 2.0)",
+    )
+    parser.add_argument(
+        "--labels", type=int, default=5, help="Number of node labels (default: 5)"
+    )
+    parser.add_argument(
+        "--label-skew",
+        type=float,
+        default=1.0,
+        help="Zipf exponent of the label distribution; 0 is uniform (default: 1.0)",
+    )
+    parser.add_argument(
+        "--degree-distribution",
+        choices=DEGREE_DISTRIBUTIONS,
+        default="uniform",
+        help="Distribution of relationship endpoints (default: uniform)",
+    )
+    parser.add_argument(
+        "--relationship-types",
+        type=int,
+        default=3,
+        help="Number of relationship types (default: 3)",
+    )
+    parser.add_argument(
+        "--properties",
+        type=int,
+        default=3,
+        help="Properties per node and relationship (default: 3)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--modes",
+        default=",".join(MODES),
+        help=f"Comma-separated loader modes to run (default: {','.join(MODES)})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Maximum number of rows written per transaction (default: 1000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Writer threads of the parallel mode (default: 4)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4,
+        help="Concurrent transactions of the async mode (default: 4)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=1.0,
+        help="Simulated round-trip latency of the fake driver (default: 1.0)",
+    )
+    parser.add_argument(
+        "--uri",
+        help="Benchmark against this local Neo4j instead of the fake driver; "
+        "nodes with the generated Bench* labels are deleted before each mode",
+    )
+    parser.add_argument(
+        "--user", default="neo4j", help="Neo4j username (default: neo4j)"
+    )
+    parser.add_argument(
+        "--password", help="Neo4j password (if not provided, will look for NEO4J_PASSWORD env var)"
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Do not trace peak memory, which slows the loaders down",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        default="WARNING",
+        help="Set the logging level (default: WARNING)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main function to execute the benchmark."""
+    args = parse_args()
+    setup_logging(args.log_level)
+
+    password = args.password or os.environ.get("NEO4J_PASSWORD")
+    if args.uri and not password:
+        logger.error(
+            "Neo4j password not provided. Use --password or set NEO4J_PASSWORD environment variable."
+        )
+        sys.exit(1)
+
+    try:
+        payload = generate_graph(
+            nodes=args.nodes,
+            avg_degree=args.avg_degree,
+            labels=args.labels,
+            label_skew=args.label_skew,
+            degree_distribution=args.degree_distribution,
+            relationship_types=args.relationship_types,
+            properties=args.properties,
+            seed=args.seed,
+        )
+        runner = BenchmarkRunner(
+            batch_size=args.batch_size,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            latency=args.latency_ms / 1000,
+            uri=args.uri,
+            username=args.user,
+            password=password,
+            track_memory=not args.no_memory,
+        )
+        results = runner.run(payload, [mode.strip() for mode in args.modes.split(",")])
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit(1)
+
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+In-process fake Neo4j driver for loader benchmarks.
+
+This module contains FakeDriver and AsyncFakeDriver, which implement the part
+of the driver API the loaders use. They record every statement, simulate a
+fixed latency per round trip and keep enough graph state to return the same
+records and counters a database would for the loader's MERGE statements.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NODE_MERGE = re.compile(r"MERGE \(n:(?P<label>[^\s{]+) ")
+_LABEL_MATCH = re.compile(r"MATCH \(n:(?P<label>[^\s{]+) ")
+_RELATIONSHIP_MERGE = re.compile(
+    r"MATCH \(a:(?P<start>[^\s{]+) .*MATCH \(b:(?P<end>[^\s{]+) .*\[r:(?P<type>[^\]]+)\]"
+)
+
+
+class FakeCounters:
+    """Counters of a fake result summary."""
+
+    def __init__(self, **counters: int) -> None:
+        """
+        Initialize the counters.
+
+        Args:
+            **counters: Counter values; missing counters are 0
+        """
+        self.nodes_created = counters.get("nodes_created", 0)
+        self.relationships_created = counters.get("relationships_created", 0)
+        self.properties_set = counters.get("properties_set", 0)
+        self.constraints_added = counters.get("constraints_added", 0)
+        self.indexes_added = counters.get("indexes_added", 0)
+
+
+class FakeSummary:
+    """Summary of a fake result."""
+
+    def __init__(self, counters: FakeCounters) -> None:
+        """
+        Initialize the summary.
+
+        Args:
+            counters: Counters of the statement
+        """
+        self.counters = counters
+
+
+class FakeResult:
+    """Result of a statement run against the fake graph."""
+
+    def __init__(self, records: List[Dict[str, Any]], counters: FakeCounters) -> None:
+        """
+        Initialize the result.
+
+        Args:
+            records: Records returned by the statement
+            counters: Counters of the statement
+        """
+        self._records = records
+        self._counters = counters
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self) -> Optional[Dict[str, Any]]:
+        """Return the first record, if any."""
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict[str, Any]]:
+        """Return all records."""
+        return self._records
+
+    def consume(self) -> FakeSummary:
+        """Return the summary of the statement."""
+        return FakeSummary(self._counters)
+
+
+class FakeGraph:
+    """
+    Graph state and statement log shared by the sessions of a fake driver.
+
+    Only the statements the loaders send are interpreted: node and
+    relationship batch MERGEs and the endpoint label lookup. Other
+    statements (schema management) are recorded and return no records.
+    """
+
+    def __init__(self, latency: float = 0.0, record_parameters: bool = False) -> None:
+        """
+        Initialize an empty graph.
+
+        Args:
+            latency: Simulated latency per round trip, in seconds
+            record_parameters: Whether to keep the parameters of every
+                statement; off by default so the log does not dominate the
+                measured memory
+        """
+        self.latency = latency
+        self.record_parameters = record_parameters
+        self.statements: List[Tuple[str, Any]] = []
+        self.round_trips = 0
+        self.nodes: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self.relationships: Set[Tuple[str, Tuple[str, Any], Tuple[str, Any]]] = set()
+        self._lock = threading.Lock()
+
+    def round_trip(self) -> None:
+        """Count one round trip; the caller simulates its latency."""
+        with self._lock:
+            self.round_trips += 1
+
+    def run(self, query: str, parameters: Dict[str, Any]) -> FakeResult:
+        """
+        Run a statement against the graph.
+
+        Args:
+            query: Cypher statement
+            parameters: Statement parameters
+
+        Returns:
+            Result with the records and counters the database would return
+        """
+        with self._lock:
+            rows = parameters.get("rows")
+            self.statements.append(
+                (query, parameters if self.record_parameters else len(rows or ()))
+            )
+
+            node_merge = _NODE_MERGE.search(query)
+            if node_merge and rows is not None:
+                return self._merge_nodes(node_merge.group("label"), rows)
+
+            rel_merge = _RELATIONSHIP_MERGE.search(query)
+            if rel_merge and rows is not None:
+                return self._merge_relationships(
+                    rel_merge.group("type"),
+                    rel_merge.group("start"),
+                    rel_merge.group("end"),
+                    rows,
+                )
+
+            if "db.labels()" in query:
+                labels = sorted({label for label, _ in self.nodes})
+                return FakeResult([{"label": label} for label in labels], FakeCounters())
+
+            if "names" in parameters:
+                records = [
+                    {"name": name, "label": label}
+                    for label in _LABEL_MATCH.findall(query)
+                    for name in parameters["names"]
+                    if (label, name) in self.nodes
+                ]
+                return FakeResult(records, FakeCounters())
+
+            return FakeResult([], FakeCounters())
+
+    def _merge_nodes(self, label: str, rows: List[Dict[str, Any]]) -> FakeResult:
+        """Apply a node batch MERGE."""
+        created = 0
+        properties_set = 0
+        for row in rows:
+            key = (label, row["name"])
+            node = self.nodes.get(key)
+            if node is None:
+                node = self.nodes[key] = {"name": row["name"]}
+                created += 1
+                properties_set += 1
+            node.update(row["props"])
+            properties_set += len(row["props"])
+
+        counters = FakeCounters(nodes_created=created, properties_set=properties_set)
+        return FakeResult([{"count": len(rows)}], counters)
+
+    def _merge_relationships(
+        self, rel_type: str, start_label: str, end_label: str, rows: List[Dict[str, Any]]
+    ) -> FakeResult:
+        """Apply a relationship batch MERGE; rows with missing endpoints match nothing."""
+        merged = 0
+        created = 0
+        properties_set = 0
+        for row in rows:
+            start = (start_label, row["start"])
+            end = (end_label, row["end"])
+            if start not in self.nodes or end not in self.nodes:
+                continue
+            merged += 1
+            key = (rel_type, start, end)
+            if key not in self.relationships:
+                self.relationships.add(key)
+                created += 1
+            properties_set += len(row["props"])
+
+        counters = FakeCounters(
+            relationships_created=created, properties_set=properties_set
+        )
+        return FakeResult([{"count": merged}], counters)
+
+
+class FakeTransaction:
+    """Transaction on a fake driver."""
+
+    def __init__(self, graph: FakeGraph) -> None:
+        self._graph = graph
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> FakeResult:
+        """Run a statement within the transaction."""
+        return self._graph.run(query, {**(parameters or {}), **kwargs})
+
+
+class FakeSession:
+    """Session on a fake driver; every transaction costs one round trip."""
+
+    def __init__(self, graph: FakeGraph) -> None:
+        self._graph = graph
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _transaction(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        self._graph.round_trip()
+        if self._graph.latency:
+            time.sleep(self._graph.latency)
+        return transaction_function(FakeTransaction(self._graph), *args)
+
+    def execute_write(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        """Run a managed write transaction."""
+        return self._transaction(transaction_function, *args)
+
+    def execute_read(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        """Run a managed read transaction."""
+        return self._transaction(transaction_function, *args)
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> FakeResult:
+        """Run an auto-commit statement."""
+        return self._transaction(lambda tx: tx.run(query, parameters, **kwargs))
+
+    def close(self) -> None:
+        """Close the session."""
+
+
+class FakeDriver:
+    """In-process stand-in for ``neo4j.Driver``."""
+
+    def __init__(self, latency: float = 0.0, record_parameters: bool = False) -> None:
+        """
+        Initialize the FakeDriver.
+
+        Args:
+            latency: Simulated latency per round trip, in seconds
+            record_parameters: Whether to keep the parameters of every statement
+        """
+        self.graph = FakeGraph(latency, record_parameters)
+
+    @property
+    def statements(self) -> List[Tuple[str, Any]]:
+        """Statements run so far, with their parameters or row count."""
+        return self.graph.statements
+
+    @property
+    def round_trips(self) -> int:
+        """Number of round trips so far."""
+        return self.graph.round_trips
+
+    def verify_connectivity(self) -> None:
+        """Check connectivity; the fake is always reachable."""
+
+    def session(self, **config: Any) -> FakeSession:
+        """Open a session."""
+        return FakeSession(self.graph)
+
+    def close(self) -> None:
+        """Close the driver."""
+
+
+class AsyncFakeResult:
+    """Asynchronous view of a fake result."""
+
+    def __init__(self, result: FakeResult) -> None:
+        self._result = result
+
+    def __aiter__(self):
+        async def records():
+            for record in self._result:
+                yield record
+
+        return records()
+
+    async def single(self) -> Optional[Dict[str, Any]]:
+        """Return the first record, if any."""
+        return self._result.single()
+
+    async def data(self) -> List[Dict[str, Any]]:
+        """Return all records."""
+        return self._result.data()
+
+    async def consume(self) -> FakeSummary:
+        """Return the summary of the statement."""
+        return self._result.consume()
+
+
+class AsyncFakeTransaction:
+    """Transaction on an asynchronous fake driver."""
+
+    def __init__(self, graph: FakeGraph) -> None:
+        self._graph = graph
+
+    async def run(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> AsyncFakeResult:
+        """Run a statement within the transaction."""
+        return AsyncFakeResult(self._graph.run(query, {**(parameters or {}), **kwargs}))
+
+
+class AsyncFakeSession:
+    """Session on an asynchronous fake driver."""
+
+    def __init__(self, graph: FakeGraph) -> None:
+        self._graph = graph
+
+    async def __aenter__(self) -> "AsyncFakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _transaction(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        self._graph.round_trip()
+        if self._graph.latency:
+            await asyncio.sleep(self._graph.latency)
+        return await transaction_function(AsyncFakeTransaction(self._graph), *args)
+
+    async def execute_write(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        """Run a managed write transaction."""
+        return await self._transaction(transaction_function, *args)
+
+    async def execute_read(self, transaction_function: Callable[..., Any], *args: Any) -> Any:
+        """Run a managed read transaction."""
+        return await self._transaction(transaction_function, *args)
+
+    async def close(self) -> None:
+        """Close the session."""
+
+
+class AsyncFakeDriver:
+    """In-process stand-in for ``neo4j.AsyncDriver``."""
+
+    def __init__(self, latency: float = 0.0, record_parameters: bool = False) -> None:
+        """
+        Initialize the AsyncFakeDriver.
+
+        Args:
+            latency: Simulated latency per round trip, in seconds
+            record_parameters: Whether to keep the parameters of every statement
+        """
+        self.graph = FakeGraph(latency, record_parameters)
+
+    @property
+    def statements(self) -> List[Tuple[str, Any]]:
+        """Statements run so far, with their parameters or row count."""
+        return self.graph.statements
+
+    @property
+    def round_trips(self) -> int:
+        """Number of round trips so far."""
+        return self.graph.round_trips
+
+    async def verify_connectivity(self) -> None:
+        """Check connectivity; the fake is always reachable."""
+
+    def session(self, **config: Any) -> AsyncFakeSession:
+        """Open a session."""
+        return AsyncFakeSession(self.graph)
+
+    async def close(self) -> None:
+        """Close the driver."""
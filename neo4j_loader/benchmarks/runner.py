@@ -0,0 +1,317 @@
+"""
+Benchmark runner module for Neo4j data loading.
+
+This module runs the loaders in each of their modes over one payload and
+reports nodes/sec, edges/sec, round trips and peak memory, either against the
+in-process fake driver or against a local Neo4j database.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from neo4j import AsyncGraphDatabase, GraphDatabase
+
+from .fake_driver import AsyncFakeDriver, FakeDriver
+from .generator import LABEL_PREFIX
+from ..core.async_loader import AsyncNeo4jLoader
+from ..core.loader import DEFAULT_BATCH_SIZE, Neo4jLoader
+from ..core.metrics import LoadMetrics
+from ..core.schema import SchemaManager
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sync", "parallel", "stream", "async")
+
+
+class BenchmarkRunner:
+    """Runs loader modes over a payload and collects throughput figures."""
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = 4,
+        max_in_flight: int = 4,
+        latency: float = 0.0,
+        uri: Optional[str] = None,
+        username: str = "neo4j",
+        password: Optional[str] = None,
+        track_memory: bool = True,
+    ) -> None:
+        """
+        Initialize the BenchmarkRunner.
+
+        Without a ``uri`` every mode runs against a fresh FakeDriver. With a
+        ``uri`` the modes run against that database; nodes carrying the
+        generated benchmark labels are deleted before each mode, so it must
+        point at a local, disposable instance.
+
+        Args:
+            batch_size: Maximum number of rows per write transaction
+            workers: Writer threads of the ``parallel`` mode
+            max_in_flight: Concurrent transactions of the ``async`` mode
+            latency: Simulated round-trip latency of the fake driver, in seconds
+            uri: URI of a local Neo4j database to benchmark against, if any
+            username: Neo4j username
+            password: Neo4j password
+            track_memory: Whether to trace peak memory, which slows the run
+        """
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.latency = latency
+        self.uri = uri
+        self.username = username
+        self.password = password
+        self.track_memory = track_memory
+
+    def run(
+        self, payload: Dict[str, List[Dict[str, Any]]], modes: List[str] = MODES
+    ) -> List[Dict[str, Any]]:
+        """
+        Run each mode over the payload.
+
+        Args:
+            payload: Dictionary containing nodes and relationships
+            modes: Loader modes to run, from ``MODES``
+
+        Returns:
+            One result dictionary per mode
+        """
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise ValueError(f"Unknown benchmark modes: {sorted(unknown)}")
+
+        stream_file = None
+        if "stream" in modes:
+            # Written up front so the mode measures parsing, not this dump
+            with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+                json.dump(payload, file)
+                stream_file = file.name
+
+        try:
+            return [self._run_mode(mode, payload, stream_file) for mode in modes]
+        finally:
+            if stream_file:
+                os.remove(stream_file)
+
+    def _run_mode(
+        self,
+        mode: str,
+        payload: Dict[str, List[Dict[str, Any]]],
+        stream_file: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Run one mode on a fresh driver and measure it.
+
+        Args:
+            mode: Loader mode
+            payload: Dictionary containing nodes and relationships
+            stream_file: Path of the payload dumped as JSON, for ``stream``
+
+        Returns:
+            Result dictionary of the mode
+        """
+        metrics = LoadMetrics()
+        driver = self._driver(asynchronous=mode == "async")
+        try:
+            self._prepare(driver, payload, asynchronous=mode == "async")
+
+            if mode == "async":
+                loader = AsyncNeo4jLoader.from_driver(
+                    driver,
+                    batch_size=self.batch_size,
+                    max_in_flight=self.max_in_flight,
+                    metrics=metrics,
+                )
+                load = lambda: asyncio.run(self._load_async(loader, payload))
+            else:
+                loader = Neo4jLoader.from_driver(
+                    driver,
+                    batch_size=self.batch_size,
+                    workers=self.workers if mode == "parallel" else 1,
+                    metrics=metrics,
+                )
+                if mode == "stream":
+                    load = lambda: loader.load_file_stream(stream_file)
+                else:
+                    load = lambda: loader.load_data(payload)
+
+            seconds, peak = self._measure(load)
+        finally:
+            if mode != "async":
+                self._close(driver)
+
+        return self._result(mode, payload, seconds, peak, driver, metrics)
+
+    async def _load_async(
+        self, loader: AsyncNeo4jLoader, payload: Dict[str, List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Run an asynchronous load and close its driver in the same event loop.
+
+        Args:
+            loader: Asynchronous loader of the mode
+            payload: Dictionary containing nodes and relationships
+        """
+        try:
+            await loader.load_data(payload)
+        finally:
+            if not isinstance(loader.driver, AsyncFakeDriver):
+                await loader.driver.close()
+
+    def _measure(self, load: Callable[[], Any]) -> Tuple[float, Optional[int]]:
+        """
+        Time a load and trace its peak memory.
+
+        Args:
+            load: Function running the load
+
+        Returns:
+            Tuple of elapsed seconds and peak traced bytes (None if untracked)
+        """
+        if self.track_memory:
+            tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            load()
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if self.track_memory else None
+        finally:
+            if self.track_memory:
+                tracemalloc.stop()
+        return seconds, peak
+
+    def _result(
+        self,
+        mode: str,
+        payload: Dict[str, List[Dict[str, Any]]],
+        seconds: float,
+        peak: Optional[int],
+        driver: Any,
+        metrics: LoadMetrics,
+    ) -> Dict[str, Any]:
+        """
+        Build the result dictionary of a mode.
+
+        Round trips are counted by the fake driver. Against a database they
+        are taken from the metrics as write transactions, retries included.
+
+        Args:
+            mode: Loader mode
+            payload: Dictionary containing nodes and relationships
+            seconds: Elapsed time of the load
+            peak: Peak traced memory in bytes, if tracked
+            driver: Driver the mode ran on
+            metrics: Metrics recorded by the loader
+
+        Returns:
+            Result dictionary of the mode
+        """
+        nodes = len(payload["nodes"])
+        edges = len(payload["relationships"])
+        phases = metrics.as_dict()["phases"]
+        if isinstance(driver, (FakeDriver, AsyncFakeDriver)):
+            round_trips = driver.round_trips
+        else:
+            round_trips = sum(
+                totals["batches"] + totals["retries"] for totals in phases.values()
+            )
+
+        return {
+            "mode": mode,
+            "target": "neo4j" if self.uri else "fake",
+            "nodes": nodes,
+            "edges": edges,
+            "seconds": round(seconds, 6),
+            "nodes_per_second": round(nodes / seconds, 1) if seconds > 0 else None,
+            "edges_per_second": round(edges / seconds, 1) if seconds > 0 else None,
+            "round_trips": round_trips,
+            "peak_memory_bytes": peak,
+            "retries": sum(totals["retries"] for totals in phases.values()),
+            "failed_batches": sum(totals["failed_batches"] for totals in phases.values()),
+        }
+
+    def _driver(self, asynchronous: bool) -> Any:
+        """Create the driver of one mode."""
+        if self.uri is None:
+            return AsyncFakeDriver(self.latency) if asynchronous else FakeDriver(self.latency)
+        database = AsyncGraphDatabase if asynchronous else GraphDatabase
+        return database.driver(self.uri, auth=(self.username, self.password))
+
+    def _prepare(
+        self, driver: Any, payload: Dict[str, List[Dict[str, Any]]], asynchronous: bool
+    ) -> None:
+        """
+        Reset a database target before a mode runs.
+
+        Nodes with the benchmark labels are deleted, and the name constraints
+        are created so each mode writes against the same schema. Fake drivers
+        start empty and need nothing.
+
+        Args:
+            driver: Driver of the mode
+            payload: Dictionary containing nodes and relationships
+            asynchronous: Whether the driver is asynchronous
+        """
+        if self.uri is None:
+            return
+
+        # Schema and cleanup always go through a synchronous driver
+        if asynchronous:
+            driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+        try:
+            labels = SchemaManager.collect_labels(payload)
+            with driver.session() as session:
+                for label in sorted(labels):
+                    if not label.startswith(LABEL_PREFIX):
+                        continue
+                    session.run(
+                        f"MATCH (n:{label}) "
+                        "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+                    ).consume()
+            SchemaManager(driver).ensure_schema(labels)
+        finally:
+            if asynchronous:
+                driver.close()
+
+    @staticmethod
+    def _close(driver: Any) -> None:
+        """Close the synchronous driver of one mode."""
+        if not isinstance(driver, FakeDriver):
+            driver.close()
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """
+    Format benchmark results as a text table.
+
+    Args:
+        results: Result dictionaries from ``BenchmarkRunner.run``
+
+    Returns:
+        Table with one row per mode
+    """
+    headers = ["mode", "target", "seconds", "nodes/s", "edges/s", "round trips", "peak MiB"]
+    rows = [headers]
+    for result in results:
+        peak = result["peak_memory_bytes"]
+        rows.append([
+            result["mode"],
+            result["target"],
+            f"{result['seconds']:.3f}",
+            f"{result['nodes_per_second'] or 0:.1f}",
+            f"{result['edges_per_second'] or 0:.1f}",
+            str(result["round_trips"]),
+            f"{peak / (1024 * 1024):.1f}" if peak is not None else "-",
+        ])
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
@@ -20,7 +20,43 @@ def parse_args() -> argparse.Namespace:
         description="Load structured JSON data into Neo4j database"
     )
     parser.add_argument(
-        "--file", "-f", required=True, help="Path to the JSON data file"
+        "mode",
+        nargs="?",
+        choices=["load", "export-import", "serve", "convert", "compile"],
+        default="load",
+        help="load: write into a running database (default); "
+        "export-import: write CSV files for neo4j-admin database import; "
+        "serve: keep a warm connection and accept load jobs over HTTP; "
+        "convert: rewrite a JSON file as NDJSON; "
+        "compile: write the input as a binary graph file that loads without parsing",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--file",
+        "-f",
+        help="Path to the JSON data file; .ndjson and .jsonl files, and - for "
+        "standard input, are read as one record per line, and graph files "
+        "written by compile are mapped without parsing",
+    )
+    source.add_argument(
+        "--dir",
+        help="Directory of JSON data files, parsed in parallel and merged before loading",
+    )
+    source.add_argument(
+        "--replay",
+        help="Load the records of a dead-letter file written by an earlier run",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["graph", "catalog"],
+        default="graph",
+        help="graph: nodes/relationships arrays (default); "
+        "catalog: nested industries catalog, transformed while streaming",
+    )
+    parser.add_argument(
+        "--pattern",
+        default="*.json",
+        help="Glob pattern selecting files in --dir; ** matches subdirectories (default: *.json)",
     )
     parser.add_argument(
         "--uri",
@@ -39,13 +75,148 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use encrypted connection (default: True)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Maximum number of rows written per transaction (default: 1000)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the input incrementally instead of loading it into memory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent writer threads (default: 1)",
+    )
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_true",
+        help="With several workers, write every node before the first relationship",
+    )
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        help="Commit latency in seconds that per-label and per-type batch sizes adapt to",
+    )
+    parser.add_argument(
+        "--max-batch-bytes",
+        type=int,
+        help="Cut batches short before their parameters exceed this many bytes "
+        "(default: 8388608 whenever batch sizes adapt)",
+    )
+    parser.add_argument(
+        "--max-write-rate",
+        type=float,
+        help="Maximum number of rows written per second across all workers",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Record committed batches so an interrupted run can be continued with --resume",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip batches already committed by a previous checkpointed run on the same file",
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        default=".neo4j_loader_checkpoint.json",
+        help="Path to the checkpoint file (default: .neo4j_loader_checkpoint.json)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only write nodes and relationships that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--delta-index",
+        default=".neo4j_loader_delta.json",
+        help="Path to the content hash index used by --incremental "
+        "(default: .neo4j_loader_delta.json)",
+    )
+    parser.add_argument(
+        "--resolve-entities",
+        action="store_true",
+        help="Fold nodes whose names differ only in case, punctuation or "
+        "parenthetical qualifiers into one node before loading",
+    )
+    parser.add_argument(
+        "--normalizers",
+        default="strip_parenthetical,casefold,strip_punctuation,collapse_whitespace",
+        help="Comma-separated name normalizers applied in order by --resolve-entities "
+        "(default: strip_parenthetical,casefold,strip_punctuation,collapse_whitespace)",
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Check the payload without connecting to Neo4j and print a JSON report",
+    )
+    parser.add_argument(
+        "--report",
+        help="Write the --validate-only JSON report to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--dead-letter-file",
+        default=".neo4j_loader_dead_letters.jsonl",
+        help="Where records rejected by the database are written with their errors "
+        "(default: .neo4j_loader_dead_letters.jsonl)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write per-phase and per-batch timings and server counters to this JSON file",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="NDJSON file written by convert, - for standard output (default: -); "
+        "graph file written by compile",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="import",
+        help="Directory for export-import CSV files (default: import)",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface the serve mode listens on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="TCP port the serve mode listens on (default: 8765)",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket path for the serve mode to listen on instead of TCP",
+    )
+    parser.add_argument(
+        "--coalesce-ms",
+        type=float,
+        default=50,
+        help="How long the serve mode waits for more jobs to merge into one load (default: 50)",
+    )
+    parser.add_argument(
+        "--skip-schema",
+        action="store_true",
+        help="Do not create name constraints and indexes before loading",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         default="INFO",
         help="Set the logging level (default: INFO)",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.mode != "serve" and not (args.file or args.dir or args.replay):
+        parser.error("one of the arguments --file/-f --dir --replay is required")
+    return args
 
 
 def get_password(args: argparse.Namespace) -> Optional[str]:
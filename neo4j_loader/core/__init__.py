@@ -2,6 +2,39 @@
 Core functionality for Neo4j data loading.
 """
 
+from .async_loader import AsyncNeo4jLoader
+from .binary import read_graph_file, write_graph_file
+from .bulk_import import BulkImportExporter
+from .catalog import CatalogTransformer
+from .checkpoint import Checkpoint
+from .dead_letter import DeadLetterFile
+from .delta import DeltaIndex
+from .graph import CompactGraph
 from .loader import Neo4jLoader
+from .merge import merge_payloads
+from .metrics import LoadMetrics
+from .resolution import EntityResolver
+from .schema import SchemaManager
+from .service import LoaderService
+from .sizing import BatchSizer
+from .validation import validate_payload
 
-__all__ = ["Neo4jLoader"] 
\ No newline at end of file
+__all__ = [
+    "AsyncNeo4jLoader",
+    "BatchSizer",
+    "BulkImportExporter",
+    "CatalogTransformer",
+    "Checkpoint",
+    "CompactGraph",
+    "DeadLetterFile",
+    "DeltaIndex",
+    "EntityResolver",
+    "LoadMetrics",
+    "LoaderService",
+    "Neo4jLoader",
+    "SchemaManager",
+    "merge_payloads",
+    "read_graph_file",
+    "validate_payload",
+    "write_graph_file",
+] 
\ No newline at end of file
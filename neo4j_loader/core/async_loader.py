@@ -0,0 +1,570 @@
+"""
+Asynchronous module for Neo4j data loading operations.
+
+This module contains the AsyncNeo4jLoader class, an asyncio counterpart of
+Neo4jLoader built on the neo4j async driver. It sends the same batches and
+statements as the synchronous loader while keeping several batch transactions
+in flight, so network latency overlaps with work on the server.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Any, Awaitable, Callable, Hashable, Optional, Set, Tuple, Union
+
+from neo4j import AsyncGraphDatabase, AsyncManagedTransaction
+from neo4j.exceptions import ServiceUnavailable, TransientError
+
+from .base import BaseLoader
+from .checkpoint import Checkpoint
+from .dead_letter import DeadLetterFile
+from .delta import DeltaIndex
+from .graph import CompactGraph, RecordView
+from .loader import DEFAULT_BATCH_SIZE
+from .metrics import LoadMetrics, server_counters
+from .pipeline import PipelineScheduler
+from .pool import DEFAULT_MAX_RETRIES, backoff_delay, gather_or_cancel, partition_disjoint
+from .queries import (
+    DB_LABELS_QUERY,
+    RelationshipKey,
+    first_labels,
+    lookup_labels_query,
+    missing_endpoints,
+    node_batch_query,
+    relationship_batch_nodes,
+    relationship_batch_query,
+    report_unresolved,
+)
+from .sizing import BatchSizer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+class AsyncNeo4jLoader(BaseLoader):
+    """Handles loading data into Neo4j from a structured JSON file with asyncio."""
+
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        encrypted: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        metrics: Optional[LoadMetrics] = None,
+        dead_letters: Optional[DeadLetterFile] = None,
+        pipeline: bool = True,
+        sizer: Optional[BatchSizer] = None,
+        driver: Any = None,
+    ) -> None:
+        """
+        Initialize the AsyncNeo4jLoader with connection parameters.
+
+        The connection is opened by :meth:`connect`, or on first use, since
+        it has to be awaited.
+
+        Args:
+            uri: The URI for the Neo4j database
+            username: Neo4j username
+            password: Neo4j password
+            encrypted: Whether to use encryption for the connection
+            batch_size: Maximum number of rows sent per write transaction;
+                with a sizer, the size of the first batch of every key
+            max_in_flight: Maximum number of concurrent batch transactions
+            metrics: Metrics collector shared with the caller; a new one is
+                created when omitted
+            dead_letters: File receiving records the database rejects; when
+                omitted they are only logged
+            pipeline: Whether relationship batches may start while nodes are
+                still being written; only used with several transactions in
+                flight and when not resuming from checkpointed offsets
+            sizer: Batch sizer adapting the rows per transaction of every
+                label and relationship type; ``batch_size`` is fixed when
+                omitted
+            driver: Open asynchronous driver to use instead of connecting;
+                it stays owned by the caller and is left open by :meth:`close`
+        """
+        super().__init__(
+            uri, username, password, encrypted, batch_size, metrics, dead_letters,
+            pipeline, sizer, driver,
+        )
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.max_in_flight = max_in_flight
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncNeo4jLoader":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """
+        Establish a connection to the Neo4j database.
+
+        Raises:
+            ServiceUnavailable: If connection to Neo4j fails
+        """
+        if not self._owns_driver:
+            return
+        try:
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.username, self.password),
+                encrypted=self.encrypted,
+            )
+            # Verify connection is working
+            await self.driver.verify_connectivity()
+            logger.info(f"Successfully connected to Neo4j database at {self.uri}")
+        except ServiceUnavailable as e:
+            logger.error(f"Failed to connect to Neo4j: {e}")
+            raise
+
+    async def close(self) -> None:
+        """Close the Neo4j database connection, unless the caller owns the driver."""
+        if self.driver and self._owns_driver:
+            await self.driver.close()
+            self.driver = None
+            logger.info("Neo4j connection closed")
+
+    async def load_data(
+        self,
+        json_data: Union[CompactGraph, Dict[str, List[Dict[str, Any]]]],
+        checkpoint: Optional[Checkpoint] = None,
+        delta: Optional[DeltaIndex] = None,
+    ) -> Tuple[int, int]:
+        """
+        Load data from parsed JSON into Neo4j.
+
+        The payload is held as a :class:`CompactGraph`; a dictionary payload
+        is converted first. Rows are built one batch at a time while writing.
+
+        Args:
+            json_data: Compact graph, or dictionary containing nodes and
+                relationships
+            checkpoint: Checkpoint recording committed records per phase; when
+                given, records it already covers are skipped
+            delta: Delta index of previously written content hashes; when
+                given, only new or changed records are written
+
+        Returns:
+            Tuple containing count of created nodes and relationships
+        """
+        if self.driver is None:
+            await self.connect()
+        # The semaphore must belong to the running event loop
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        nodes_count = 0
+        rels_count = 0
+        rels_matched = 0
+        self._delta = delta
+
+        try:
+            nodes, relationships, name_labels = self._prepare(json_data, delta)
+
+            # Resolve relationship endpoint labels before anything is written
+            if relationships:
+                with self.metrics.phase("resolve"):
+                    await self._resolve_endpoint_labels(relationships, name_labels)
+
+            if self._pipelined(nodes, relationships, checkpoint, self.max_in_flight):
+                nodes_count, rels_count, rels_matched = await self._load_pipelined(
+                    nodes, relationships, name_labels, checkpoint
+                )
+                logger.info(f"Successfully created {nodes_count} nodes")
+                logger.info(
+                    f"Successfully created {rels_count} relationships "
+                    f"({rels_matched} already existed)"
+                )
+            else:
+                if nodes:
+                    with self.metrics.phase("nodes"):
+                        nodes_count = await self._write_node_groups(
+                            self._node_groups(nodes, checkpoint)
+                        )
+                    logger.info(f"Successfully created {nodes_count} nodes")
+
+                if relationships:
+                    with self.metrics.phase("relationships"):
+                        rels_count, rels_matched = await self._write_relationship_groups(
+                            self._relationship_groups(relationships, name_labels, checkpoint)
+                        )
+                    logger.info(
+                        f"Successfully created {rels_count} relationships "
+                        f"({rels_matched} already existed)"
+                    )
+
+            self._finish(checkpoint, delta)
+            return nodes_count, rels_count
+
+        except Exception as e:
+            logger.error(f"Error loading data: {e}")
+            raise
+        finally:
+            self._delta = None
+            self._progress = {}
+
+    async def _load_pipelined(
+        self,
+        nodes: RecordView,
+        relationships: RecordView,
+        name_labels: Dict[str, str],
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Tuple[int, int, int]:
+        """
+        Write nodes and relationships with overlapping phases.
+
+        Each relationship batch is released as soon as the node batches
+        holding its endpoints have committed, with up to ``max_in_flight``
+        batches written at a time.
+
+        Args:
+            nodes: Nodes of a compact graph
+            relationships: Relationships of the same graph
+            name_labels: Dictionary mapping node names to sanitized labels
+            checkpoint: Checkpoint recording committed records per phase
+
+        Returns:
+            Tuple containing count of created nodes, created relationships
+            and already existing relationships
+        """
+        node_batches, relationship_batches, dependencies = self._plan_pipeline(
+            nodes, relationships, name_labels, checkpoint
+        )
+        scheduler = PipelineScheduler(self.driver, self.max_in_flight, self.metrics)
+        nodes_count, created, merged = await scheduler.run_async(
+            node_batches,
+            relationship_batches,
+            dependencies,
+            self._write_node_batch,
+            self._write_relationship_batch,
+        )
+        return nodes_count, created, merged - created
+
+    async def _resolve_endpoint_labels(
+        self, relationships: List[Dict[str, Any]], name_labels: Dict[str, str]
+    ) -> None:
+        """
+        Complete ``name_labels`` with every relationship endpoint name.
+
+        Args:
+            relationships: List of relationship dictionaries from the payload
+            name_labels: Dictionary mapping node names to sanitized labels,
+                updated in place
+        """
+        missing = missing_endpoints(relationships, name_labels)
+        if missing:
+            async with self.driver.session() as session:
+                name_labels.update(
+                    await session.execute_read(self._lookup_labels_tx, missing)
+                )
+
+        report_unresolved(relationships, name_labels)
+
+    @staticmethod
+    async def _lookup_labels_tx(
+        tx: AsyncManagedTransaction, names: List[str]
+    ) -> Dict[str, str]:
+        """
+        Look up the labels of existing nodes by name within a transaction.
+
+        Args:
+            tx: Neo4j transaction
+            names: Node names to look up
+
+        Returns:
+            Dictionary mapping the names that were found to their first label
+        """
+        result = await tx.run(DB_LABELS_QUERY)
+        query = lookup_labels_query([record["label"] async for record in result])
+        if query is None:
+            return {}
+        result = await tx.run(query, names=names)
+        return first_labels([record async for record in result])
+
+    async def _run_rounds(
+        self,
+        batches: List[Tuple[Any, List[Dict[str, Any]]]],
+        keys_of: Callable[[Tuple[Any, List[Dict[str, Any]]]], Set[Hashable]],
+        write: Callable[[Any, List[Dict[str, Any]]], Awaitable[Any]],
+    ) -> List[Any]:
+        """
+        Write batches concurrently, never running two that touch the same node.
+
+        If a batch fails, the other batches of its round are cancelled before
+        the error is raised.
+
+        Args:
+            batches: Tuples of a grouping key and rows
+            keys_of: Function returning the node keys a batch touches
+            write: Coroutine function writing one batch
+
+        Returns:
+            List of the results of every batch
+        """
+        results: List[Any] = []
+        for batch_round in partition_disjoint(batches, keys_of):
+            results.extend(await gather_or_cancel(write(key, rows) for key, rows in batch_round))
+        return results
+
+    async def _execute_write(
+        self, transaction_function: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Tuple[Any, int]:
+        """
+        Run a managed write transaction, retrying transient errors.
+
+        Each transaction uses its own session, since sessions cannot be
+        shared between concurrent tasks. Transient errors that outlast the
+        driver's own retries are retried a few more times.
+
+        Args:
+            transaction_function: Transaction function to run
+            *args: Arguments passed to the transaction function
+
+        Returns:
+            Tuple of the return value of the transaction function and the
+            number of retries, counting those made by the driver itself
+
+        Raises:
+            TransientError: If the transaction still fails after all retries
+        """
+        calls = 0
+
+        async def counted(tx: AsyncManagedTransaction, *tx_args: Any) -> Any:
+            nonlocal calls
+            calls += 1
+            return await transaction_function(tx, *tx_args)
+
+        for attempt in range(DEFAULT_MAX_RETRIES + 1):
+            try:
+                async with self.driver.session() as session:
+                    return await session.execute_write(counted, *args), calls - 1
+            except TransientError as e:
+                if attempt == DEFAULT_MAX_RETRIES:
+                    raise
+                logger.warning(
+                    f"Transient error, retrying ({attempt + 1}/{DEFAULT_MAX_RETRIES}): {e}"
+                )
+                await asyncio.sleep(backoff_delay(attempt))
+
+    async def _write_node_groups(self, rows_by_label: Dict[str, RecordView]) -> int:
+        """
+        Write node rows grouped by label.
+
+        Each label is written in batches of at most ``plan_size`` rows, split
+        further to the sizes the sizer adapted to it, one transaction each.
+
+        Args:
+            rows_by_label: Dictionary mapping sanitized labels to their rows
+
+        Returns:
+            Number of nodes created
+        """
+        results = await self._run_rounds(
+            self._plan(rows_by_label),
+            lambda batch: {(batch[0], row["name"]) for row in batch[1]},
+            self._write_node_batch,
+        )
+        return sum(results)
+
+    async def _write_node_batch(self, label: str, batch: RecordView) -> int:
+        """
+        Write one planned batch of node rows.
+
+        With a batch sizer, the batch is written in transactions of the size
+        currently adapted to its label.
+
+        Args:
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Number of nodes created
+        """
+        if self.sizer:
+            created = sum(await self.sizer.write_async(
+                ("nodes", label), batch, lambda rows: self._write_node_rows(label, rows)
+            ))
+        else:
+            created = await self._write_node_rows(label, batch)
+        self._committed("nodes", batch)
+        return created
+
+    async def _write_node_rows(self, label: str, batch: List[Dict[str, Any]]) -> int:
+        """
+        Write node rows in one transaction, isolating rejected rows by bisection.
+
+        The transaction waits for an in-flight slot first; its time in the
+        metrics starts once the slot is held.
+
+        Args:
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Number of nodes created
+        """
+        async with self._in_flight:
+            start = time.perf_counter()
+            try:
+                (created, counters), retries = await self._execute_write(
+                    self._create_node_batch_tx, label, batch
+                )
+            except Exception as e:
+                bisect = self._node_rows_failed(label, batch, e, time.perf_counter() - start)
+            else:
+                return self._node_rows_written(
+                    label, batch, created, counters, time.perf_counter() - start, retries
+                )
+
+        # The halves are written after the slot is released
+        if not bisect:
+            return 0
+        middle = len(batch) // 2
+        first = await self._write_node_rows(label, batch[:middle])
+        return first + await self._write_node_rows(label, batch[middle:])
+
+    @staticmethod
+    async def _create_node_batch_tx(
+        tx: AsyncManagedTransaction, label: str, rows: List[Dict[str, Any]]
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Create a batch of nodes sharing one label within a transaction.
+
+        Args:
+            tx: Neo4j transaction
+            label: Sanitized label (type) of the nodes
+            rows: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing number of nodes created, not counting nodes
+            that already existed, and the server counters of the statement
+        """
+        # Views of a compact graph are built into rows here, one batch at a time
+        result = await tx.run(node_batch_query(label), rows=list(rows))
+        summary = await result.consume()
+        counters = server_counters(summary.counters)
+        return counters["nodes_created"], counters
+
+    async def _write_relationship_groups(
+        self, rows_by_key: Dict[RelationshipKey, RecordView]
+    ) -> Tuple[int, int]:
+        """
+        Write relationship rows grouped by type and endpoint labels.
+
+        Batches in flight together share no endpoint node, so they cannot
+        deadlock on each other's locks.
+
+        Args:
+            rows_by_key: Dictionary mapping ``(rel_type, start_label,
+                end_label)`` to rows
+
+        Returns:
+            Tuple containing count of created and already existing relationships
+        """
+        results = await self._run_rounds(
+            self._plan(rows_by_key), relationship_batch_nodes, self._write_relationship_batch
+        )
+
+        created_count = sum(created for created, _ in results)
+        matched_count = sum(merged - created for created, merged in results)
+        return created_count, matched_count
+
+    async def _write_relationship_batch(
+        self, key: RelationshipKey, batch: RecordView
+    ) -> Tuple[int, int]:
+        """
+        Write one planned batch of relationship rows.
+
+        With a batch sizer, the batch is written in transactions of the size
+        currently adapted to its relationship type and endpoint labels.
+
+        Args:
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of created and merged relationships
+        """
+        if self.sizer:
+            results = await self.sizer.write_async(
+                ("relationships",) + key,
+                batch,
+                lambda rows: self._write_relationship_rows(key, rows),
+            )
+            created = sum(created for created, _ in results)
+            merged = sum(merged for _, merged in results)
+        else:
+            created, merged = await self._write_relationship_rows(key, batch)
+        self._committed("relationships", batch)
+        return created, merged
+
+    async def _write_relationship_rows(
+        self, key: RelationshipKey, batch: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """
+        Write relationship rows in one transaction, isolating rejected rows by bisection.
+
+        Args:
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of created and merged relationships
+        """
+        async with self._in_flight:
+            start = time.perf_counter()
+            try:
+                (merged, counters), retries = await self._execute_write(
+                    self._create_relationship_batch_tx, *key, batch
+                )
+            except Exception as e:
+                bisect = self._relationship_rows_failed(
+                    key, batch, e, time.perf_counter() - start
+                )
+            else:
+                return self._relationship_rows_written(
+                    key, batch, merged, counters, time.perf_counter() - start, retries
+                )
+
+        if not bisect:
+            return 0, 0
+        middle = len(batch) // 2
+        first = await self._write_relationship_rows(key, batch[:middle])
+        second = await self._write_relationship_rows(key, batch[middle:])
+        return first[0] + second[0], first[1] + second[1]
+
+    @staticmethod
+    async def _create_relationship_batch_tx(
+        tx: AsyncManagedTransaction,
+        rel_type: str,
+        start_label: str,
+        end_label: str,
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Create a batch of relationships sharing one type within a transaction.
+
+        Args:
+            tx: Neo4j transaction
+            rel_type: Sanitized type of the relationships
+            start_label: Sanitized label of the start nodes
+            end_label: Sanitized label of the end nodes
+            rows: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of merged (created or matched)
+            relationships and the server counters of the statement
+        """
+        query = relationship_batch_query(rel_type, start_label, end_label)
+        result = await tx.run(query, rows=list(rows))
+        record = await result.single()
+        merged = record["count"] if record else 0
+        summary = await result.consume()
+        return merged, server_counters(summary.counters)
@@ -0,0 +1,463 @@
+"""
+Shared loading logic for Neo4j data loading operations.
+
+This module contains the BaseLoader class with the parts of Neo4jLoader and
+AsyncNeo4jLoader that do not depend on the driver API: preparing a payload,
+planning its batches, tracking checkpoint progress and handling the outcome
+of every written batch. The loaders add the calls that run transactions.
+"""
+
+import logging
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Set, Tuple, Type, TypeVar, Union
+
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+
+from .checkpoint import Checkpoint, CommittedPrefix, remaining
+from .dead_letter import DeadLetterFile, node_record, relationship_record
+from .delta import DeltaIndex
+from .graph import CompactGraph, RecordView
+from .metrics import LoadMetrics
+from .pipeline import NodeBatch, RelationshipBatch, relationship_dependencies
+from .queries import RelationshipKey, chunk, group_node_rows, group_relationship_rows, node_labels
+from .sizing import BatchSizer
+
+logger = logging.getLogger(__name__)
+
+LoaderType = TypeVar("LoaderType", bound="BaseLoader")
+
+
+class BaseLoader:
+    """Plans batches and handles their outcomes for the synchronous and async loaders."""
+
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        encrypted: bool,
+        batch_size: int,
+        metrics: Optional[LoadMetrics],
+        dead_letters: Optional[DeadLetterFile],
+        pipeline: bool,
+        sizer: Optional[BatchSizer],
+        driver: Any,
+    ) -> None:
+        """
+        Initialize the settings shared by both loaders.
+
+        Args:
+            uri: The URI for the Neo4j database
+            username: Neo4j username
+            password: Neo4j password
+            encrypted: Whether to use encryption for the connection
+            batch_size: Maximum number of rows sent per write transaction;
+                with a sizer, the size of the first batch of every key
+            metrics: Metrics collector shared with the caller; a new one is
+                created when omitted
+            dead_letters: File receiving records the database rejects; when
+                omitted they are only logged
+            pipeline: Whether relationship batches may start while nodes are
+                still being written
+            sizer: Batch sizer adapting the rows per transaction of every
+                label and relationship type; ``batch_size`` is fixed when
+                omitted
+            driver: Open driver to use instead of connecting; it stays owned
+                by the caller and is left open when the loader is closed
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.uri = uri
+        self.username = username
+        self.password = password
+        self.encrypted = encrypted
+        self.batch_size = batch_size
+        self.metrics = metrics or LoadMetrics()
+        self.dead_letters = dead_letters
+        self.pipeline = pipeline
+        self.sizer = sizer
+        # Delta index of the running load, told about every committed batch
+        self._delta: Optional[DeltaIndex] = None
+        # Committed prefix per phase of the running load, when checkpointing
+        self._progress: Dict[str, CommittedPrefix] = {}
+        # Planned batches are split further by the sizer while writing
+        self.plan_size = sizer.plan_size if sizer else batch_size
+        self.driver = driver
+        self._owns_driver = driver is None
+
+    @classmethod
+    def from_driver(cls: Type[LoaderType], driver: Any, **kwargs: Any) -> LoaderType:
+        """
+        Create a loader on an existing driver, e.g. one shared with other code.
+
+        Args:
+            driver: Open driver; it stays owned by the caller
+            **kwargs: Other arguments of the loader, e.g. ``batch_size``
+
+        Returns:
+            Loader writing through the driver
+        """
+        return cls("", "", "", driver=driver, **kwargs)
+
+    def _prepare(
+        self,
+        json_data: Union[CompactGraph, Dict[str, List[Dict[str, Any]]]],
+        delta: Optional[DeltaIndex],
+    ) -> Tuple[RecordView, RecordView, Dict[str, str]]:
+        """
+        Get the records a load writes and the labels of their names.
+
+        Args:
+            json_data: Compact graph, or dictionary containing nodes and
+                relationships
+            delta: Delta index of previously written content hashes, if any
+
+        Returns:
+            Tuple of the nodes and relationships to write, only the new or
+            changed ones with a delta index, and a dictionary mapping the
+            names of all payload nodes to sanitized labels
+        """
+        graph = (
+            json_data
+            if isinstance(json_data, CompactGraph)
+            else CompactGraph.from_payload(json_data)
+        )
+        nodes = graph.nodes
+        relationships = graph.relationships
+        name_labels = node_labels(nodes)
+
+        # Only new or changed records are written in incremental mode
+        if delta:
+            nodes = nodes.take(
+                position for position, node in enumerate(nodes)
+                if delta.is_changed("nodes", node)
+            )
+            relationships = relationships.take(
+                position for position, rel in enumerate(relationships)
+                if delta.is_changed("relationships", rel)
+            )
+        return nodes, relationships, name_labels
+
+    def _pipelined(
+        self,
+        nodes: RecordView,
+        relationships: RecordView,
+        checkpoint: Optional[Checkpoint],
+        concurrency: int,
+    ) -> bool:
+        """
+        Decide whether nodes and relationships are written with overlapping phases.
+
+        Resuming from offsets needs every node committed before relationships,
+        so a resumed load runs the phases in order.
+
+        Args:
+            nodes: Nodes to write
+            relationships: Relationships to write
+            checkpoint: Checkpoint in use, if any
+            concurrency: Number of batches the loader writes at a time
+
+        Returns:
+            Whether the load is pipelined
+        """
+        resuming = bool(
+            checkpoint and (checkpoint.offset("nodes") or checkpoint.offset("relationships"))
+        )
+        return bool(self.pipeline and concurrency > 1 and not resuming and nodes and relationships)
+
+    def _node_groups(
+        self, nodes: RecordView, checkpoint: Optional[Checkpoint]
+    ) -> Dict[str, RecordView]:
+        """
+        Group the uncommitted nodes of a phase by label.
+
+        The whole phase is grouped at once, and a checkpoint records the
+        prefix of it that has committed.
+
+        Args:
+            nodes: Nodes to write, in input order
+            checkpoint: Checkpoint in use, if any
+
+        Returns:
+            Dictionary mapping sanitized labels to their rows
+        """
+        rows_by_label = group_node_rows(remaining("nodes", nodes, checkpoint))
+        self._track("nodes", nodes, rows_by_label.values(), checkpoint)
+        return rows_by_label
+
+    def _relationship_groups(
+        self,
+        relationships: RecordView,
+        name_labels: Dict[str, str],
+        checkpoint: Optional[Checkpoint],
+    ) -> Dict[RelationshipKey, RecordView]:
+        """
+        Group the uncommitted relationships of a phase by type and endpoint labels.
+
+        Args:
+            relationships: Relationships to write, in input order
+            name_labels: Dictionary mapping node names to sanitized labels
+            checkpoint: Checkpoint in use, if any
+
+        Returns:
+            Dictionary mapping ``(rel_type, start_label, end_label)`` to rows
+        """
+        rows_by_key = group_relationship_rows(
+            remaining("relationships", relationships, checkpoint), name_labels
+        )
+        self._track("relationships", relationships, rows_by_key.values(), checkpoint)
+        return rows_by_key
+
+    def _plan(
+        self, rows_by_key: Dict[Hashable, List[Dict[str, Any]]]
+    ) -> List[Tuple[Hashable, List[Dict[str, Any]]]]:
+        """
+        Split grouped rows into planned batches of at most ``plan_size`` rows.
+
+        Args:
+            rows_by_key: Dictionary mapping labels or relationship keys to rows
+
+        Returns:
+            List of ``(key, rows)`` batches, in key order
+        """
+        return [
+            (key, batch)
+            for key, rows in rows_by_key.items()
+            for batch in chunk(rows, self.plan_size)
+        ]
+
+    def _plan_pipeline(
+        self,
+        nodes: RecordView,
+        relationships: RecordView,
+        name_labels: Dict[str, str],
+        checkpoint: Optional[Checkpoint],
+    ) -> Tuple[List[NodeBatch], List[RelationshipBatch], List[Set[int]]]:
+        """
+        Plan the batches of a pipelined load and the order they depend on.
+
+        With a checkpoint, each phase records the prefix of its records whose
+        batches have committed, so an interrupted load resumes in phase order.
+
+        Args:
+            nodes: Nodes of a compact graph
+            relationships: Relationships of the same graph
+            name_labels: Dictionary mapping node names to sanitized labels
+            checkpoint: Checkpoint recording committed records per phase
+
+        Returns:
+            Tuple of the node batches, the relationship batches and the node
+            batch positions each relationship batch waits for
+        """
+        node_batches = self._plan(group_node_rows(nodes))
+        relationship_batches = self._plan(group_relationship_rows(relationships, name_labels))
+        dependencies = relationship_dependencies(
+            node_batches, relationship_batches, name_labels
+        )
+
+        self._track("nodes", nodes, (batch for _, batch in node_batches), checkpoint)
+        self._track(
+            "relationships", relationships, (batch for _, batch in relationship_batches), checkpoint
+        )
+        return node_batches, relationship_batches, dependencies
+
+    def _track(
+        self,
+        phase: str,
+        records: RecordView,
+        groups: Iterable[RecordView],
+        checkpoint: Optional[Checkpoint],
+    ) -> None:
+        """
+        Record the committed prefix of a phase as its batches commit.
+
+        Args:
+            phase: Phase name, e.g. ``nodes`` or ``relationships``
+            records: Every record of the phase, in input order
+            groups: Rows that will be written, grouped or batched
+            checkpoint: Checkpoint in use, if any
+        """
+        if checkpoint:
+            self._progress[phase] = CommittedPrefix(
+                checkpoint, phase, records.indices, (rows.indices for rows in groups)
+            )
+
+    def _committed(self, phase: str, batch: List[Dict[str, Any]]) -> None:
+        """Tell the tracked prefix of a phase, if any, that a batch committed."""
+        progress = self._progress.get(phase)
+        if progress:
+            progress.commit(batch.indices)
+
+    def _finish(self, checkpoint: Optional[Checkpoint], delta: Optional[DeltaIndex]) -> None:
+        """
+        Report and save the state of a load that completed.
+
+        Args:
+            checkpoint: Checkpoint of the load, cleared since nothing is left
+            delta: Delta index of the load, saved with the written hashes
+        """
+        if self.sizer:
+            self.sizer.summary()
+        if delta:
+            delta.summary()
+            delta.save()
+        if checkpoint:
+            checkpoint.clear()
+
+    def _node_rows_written(
+        self,
+        label: str,
+        batch: List[Dict[str, Any]],
+        created: int,
+        counters: Dict[str, int],
+        seconds: float,
+        retries: int,
+    ) -> int:
+        """
+        Record a committed transaction of node rows.
+
+        Args:
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+            created: Number of nodes created
+            counters: Server counters of the statement
+            seconds: Time the transaction took, including retries
+            retries: Number of retries of the transaction
+
+        Returns:
+            Number of nodes created
+        """
+        self.metrics.record_batch("nodes", label, len(batch), seconds, retries, counters)
+        if self._delta:
+            self._delta.mark_written("nodes", label, batch)
+        logger.debug(f"Created {created} {label} nodes")
+        return created
+
+    def _node_rows_failed(
+        self, label: str, batch: List[Dict[str, Any]], error: Exception, seconds: float
+    ) -> bool:
+        """
+        Handle a transaction of node rows that failed after its retries.
+
+        A batch that is rejected is split in half and each half written on
+        its own, so the valid rows commit in a few larger transactions while
+        the rejected ones are narrowed down to single rows and sent to the
+        dead-letter file.
+
+        Args:
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+            error: Error the transaction failed with
+            seconds: Time the failed transaction took
+
+        Returns:
+            Whether the batch should be bisected
+
+        Raises:
+            ServiceUnavailable: If the connection was lost
+            SessionExpired: If the session was lost
+        """
+        self.metrics.record_batch("nodes", label, len(batch), seconds, failed=True)
+        if isinstance(error, (ServiceUnavailable, SessionExpired)):
+            # Abort the load so a checkpoint is not advanced past this batch
+            raise error
+
+        if len(batch) == 1:
+            logger.error(f"Error creating {label} node {batch[0]['name']!r}: {error}")
+            if self.dead_letters:
+                self.dead_letters.add("node", node_record(label, batch[0]), error)
+            return False
+
+        logger.warning(
+            f"Error creating batch of {len(batch)} {label} nodes, bisecting: {error}"
+        )
+        return True
+
+    def _relationship_rows_written(
+        self,
+        key: RelationshipKey,
+        batch: List[Dict[str, Any]],
+        merged: int,
+        counters: Dict[str, int],
+        seconds: float,
+        retries: int,
+    ) -> Tuple[int, int]:
+        """
+        Record a committed transaction of relationship rows.
+
+        Args:
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+            merged: Number of relationships merged (created or matched)
+            counters: Server counters of the statement
+            seconds: Time the transaction took, including retries
+            retries: Number of retries of the transaction
+
+        Returns:
+            Tuple containing count of created and merged relationships
+        """
+        rel_type = key[0]
+        self.metrics.record_batch(
+            "relationships", rel_type, len(batch), seconds, retries, counters
+        )
+        created = counters["relationships_created"]
+
+        if merged < len(batch):
+            logger.warning(
+                f"{len(batch) - merged} {rel_type} relationships "
+                "skipped because an endpoint node was not found"
+            )
+        elif self._delta:
+            # Which rows matched no endpoint is unknown, so a partly
+            # skipped batch is sent again by the next run
+            self._delta.mark_written("relationships", key, batch)
+        logger.debug(f"Created {created} {rel_type} relationships")
+        return created, merged
+
+    def _relationship_rows_failed(
+        self,
+        key: RelationshipKey,
+        batch: List[Dict[str, Any]],
+        error: Exception,
+        seconds: float,
+    ) -> bool:
+        """
+        Handle a transaction of relationship rows that failed after its retries.
+
+        Rejected batches are bisected like node batches, and rows rejected
+        on their own go to the dead-letter file.
+
+        Args:
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+            error: Error the transaction failed with
+            seconds: Time the failed transaction took
+
+        Returns:
+            Whether the batch should be bisected
+
+        Raises:
+            ServiceUnavailable: If the connection was lost
+            SessionExpired: If the session was lost
+        """
+        rel_type = key[0]
+        self.metrics.record_batch("relationships", rel_type, len(batch), seconds, failed=True)
+        if isinstance(error, (ServiceUnavailable, SessionExpired)):
+            # Abort the load so a checkpoint is not advanced past this batch
+            raise error
+
+        if len(batch) == 1:
+            row = batch[0]
+            logger.error(
+                f"Error creating {rel_type} relationship "
+                f"{row['start']!r} -> {row['end']!r}: {error}"
+            )
+            if self.dead_letters:
+                self.dead_letters.add("relationship", relationship_record(rel_type, row), error)
+            return False
+
+        logger.warning(
+            f"Error creating batch of {len(batch)} {rel_type} relationships, "
+            f"bisecting: {error}"
+        )
+        return True
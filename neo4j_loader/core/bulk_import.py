@@ -0,0 +1,386 @@
+"""
+Bulk import export module for offline Neo4j data loading.
+
+This module contains the BulkImportExporter class that converts a nodes and
+relationships JSON file into the header and data CSV files consumed by
+``neo4j-admin database import``, for building a fresh database offline.
+"""
+
+import csv
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, List, Any, Callable, IO, Iterable, Optional, Set, Tuple
+
+from ..utils.cypher_utils import sanitize_label
+from ..utils.file_utils import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+NODE_FIELDS = ("node_type",)
+RELATIONSHIP_FIELDS = ("start", "end", "relationship_type")
+ARRAY_DELIMITER = ";"
+
+
+def _value_type(value: Any) -> Optional[str]:
+    """Map a JSON value to its neo4j-admin import column type."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, list):
+        # Arrays take the type of their items, like the lists the loader stores
+        item_types = {_value_type(item) for item in value} - {None}
+        if not item_types:
+            return None
+        return f"{_column_type(item_types)}[]"
+    return "string"
+
+
+def _column_type(types: Set[str]) -> str:
+    """Choose a column type that can hold every observed value type."""
+    if len(types) == 1:
+        return next(iter(types))
+    if types == {"long", "double"}:
+        return "double"
+    if types == {"long[]", "double[]"}:
+        return "double[]"
+    if all(kind.endswith("[]") for kind in types):
+        return "string[]"
+    return "string"
+
+
+def _format_value(value: Any, column_type: str) -> str:
+    """Format a JSON value as a CSV field of the given column type."""
+    if value is None:
+        return ""
+    if column_type.endswith("[]"):
+        items = value if isinstance(value, list) else [value]
+        return ARRAY_DELIMITER.join(_format_value(item, column_type[:-2]) for item in items)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class BulkImportExporter:
+    """Writes ``neo4j-admin database import`` CSV files from a JSON graph file."""
+
+    def __init__(self, output_dir: str) -> None:
+        """
+        Initialize the BulkImportExporter.
+
+        Args:
+            output_dir: Directory the CSV files and import arguments are written to
+        """
+        self.output_dir = output_dir
+
+    def export(self, file_path: str) -> Tuple[int, int]:
+        """
+        Convert a JSON graph file into per-label and per-type CSV files.
+
+        The input is streamed: one pass over each array collects the property
+        columns and their types and finds repeated records, a second pass
+        writes the rows. Nodes get generated integer IDs. Records repeating a
+        label and name, or a type and endpoints, are written once with their
+        properties combined, later values winning, as the transactional
+        loader's ``MERGE`` and ``SET +=`` leave them; only repeated records
+        are held until the end of the pass.
+
+        Args:
+            file_path: Path to the JSON file
+
+        Returns:
+            Tuple containing count of exported nodes and relationships
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        node_columns, repeated_nodes = self._scan_columns(
+            iter_json_array(file_path, "nodes"), NODE_FIELDS, self._node_group
+        )
+        rel_columns, repeated_rels = self._scan_columns(
+            iter_json_array(file_path, "relationships"),
+            RELATIONSHIP_FIELDS,
+            self._relationship_group,
+        )
+
+        nodes_count, node_ids, node_files = self._write_nodes(
+            iter_json_array(file_path, "nodes"), node_columns, repeated_nodes
+        )
+        rels_count, rel_files = self._write_relationships(
+            iter_json_array(file_path, "relationships"), rel_columns, node_ids, repeated_rels
+        )
+
+        args_path = self._write_import_args(node_files, rel_files)
+        logger.info(
+            f"Exported {nodes_count} nodes and {rels_count} relationships to {self.output_dir}"
+        )
+        logger.info(f"Import with: neo4j-admin database import full @{args_path} <database>")
+        return nodes_count, rels_count
+
+    @staticmethod
+    def _node_group(node: Any) -> Optional[Tuple[str, Tuple[str, Any]]]:
+        """
+        Return the sanitized label and identity of a node.
+
+        Returns None for records that are not objects or lack a string
+        ``node_type`` or a string or integer ``name``.
+        """
+        if not (
+            isinstance(node, dict)
+            and isinstance(node.get("node_type"), str)
+            and isinstance(node.get("name"), (str, int))
+        ):
+            return None
+        label = sanitize_label(node["node_type"])
+        return label, (label, node["name"])
+
+    @staticmethod
+    def _relationship_group(rel: Any) -> Optional[Tuple[str, Tuple[str, Any, Any]]]:
+        """
+        Return the sanitized type and identity of a relationship.
+
+        Returns None for records that are not objects or lack a string
+        ``relationship_type`` or string or integer endpoints.
+        """
+        if not (
+            isinstance(rel, dict)
+            and isinstance(rel.get("relationship_type"), str)
+            and isinstance(rel.get("start"), (str, int))
+            and isinstance(rel.get("end"), (str, int))
+        ):
+            return None
+        rel_type = sanitize_label(rel["relationship_type"])
+        return rel_type, (rel_type, rel["start"], rel["end"])
+
+    @staticmethod
+    def _scan_columns(
+        records: Iterable[Dict[str, Any]],
+        reserved: Tuple[str, ...],
+        group_of: Callable[[Any], Optional[Tuple[str, Tuple[Any, ...]]]],
+    ) -> Tuple[Dict[str, Dict[str, str]], Set[Tuple[Any, ...]]]:
+        """
+        Collect the property columns and their types for every group.
+
+        Args:
+            records: Node or relationship dictionaries
+            reserved: Fields that are not stored as properties
+            group_of: Function returning a record's label or type and identity
+
+        Returns:
+            Tuple of a dictionary mapping each group to its ordered column
+            types and the identities of records that occur more than once
+        """
+        observed: Dict[str, Dict[str, Set[str]]] = defaultdict(dict)
+        seen: Set[Tuple[Any, ...]] = set()
+        repeated: Set[Tuple[Any, ...]] = set()
+        for record in records:
+            grouped = group_of(record)
+            if grouped is None:
+                continue
+            group, identity = grouped
+            if identity in seen:
+                repeated.add(identity)
+            seen.add(identity)
+            columns = observed[group]
+            for key, value in record.items():
+                if key in reserved:
+                    continue
+                types = columns.setdefault(key, set())
+                value_type = _value_type(value)
+                if value_type:
+                    types.add(value_type)
+
+        columns_by_group = {
+            group: {key: _column_type(types) if types else "string" for key, types in columns.items()}
+            for group, columns in observed.items()
+        }
+        return columns_by_group, repeated
+
+    def _open_csv(
+        self, prefix: str, group: str, header: List[str], handles: List[IO[str]]
+    ) -> Tuple[Any, Tuple[str, str]]:
+        """Write a header file and open the data file for one group."""
+        header_path = os.path.join(self.output_dir, f"{prefix}_{group}_header.csv")
+        data_path = os.path.join(self.output_dir, f"{prefix}_{group}.csv")
+
+        with open(header_path, "w", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerow(header)
+
+        handle = open(data_path, "w", newline="", encoding="utf-8")
+        handles.append(handle)
+        return csv.writer(handle), (header_path, data_path)
+
+    def _write_nodes(
+        self,
+        nodes: Iterable[Dict[str, Any]],
+        columns: Dict[str, Dict[str, str]],
+        repeated: Set[Tuple[str, Any]],
+    ) -> Tuple[int, Dict[str, int], Dict[str, Tuple[str, str]]]:
+        """
+        Write one node CSV file per label.
+
+        Args:
+            nodes: Node dictionaries
+            columns: Column types per label
+            repeated: Identities of nodes that occur more than once
+
+        Returns:
+            Tuple of the number of nodes written, the name-to-ID map used for
+            relationship endpoints and the header and data file paths per label
+        """
+        node_ids: Dict[str, int] = {}
+        seen: Set[Tuple[str, Any]] = set()
+        merged: Dict[Tuple[str, Any], Tuple[int, Dict[str, Any]]] = {}
+        writers: Dict[str, Any] = {}
+        files: Dict[str, Tuple[str, str]] = {}
+        handles: List[IO[str]] = []
+
+        def write(label: str, node_id: int, node: Dict[str, Any]) -> None:
+            label_columns = columns[label]
+            if label not in writers:
+                header = [":ID"] + [f"{key}:{kind}" for key, kind in label_columns.items()]
+                writers[label], files[label] = self._open_csv("nodes", label, header, handles)
+            writers[label].writerow(
+                [node_id]
+                + [_format_value(node.get(key), kind) for key, kind in label_columns.items()]
+            )
+
+        try:
+            for node in nodes:
+                grouped = self._node_group(node)
+                if grouped is None:
+                    logger.warning("Skipping node missing required fields: name or node_type")
+                    continue
+                label, identity = grouped
+                if identity in seen:
+                    merged[identity][1].update(node)
+                    continue
+                seen.add(identity)
+
+                node_id = len(seen)
+                # Relationships resolve names to the first label seen, like the loader
+                node_ids.setdefault(node["name"], node_id)
+                if identity in repeated:
+                    # Written once every occurrence has been combined
+                    merged[identity] = (node_id, dict(node))
+                else:
+                    write(label, node_id, node)
+
+            for (label, _), (node_id, node) in merged.items():
+                write(label, node_id, node)
+        finally:
+            for handle in handles:
+                handle.close()
+
+        if merged:
+            logger.info(f"Combined the properties of {len(merged)} repeated nodes")
+        return len(seen), node_ids, files
+
+    def _write_relationships(
+        self,
+        relationships: Iterable[Dict[str, Any]],
+        columns: Dict[str, Dict[str, str]],
+        node_ids: Dict[str, int],
+        repeated: Set[Tuple[str, Any, Any]],
+    ) -> Tuple[int, Dict[str, Tuple[str, str]]]:
+        """
+        Write one relationship CSV file per type.
+
+        Args:
+            relationships: Relationship dictionaries
+            columns: Column types per relationship type
+            node_ids: Map from node names to generated IDs
+            repeated: Identities of relationships that occur more than once
+
+        Returns:
+            Tuple of the number of relationships written and the header and
+            data file paths per type
+        """
+        seen: Set[Tuple[str, Any, Any]] = set()
+        merged: Dict[Tuple[str, Any, Any], Dict[str, Any]] = {}
+        writers: Dict[str, Any] = {}
+        files: Dict[str, Tuple[str, str]] = {}
+        handles: List[IO[str]] = []
+        unresolved = 0
+
+        def write(rel_type: str, rel: Dict[str, Any]) -> None:
+            type_columns = columns[rel_type]
+            if rel_type not in writers:
+                header = [":START_ID", ":END_ID"] + [
+                    f"{name}:{kind}" for name, kind in type_columns.items()
+                ]
+                writers[rel_type], files[rel_type] = self._open_csv(
+                    "relationships", rel_type, header, handles
+                )
+            writers[rel_type].writerow(
+                [node_ids[rel["start"]], node_ids[rel["end"]]]
+                + [_format_value(rel.get(name), kind) for name, kind in type_columns.items()]
+            )
+
+        try:
+            for rel in relationships:
+                grouped = self._relationship_group(rel)
+                if grouped is None:
+                    logger.warning("Skipping relationship missing required fields")
+                    continue
+                rel_type, identity = grouped
+                if rel["start"] not in node_ids or rel["end"] not in node_ids:
+                    unresolved += 1
+                    continue
+
+                if identity in seen:
+                    merged[identity].update(rel)
+                    continue
+                seen.add(identity)
+
+                if identity in repeated:
+                    merged[identity] = dict(rel)
+                else:
+                    write(rel_type, rel)
+
+            for (rel_type, _, _), rel in merged.items():
+                write(rel_type, rel)
+        finally:
+            for handle in handles:
+                handle.close()
+
+        if unresolved:
+            logger.warning(f"Skipped {unresolved} relationships that reference unknown nodes")
+        if merged:
+            logger.info(f"Combined the properties of {len(merged)} repeated relationships")
+        return len(seen), files
+
+    def _write_import_args(
+        self,
+        node_files: Dict[str, Tuple[str, str]],
+        rel_files: Dict[str, Tuple[str, str]],
+    ) -> str:
+        """
+        Write a ``neo4j-admin`` arguments file listing every CSV file.
+
+        Args:
+            node_files: Header and data file paths per label
+            rel_files: Header and data file paths per relationship type
+
+        Returns:
+            Path to the arguments file
+        """
+        lines = ["--multiline-fields=true", f"--array-delimiter={ARRAY_DELIMITER}"]
+        for label, paths in sorted(node_files.items()):
+            lines.append(f"--nodes={label}={','.join(os.path.abspath(p) for p in paths)}")
+        for rel_type, paths in sorted(rel_files.items()):
+            lines.append(
+                f"--relationships={rel_type}={','.join(os.path.abspath(p) for p in paths)}"
+            )
+
+        args_path = os.path.join(self.output_dir, "import.args")
+        with open(args_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        return args_path
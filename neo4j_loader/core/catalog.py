@@ -0,0 +1,304 @@
+"""
+Catalog transformation module for Neo4j data loading.
+
+This module contains the CatalogTransformer class that converts the nested
+``industries`` catalog format (industries, their entities and companies with
+people, products, technologies, locations and metrics) into the loader's
+node and relationship records. The catalog is read one industry at a time,
+so the flattened graph is never held in memory as a whole.
+"""
+
+import json
+import logging
+import re
+from typing import Dict, List, Any, Iterator, Optional, Set, Tuple
+
+from .queries import batched
+from ..utils.file_utils import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+CATALOG_LABELS = ("Company", "Person", "Product", "Technology", "Location")
+
+# Entity lists of an industry and the label of their records
+ENTITY_LABELS = {
+    "people": "Person",
+    "products": "Product",
+    "technologies": "Technology",
+    "locations": "Location",
+}
+
+# Label of the nodes written for relationship endpoints the catalog does not
+# define; industry relationships and product ``related_to`` fields name companies
+ENDPOINT_LABEL = "Company"
+
+# Company reference lists as (label of the referenced node, relationship
+# type, whether the company is the start node)
+COMPANY_LINKS = {
+    "people": ("Person", "AFFILIATED_WITH", False),
+    "products": ("Product", "OFFERS", True),
+    "technologies": ("Technology", "USES", True),
+    "locations": ("Location", "LOCATED_IN", True),
+}
+
+_PRIMITIVES = (str, int, float, bool)
+
+
+def flatten_properties(values: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten nested maps into properties Neo4j can store.
+
+    Nested maps become ``parent_child`` keys, e.g. ``metrics.valuation``
+    becomes ``metrics_valuation``. Lists of one primitive type are kept;
+    other lists are stored as JSON strings. ``None`` values are dropped.
+
+    Args:
+        values: Map to flatten
+        prefix: Prefix of every resulting key
+
+    Returns:
+        Flat dictionary of property values
+    """
+    properties: Dict[str, Any] = {}
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            properties.update(flatten_properties(value, f"{name}_"))
+        elif isinstance(value, list):
+            types = {type(item) for item in value}
+            if len(types) <= 1 and types <= set(_PRIMITIVES):
+                properties[name] = value
+            else:
+                properties[name] = json.dumps(value, default=str)
+        elif value is not None:
+            properties[name] = value if isinstance(value, _PRIMITIVES) else str(value)
+    return properties
+
+
+def relationship_type(value: str) -> str:
+    """
+    Turn a catalog relationship description into a relationship type.
+
+    Args:
+        value: Description such as ``competitor`` or ``supplier to``
+
+    Returns:
+        Upper snake case type, e.g. ``COMPETITOR`` or ``SUPPLIER_TO``
+    """
+    return re.sub(r"\W+", "_", value).strip("_").upper() or "RELATED_TO"
+
+
+class CatalogTransformer:
+    """Streams an industries catalog as loader nodes and relationships."""
+
+    def __init__(self, file_path: str, batch_size: int = 1000) -> None:
+        """
+        Initialize the CatalogTransformer.
+
+        Args:
+            file_path: Path to the catalog JSON file
+            batch_size: Maximum number of records per batch
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.file_path = file_path
+        self.batch_size = batch_size
+
+    def _industries(self) -> Iterator[Dict[str, Any]]:
+        """Parse the industries of the catalog one at a time."""
+        for industry in iter_json_array(self.file_path, "industries"):
+            if not isinstance(industry, dict):
+                logger.warning("Skipping industry that is not an object")
+                continue
+            yield industry
+
+    @staticmethod
+    def _entities(industry: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the entities of an industry, tolerating a missing map."""
+        entities = industry.get("entities")
+        return entities if isinstance(entities, dict) else {}
+
+    @staticmethod
+    def _named(records: Any) -> Iterator[Dict[str, Any]]:
+        """Yield the records of a list that are objects with a name."""
+        for record in records if isinstance(records, list) else []:
+            if isinstance(record, dict) and record.get("name"):
+                yield record
+
+    @staticmethod
+    def _references(values: Any) -> Iterator[str]:
+        """Yield the non-empty name references of a list."""
+        for value in values if isinstance(values, list) else []:
+            if isinstance(value, str) and value.strip():
+                yield value.strip()
+
+    def _endpoints(self, entities: Dict[str, Any]) -> Iterator[str]:
+        """Yield the names industry relationships and products refer to."""
+        for product in self._named(entities.get("products")):
+            yield from self._references([product.get("related_to")])
+        for entry in entities.get("relationships") or []:
+            if isinstance(entry, dict) and entry.get("relationship"):
+                yield from self._references([entry.get("entity1"), entry.get("entity2")])
+
+    def iter_nodes(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the nodes of the catalog.
+
+        Within an industry, the detailed entity records come first and the
+        bare names companies refer to last. A node is emitted the first time
+        it is seen and again only when a later record adds properties it did
+        not have, so the loader's MERGE combines them; for properties both
+        records define, the first value is kept. Only the emitted property
+        names per node are remembered. Names that industry relationships or
+        products refer to without the catalog defining them are emitted last,
+        as bare ``Company`` nodes, so those relationships are not dropped.
+
+        Yields:
+            Node dictionaries in the loader format
+        """
+        emitted: Dict[Tuple[str, str], Set[str]] = {}
+        referenced: Dict[str, None] = {}
+        total = 0
+
+        def node(label: str, name: str, properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            known = emitted.get((label, name))
+            if known is not None:
+                properties = {k: v for k, v in properties.items() if k not in known}
+                if not properties:
+                    return None
+                known.update(properties)
+            else:
+                emitted[(label, name)] = set(properties)
+            return {"name": name, "node_type": label, **properties}
+
+        for industry in self._industries():
+            entities = self._entities(industry)
+            candidates: List[Optional[Dict[str, Any]]] = []
+
+            for company in self._named(entities.get("companies")):
+                properties = {
+                    k: v for k, v in company.items() if k != "name" and k not in COMPANY_LINKS
+                }
+                if industry.get("name"):
+                    properties["industry"] = industry["name"]
+                candidates.append(
+                    node("Company", company["name"], flatten_properties(properties))
+                )
+
+            for key, label in ENTITY_LABELS.items():
+                for record in self._named(entities.get(key)):
+                    properties = {k: v for k, v in record.items() if k != "name"}
+                    candidates.append(node(label, record["name"], flatten_properties(properties)))
+
+            for company in self._named(entities.get("companies")):
+                for key, (label, _, _) in COMPANY_LINKS.items():
+                    for name in self._references(company.get(key)):
+                        candidates.append(node(label, name, {}))
+
+            for candidate in candidates:
+                if candidate is not None:
+                    total += 1
+                    yield candidate
+
+            # Only the names are kept, in order, until every industry is read
+            referenced.update(dict.fromkeys(self._endpoints(entities)))
+
+        defined = {name for _, name in emitted}
+        stubs = [name for name in referenced if name not in defined]
+        for name in stubs:
+            emitted[(ENDPOINT_LABEL, name)] = set()
+            yield {"name": name, "node_type": ENDPOINT_LABEL}
+
+        logger.info(
+            f"Transformed catalog into {len(emitted)} nodes ({total + len(stubs)} records, "
+            f"{len(stubs)} {ENDPOINT_LABEL} nodes for undefined relationship endpoints)"
+        )
+
+    def iter_relationships(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the relationships of the catalog.
+
+        Companies are linked to their people, products, technologies and
+        locations; products to the company in their ``related_to`` field;
+        and the entries of each industry's ``relationships`` list are
+        written with a type derived from their ``relationship`` field.
+        Repeated relationships are emitted once.
+
+        Yields:
+            Relationship dictionaries in the loader format
+        """
+        seen: Set[Tuple[str, str, str]] = set()
+
+        def relationship(
+            rel_type: str, start: str, end: str, properties: Optional[Dict[str, Any]] = None
+        ) -> Optional[Dict[str, Any]]:
+            key = (rel_type, start, end)
+            if key in seen or start == end:
+                return None
+            seen.add(key)
+            return {
+                "start": start,
+                "end": end,
+                "relationship_type": rel_type,
+                **(properties or {}),
+            }
+
+        for industry in self._industries():
+            entities = self._entities(industry)
+            candidates: List[Optional[Dict[str, Any]]] = []
+
+            for company in self._named(entities.get("companies")):
+                for key, (_, rel_type, outgoing) in COMPANY_LINKS.items():
+                    for name in self._references(company.get(key)):
+                        start, end = (company["name"], name) if outgoing else (name, company["name"])
+                        candidates.append(relationship(rel_type, start, end))
+
+            for product in self._named(entities.get("products")):
+                for company in self._references([product.get("related_to")]):
+                    candidates.append(relationship("OFFERS", company, product["name"]))
+
+            for entry in entities.get("relationships") or []:
+                if not isinstance(entry, dict):
+                    continue
+                start, end = entry.get("entity1"), entry.get("entity2")
+                if not start or not end or not entry.get("relationship"):
+                    logger.warning(f"Skipping incomplete catalog relationship: {entry}")
+                    continue
+                properties = {
+                    k: v
+                    for k, v in entry.items()
+                    if k not in ("entity1", "entity2", "relationship") and v not in ("", None)
+                }
+                candidates.append(
+                    relationship(
+                        relationship_type(entry["relationship"]),
+                        start,
+                        end,
+                        flatten_properties(properties),
+                    )
+                )
+
+            for candidate in candidates:
+                if candidate is not None:
+                    yield candidate
+
+        logger.info(f"Transformed catalog into {len(seen)} relationships")
+
+    def node_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream the nodes of the catalog in batches.
+
+        Yields:
+            Lists of at most ``batch_size`` nodes
+        """
+        return batched(self.iter_nodes(), self.batch_size)
+
+    def relationship_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream the relationships of the catalog in batches.
+
+        Yields:
+            Lists of at most ``batch_size`` relationships
+        """
+        return batched(self.iter_relationships(), self.batch_size)
@@ -0,0 +1,257 @@
+"""
+Checkpoint module for resumable Neo4j data loading.
+
+This module contains the Checkpoint class that records how many input records
+of each phase (nodes, relationships) have been committed, so an interrupted
+load can skip work that is already in the database.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_FILE = ".neo4j_loader_checkpoint.json"
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file without reading it into memory.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remaining(phase: str, records: Sequence[Any], checkpoint: Optional["Checkpoint"]) -> Sequence[Any]:
+    """
+    Skip the prefix of a phase that a checkpoint marks as committed.
+
+    Args:
+        phase: Phase name, e.g. ``nodes`` or ``relationships``
+        records: Records of the phase in input order
+        checkpoint: Checkpoint in use, if any
+
+    Returns:
+        The records after the committed prefix
+    """
+    done = checkpoint.offset(phase) if checkpoint else 0
+    if done:
+        logger.info(f"Skipping {done} {phase} already committed")
+    return records[done:]
+
+
+def uncommitted(
+    phase: str,
+    segments: Iterable[List[Dict[str, Any]]],
+    checkpoint: Optional["Checkpoint"],
+) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Skip the records of a phase that a checkpoint marks as committed.
+
+    Args:
+        phase: Phase name, e.g. ``nodes`` or ``relationships``
+        segments: Record segments in input order
+        checkpoint: Checkpoint in use, if any
+
+    Yields:
+        Tuples of the uncommitted part of a segment and the input offset at
+        the end of that segment
+    """
+    done = checkpoint.offset(phase) if checkpoint else 0
+    if done:
+        logger.info(f"Skipping {done} {phase} already committed")
+
+    position = 0
+    for segment in segments:
+        end = position + len(segment)
+        if end > done:
+            yield segment[max(done - position, 0):], end
+        position = end
+
+
+class CommittedPrefix:
+    """
+    Records the committed prefix of a phase whose batches commit out of order.
+
+    Batches are grouped by label or type and may run concurrently, so the
+    records committed so far are not a prefix of the input. The offset saved
+    to the checkpoint is the longest prefix in which every record to write
+    has committed; records that are not written never hold it back.
+    """
+
+    def __init__(
+        self,
+        checkpoint: "Checkpoint",
+        phase: str,
+        indices: Sequence[int],
+        batches: Iterable[Sequence[int]],
+    ) -> None:
+        """
+        Initialize the CommittedPrefix.
+
+        Args:
+            checkpoint: Checkpoint receiving the offsets
+            phase: Phase name, e.g. ``nodes`` or ``relationships``
+            indices: Record indices of the phase in input order, increasing
+            batches: Record indices to write, e.g. of each batch or group
+        """
+        self.checkpoint = checkpoint
+        self.phase = phase
+        self.indices = indices
+        self._pending = bytearray(len(indices))
+        for batch in batches:
+            for index in batch:
+                self._pending[bisect_left(indices, index)] = 1
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def commit(self, batch: Sequence[int]) -> None:
+        """
+        Record a committed batch and save the offset if the prefix grew.
+
+        Args:
+            batch: Record indices written by the batch
+        """
+        with self._lock:
+            for index in batch:
+                self._pending[bisect_left(self.indices, index)] = 0
+            offset = self._offset
+            while offset < len(self._pending) and not self._pending[offset]:
+                offset += 1
+            if offset > self._offset:
+                self._offset = offset
+                self.checkpoint.commit(self.phase, offset)
+
+
+class Checkpoint:
+    """Tracks committed record offsets per phase for one input file."""
+
+    def __init__(
+        self, path: str, file_hash: str, resume: bool = False
+    ) -> None:
+        """
+        Initialize the Checkpoint for an input file.
+
+        Args:
+            path: Path to the checkpoint file, shared by all input files
+            file_hash: Hash of the input file the offsets belong to
+            resume: Whether to keep previously recorded offsets; when False
+                the input starts over from the beginning
+        """
+        self.path = path
+        self.file_hash = file_hash
+        self.offsets: Dict[str, int] = {}
+
+        if resume:
+            self.offsets = dict(self._read().get(file_hash, {}))
+            if self.offsets:
+                logger.info(f"Resuming from checkpoint {self.offsets}")
+            else:
+                logger.info("No checkpoint found for this input, starting from the beginning")
+        else:
+            self._save()
+
+    @classmethod
+    def for_file(cls, path: str, input_path: str, resume: bool = False) -> "Checkpoint":
+        """
+        Create a Checkpoint keyed by the hash of an input file.
+
+        Args:
+            path: Path to the checkpoint file
+            input_path: Path to the input file
+            resume: Whether to keep previously recorded offsets
+
+        Returns:
+            Checkpoint for the input file
+        """
+        return cls(path, hash_file(input_path), resume)
+
+    @classmethod
+    def for_files(
+        cls, path: str, input_paths: List[str], resume: bool = False
+    ) -> "Checkpoint":
+        """
+        Create a Checkpoint keyed by the combined hash of several input files.
+
+        Args:
+            path: Path to the checkpoint file
+            input_paths: Paths to the input files, in load order
+            resume: Whether to keep previously recorded offsets
+
+        Returns:
+            Checkpoint for the set of input files
+        """
+        if len(input_paths) == 1:
+            return cls.for_file(path, input_paths[0], resume)
+
+        digest = hashlib.sha256()
+        for input_path in input_paths:
+            digest.update(hash_file(input_path).encode("ascii"))
+        return cls(path, digest.hexdigest(), resume)
+
+    def offset(self, phase: str) -> int:
+        """
+        Get the number of records of a phase that are already committed.
+
+        Args:
+            phase: Phase name, e.g. ``nodes`` or ``relationships``
+
+        Returns:
+            Number of committed records
+        """
+        return self.offsets.get(phase, 0)
+
+    def commit(self, phase: str, offset: int) -> None:
+        """
+        Record that the first ``offset`` records of a phase are committed.
+
+        Args:
+            phase: Phase name, e.g. ``nodes`` or ``relationships``
+            offset: Number of committed records
+        """
+        self.offsets[phase] = offset
+        self._save()
+
+    def clear(self) -> None:
+        """Remove the entry for this input after a completed load."""
+        self.offsets = {}
+        self._save()
+
+    def _read(self) -> Dict[str, Any]:
+        """Read all entries from the checkpoint file."""
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable checkpoint file {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Atomically write the entry for this input to the checkpoint file."""
+        entries = self._read()
+        if self.offsets:
+            entries[self.file_hash] = self.offsets
+        else:
+            entries.pop(self.file_hash, None)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(entries, file, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,126 @@
+"""
+Dead-letter module for Neo4j data loading.
+
+This module contains the DeadLetterFile class that collects records the
+database rejected, one JSON object per line together with the error, and the
+function that reads such a file back into a payload so it can be replayed
+once the records are fixed.
+"""
+
+import json
+import logging
+import threading
+from typing import Dict, List, Any, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEAD_LETTER_FILE = ".neo4j_loader_dead_letters.jsonl"
+
+
+def node_record(label: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a payload node from a node batch row.
+
+    Args:
+        label: Sanitized label (type) of the node
+        row: ``{"name": ..., "props": {...}}`` row
+
+    Returns:
+        Node dictionary in the payload format
+    """
+    return {"name": row["name"], "node_type": label, **row["props"]}
+
+
+def relationship_record(rel_type: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a payload relationship from a relationship batch row.
+
+    Args:
+        rel_type: Sanitized type of the relationship
+        row: ``{"start": ..., "end": ..., "props": {...}}`` row
+
+    Returns:
+        Relationship dictionary in the payload format
+    """
+    return {
+        "start": row["start"],
+        "end": row["end"],
+        "relationship_type": rel_type,
+        **row["props"],
+    }
+
+
+class DeadLetterFile:
+    """Appends rejected records and their errors to a JSON Lines file."""
+
+    def __init__(self, path: str = DEFAULT_DEAD_LETTER_FILE) -> None:
+        """
+        Initialize the DeadLetterFile.
+
+        The file is created, replacing any previous one, when the first
+        record is added, so a run without rejected records leaves an existing
+        file untouched.
+
+        Args:
+            path: Path to the dead-letter file
+        """
+        self.path = path
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, record: Dict[str, Any], error: Exception) -> None:
+        """
+        Record a rejected record.
+
+        Args:
+            kind: ``node`` or ``relationship``
+            record: Record in the payload format
+            error: Error the database raised for the record
+        """
+        line = json.dumps(
+            {"kind": kind, "record": record, "error": f"{type(error).__name__}: {error}"},
+            default=str,
+        )
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "w")
+            self._file.write(line + "\n")
+            # Flushed per record so an aborted run keeps what it isolated
+            self._file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        """Close the file and report how many records it holds."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logger.warning(f"{self.count} rejected records written to {self.path}")
+
+
+def load_dead_letters(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read a dead-letter file back into a payload for replay.
+
+    Args:
+        path: Path to the dead-letter file
+
+    Returns:
+        Dictionary containing nodes and relationships
+    """
+    payload: Dict[str, List[Dict[str, Any]]] = {"nodes": [], "relationships": []}
+    with open(path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            key = "nodes" if entry["kind"] == "node" else "relationships"
+            payload[key].append(entry["record"])
+
+    logger.info(
+        f"Replaying {len(payload['nodes'])} nodes and "
+        f"{len(payload['relationships'])} relationships from {path}"
+    )
+    return payload
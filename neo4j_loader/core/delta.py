@@ -0,0 +1,218 @@
+"""
+Delta index module for incremental Neo4j data loading.
+
+This module contains the DeltaIndex class that stores a content hash for every
+node and relationship written to a database in a local sidecar file, so later
+runs only send entities that are new or whose properties changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Any, Iterable, Tuple
+
+from ..utils.cypher_utils import sanitize_label
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DELTA_INDEX_FILE = ".neo4j_loader_delta.json"
+
+PHASES = ("nodes", "relationships")
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of a record's fields and values.
+
+    Args:
+        record: Node or relationship dictionary
+
+    Returns:
+        Hex digest that changes whenever any field or value changes
+    """
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def entity_key(phase: str, record: Dict[str, Any]) -> str:
+    """
+    Build the identity of a record as used by the loader's MERGE.
+
+    Args:
+        phase: ``nodes`` or ``relationships``
+        record: Node or relationship dictionary
+
+    Returns:
+        Key identifying the node by label and name, or the relationship by
+        type and endpoint names
+    """
+    if phase == "nodes":
+        parts: Tuple[str, ...] = (sanitize_label(record["node_type"]), record["name"])
+    else:
+        parts = (sanitize_label(record["relationship_type"]), record["start"], record["end"])
+    return "\x1f".join(str(part) for part in parts)
+
+
+def row_key(phase: str, group: Any, row: Dict[str, Any]) -> str:
+    """
+    Build the identity of a row sent to the database, as :func:`entity_key` does.
+
+    Args:
+        phase: ``nodes`` or ``relationships``
+        group: Sanitized label of a node row, or ``(rel_type, start_label,
+            end_label)`` key of a relationship row
+        row: ``{"name": ...}`` or ``{"start": ..., "end": ...}`` row
+
+    Returns:
+        Key of the record the row was built from
+    """
+    if phase == "nodes":
+        parts: Tuple[Any, ...] = (group, row["name"])
+    else:
+        parts = (group[0], row["start"], row["end"])
+    return "\x1f".join(str(part) for part in parts)
+
+
+class DeltaIndex:
+    """Sidecar index of content hashes for the entities in one database."""
+
+    def __init__(self, path: str, scope: str) -> None:
+        """
+        Initialize the DeltaIndex from its sidecar file.
+
+        The index only reflects what this loader wrote; if the database is
+        changed or rebuilt by other means the sidecar file should be deleted.
+
+        Args:
+            path: Path to the sidecar file
+            scope: Identifier of the target database, e.g. its URI; an index
+                recorded for a different scope is discarded
+        """
+        self.path = path
+        self.scope = scope
+        self.hashes: Dict[str, Dict[str, str]] = {phase: {} for phase in PHASES}
+        # Hashes of changed records, until their batch commits
+        self.pending: Dict[str, Dict[str, str]] = {phase: {} for phase in PHASES}
+        self.written: Dict[str, Dict[str, str]] = {phase: {} for phase in PHASES}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {
+            phase: {"new": 0, "updated": 0, "unchanged": 0} for phase in PHASES
+        }
+        self._read()
+
+    def changed(self, phase: str, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filter records down to those that are new or changed.
+
+        Records missing the fields that identify them are passed through so
+        the loader can report them as it normally does.
+
+        Args:
+            phase: ``nodes`` or ``relationships``
+            records: Node or relationship dictionaries
+
+        Returns:
+            List of records that need to be written
+        """
+        return [record for record in records if self.is_changed(phase, record)]
+
+    def is_changed(self, phase: str, record: Dict[str, Any]) -> bool:
+        """
+        Check whether a record is new or changed, and count it.
+
+        The hash of a changed record is only recorded once the loader reports
+        it written through :meth:`mark_written`.
+
+        Args:
+            phase: ``nodes`` or ``relationships``
+            record: Node or relationship dictionary
+
+        Returns:
+            Whether the record needs to be written
+        """
+        try:
+            key = entity_key(phase, record)
+        except KeyError:
+            return True
+
+        digest = content_hash(record)
+        previous = self.hashes[phase].get(key)
+        if previous == digest:
+            self.stats[phase]["unchanged"] += 1
+            return False
+
+        self.stats[phase]["new" if previous is None else "updated"] += 1
+        with self._lock:
+            self.pending[phase][key] = digest
+        return True
+
+    def mark_written(self, phase: str, group: Any, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Record that rows were committed, so their hashes are saved.
+
+        Records that were skipped or rejected are never marked, so they are
+        sent again by the next run.
+
+        Args:
+            phase: ``nodes`` or ``relationships``
+            group: Sanitized label of the node rows, or ``(rel_type,
+                start_label, end_label)`` key of the relationship rows
+            rows: Rows of a committed batch
+        """
+        keys = [row_key(phase, group, row) for row in rows]
+        with self._lock:
+            pending = self.pending[phase]
+            for key in keys:
+                digest = pending.pop(key, None)
+                if digest is not None:
+                    self.written[phase][key] = digest
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        Log and return the new, updated and unchanged counts per phase.
+
+        Returns:
+            Dictionary of counts keyed by phase
+        """
+        for phase in PHASES:
+            stats = self.stats[phase]
+            logger.info(
+                f"Incremental {phase}: {stats['new']} new, {stats['updated']} updated, "
+                f"{stats['unchanged']} unchanged"
+            )
+        return self.stats
+
+    def save(self) -> None:
+        """Record the hashes of the written records in the sidecar file."""
+        for phase in PHASES:
+            self.hashes[phase].update(self.written[phase])
+            self.written[phase].clear()
+            self.pending[phase].clear()
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"scope": self.scope, **self.hashes}, file)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> None:
+        """Read previously recorded hashes from the sidecar file."""
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable delta index {self.path}: {e}")
+            return
+
+        if data.get("scope") != self.scope:
+            logger.warning(
+                f"Delta index {self.path} belongs to {data.get('scope')}, "
+                f"not {self.scope}; loading everything"
+            )
+            return
+
+        for phase in PHASES:
+            self.hashes[phase] = data.get(phase, {})
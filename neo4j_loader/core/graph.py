@@ -0,0 +1,739 @@
+"""
+Compact graph module for Neo4j data loading.
+
+This module contains the CompactGraph class, a columnar in-memory container
+for a whole payload. Labels, relationship types, node names and property key
+sets are interned once in string tables, records are stored as integer
+columns, and relationship endpoints are integer name IDs. Property values are
+kept in per-key columns shared by the records with the same property keys,
+with integers and floats in typed arrays. Records are only rebuilt as dictionaries one batch at
+a time, when they are grouped, validated or written, so a large payload
+costs a fraction of the memory of its parsed JSON.
+"""
+
+import copy
+import logging
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from ..utils.cypher_utils import sanitize_label
+from ..utils.file_utils import DEFAULT_SHARD_SIZE, iter_json_arrays, iter_ndjson, split_lines
+
+logger = logging.getLogger(__name__)
+
+NODE_FIELDS = ("name", "node_type")
+RELATIONSHIP_FIELDS = ("start", "end", "relationship_type")
+
+# Property strings up to this length are interned, so repeated values such
+# as an Entity_Type are stored once
+MAX_INTERNED_LENGTH = 64
+
+# Column value of records that are kept as they are
+_IRREGULAR = -1
+
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 63 - 1
+
+RelationshipKey = Tuple[str, str, str]
+
+
+def _compact_value(value: Any) -> Any:
+    """Intern short strings; other values are kept as they are."""
+    if type(value) is str and len(value) <= MAX_INTERNED_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _is_name(value: Any) -> bool:
+    """Check whether a node name or endpoint can be stored in the name table."""
+    return type(value) in (str, int)
+
+
+def _typecode(value: Any) -> Optional[str]:
+    """Get the array typecode that stores a value exactly, if any."""
+    value_type = type(value)
+    if value_type is int and _INT_MIN <= value <= _INT_MAX:
+        return "q"
+    if value_type is float:
+        return "d"
+    return None
+
+
+class StringTable:
+    """Maps each distinct value to a small integer ID and back."""
+
+    __slots__ = ("values", "ids")
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self.ids: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, value_id: int) -> Any:
+        return self.values[value_id]
+
+    def intern(self, value: Any) -> int:
+        """
+        Get the ID of a value, adding the value if it is new.
+
+        Args:
+            value: Hashable value, usually a string
+
+        Returns:
+            ID of the value
+        """
+        value_id = self.ids.get(value)
+        if value_id is None:
+            if type(value) is str:
+                value = sys.intern(value)
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+
+class ColumnBlock:
+    """Value columns of the records that share one tuple of property keys."""
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, width: int) -> None:
+        self.columns: List[Any] = [None] * width
+        self.size = 0
+
+    def append(self, values: Sequence[Any]) -> int:
+        """
+        Append the property values of one record.
+
+        A column starts as a typed array when its first value is an integer
+        or a float and becomes a list once a value of another type arrives.
+
+        Args:
+            values: Values in the order of the block's keys
+
+        Returns:
+            Row of the values in the block
+        """
+        columns = self.columns
+        if not self.size:
+            for position, value in enumerate(values):
+                typecode = _typecode(value)
+                columns[position] = array(typecode) if typecode else []
+
+        for position, value in enumerate(values):
+            column = columns[position]
+            if type(column) is array:
+                # Inlined _typecode, this runs once per stored value
+                value_type = type(value)
+                if column.typecode == "d":
+                    if value_type is float:
+                        column.append(value)
+                        continue
+                elif value_type is int and _INT_MIN <= value <= _INT_MAX:
+                    column.append(value)
+                    continue
+                column = columns[position] = list(column)
+            column.append(_compact_value(value))
+        self.size += 1
+        return self.size - 1
+
+    def row(self, row: int) -> Tuple[Any, ...]:
+        """Get the values of one record."""
+        return tuple(column[row] for column in self.columns)
+
+
+class PropertyColumns:
+    """Property values of one kind of record, in one ColumnBlock per key tuple."""
+
+    __slots__ = ("shapes", "blocks", "_layouts")
+
+    def __init__(self) -> None:
+        self.shapes = StringTable()
+        self.blocks: List[ColumnBlock] = []
+        # Record field tuple -> (key tuple ID, property keys)
+        self._layouts: Dict[Tuple[str, ...], Tuple[int, Tuple[str, ...]]] = {}
+
+    def store(self, record: Dict[str, Any], identity: Tuple[str, ...] = ()) -> Tuple[int, int]:
+        """
+        Store the properties of a record.
+
+        Args:
+            record: Record or property dictionary
+            identity: Fields of the record that are not properties
+
+        Returns:
+            Tuple of the ID of the record's key tuple and its row in that block
+        """
+        fields = tuple(record)
+        layout = self._layouts.get(fields)
+        if layout is None:
+            keys = tuple(sys.intern(key) for key in fields if key not in identity)
+            shape_id = self.shapes.intern(keys)
+            if shape_id == len(self.blocks):
+                self.blocks.append(ColumnBlock(len(keys)))
+            layout = self._layouts[fields] = (shape_id, keys)
+        shape_id, keys = layout
+        return shape_id, self.blocks[shape_id].append([record[key] for key in keys])
+
+    def properties(self, shape_id: int, row: int) -> Dict[str, Any]:
+        """Build the property dictionary stored at a key tuple ID and row."""
+        return dict(zip(self.shapes[shape_id], self.blocks[shape_id].row(row)))
+
+
+class RecordView(Sequence):
+    """Read-only sequence over records of a CompactGraph, built on access."""
+
+    __slots__ = ("graph", "indices", "_fetch")
+
+    def __init__(
+        self, graph: "CompactGraph", indices: Sequence[int], fetch: Callable[[int], Any]
+    ) -> None:
+        """
+        Initialize the RecordView.
+
+        Args:
+            graph: Graph holding the records
+            indices: Record indices in the graph, in view order
+            fetch: Function building the record at a graph index
+        """
+        self.graph = graph
+        self.indices = indices
+        self._fetch = fetch
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, slice):
+            return RecordView(self.graph, self.indices[item], self._fetch)
+        return self._fetch(self.indices[item])
+
+    def __iter__(self) -> Iterator[Any]:
+        fetch = self._fetch
+        for index in self.indices:
+            yield fetch(index)
+
+    def take(self, positions: Iterable[int]) -> "RecordView":
+        """
+        Select records of the view by position.
+
+        Args:
+            positions: Positions within this view, in the order to keep
+
+        Returns:
+            View of the selected records
+        """
+        return RecordView(
+            self.graph, array("i", (self.indices[position] for position in positions)), self._fetch
+        )
+
+
+class CompactGraph:
+    """Columnar container for the nodes and relationships of a payload."""
+
+    def __init__(self) -> None:
+        """Initialize an empty CompactGraph."""
+        self.labels = StringTable()
+        self.types = StringTable()
+        self.names = StringTable()
+        # A record stores the ID of its property key tuple and its row in
+        # the value columns of that key tuple
+        self.node_columns = PropertyColumns()
+        self.rel_columns = PropertyColumns()
+
+        self.node_label = array("i")
+        self.node_name = array("i")
+        self.node_shape = array("i")
+        self.node_row_index = array("i")
+
+        self.rel_type = array("i")
+        self.rel_start = array("i")
+        self.rel_end = array("i")
+        self.rel_shape = array("i")
+        self.rel_row_index = array("i")
+
+        # Records without the fields or value types the columns hold are kept
+        # as they are, so validation and the loader report them as usual
+        self.irregular_nodes: Dict[int, Any] = {}
+        self.irregular_relationships: Dict[int, Any] = {}
+
+        self._label_keys: Dict[int, str] = {}
+        self._type_keys: Dict[int, str] = {}
+
+    @classmethod
+    def from_payload(cls, json_data: Dict[str, Any]) -> "CompactGraph":
+        """
+        Build a graph from a parsed payload.
+
+        Args:
+            json_data: Dictionary containing nodes and relationships
+
+        Returns:
+            Graph holding the records of the payload
+        """
+        graph = cls()
+        graph.extend(json_data.get("nodes") or [], json_data.get("relationships") or [])
+        return graph
+
+    @classmethod
+    def from_file(
+        cls, file_path: str, start: int = 0, end: Optional[int] = None
+    ) -> "CompactGraph":
+        """
+        Build a graph from a JSON file without parsing it into memory first.
+
+        The ``nodes`` and ``relationships`` arrays are parsed incrementally,
+        so only the compact columns and one record are held at a time. NDJSON
+        files and standard input are read line by line, optionally limited
+        to one byte range of :func:`split_lines`.
+
+        Args:
+            file_path: Path to the JSON or NDJSON file, or ``-`` for standard input
+            start: Byte offset of the first NDJSON line to read
+            end: Byte offset after which no NDJSON line starts
+
+        Returns:
+            Graph holding the records of the file
+        """
+        if start or end is not None:
+            records = iter_ndjson(file_path, start, end)
+            source = f"bytes {start}-{end if end is not None else 'end'} of {file_path}"
+        else:
+            records = iter_json_arrays(file_path, ("nodes", "relationships"))
+            source = file_path
+
+        graph = cls()
+        for key, record in records:
+            if key == "nodes":
+                graph.add_node(record)
+            else:
+                graph.add_relationship(record)
+        logger.info(
+            f"Read {graph.node_count} nodes and {graph.relationship_count} "
+            f"relationships from {source}"
+        )
+        return graph
+
+    @classmethod
+    def merge(cls, graphs: Iterable["CompactGraph"]) -> "CompactGraph":
+        """
+        Merge several graphs into one, collapsing duplicate entities.
+
+        Nodes are merged by sanitized label and name, relationships by
+        sanitized type and endpoint names, a later record overrides the
+        properties it also defines, the first occurrence keeps its position,
+        and irregular records are appended as they are. :func:`merge_payloads`
+        merges parsed payloads through this method.
+
+        Args:
+            graphs: Graphs in precedence order
+
+        Returns:
+            Merged graph
+        """
+        merged = cls()
+        node_slots: Dict[Tuple[str, int], int] = {}
+        rel_slots: Dict[Tuple[str, int, int], int] = {}
+        irregular_nodes: List[Any] = []
+        irregular_rels: List[Any] = []
+        nodes_total = 0
+        rels_total = 0
+
+        for graph in graphs:
+            # Translate the IDs of this graph into IDs of the merged graph
+            label_ids = [merged.labels.intern(label) for label in graph.labels.values]
+            type_ids = [merged.types.intern(rel_type) for rel_type in graph.types.values]
+            name_ids = [merged.names.intern(name) for name in graph.names.values]
+
+            for index in range(graph.node_count):
+                nodes_total += 1
+                if index in graph.irregular_nodes:
+                    irregular_nodes.append(graph.irregular_nodes[index])
+                    continue
+                label_id = label_ids[graph.node_label[index]]
+                name_id = name_ids[graph.node_name[index]]
+                key = (merged.label_key(label_id), name_id)
+                slot = node_slots.get(key)
+                properties = graph.node_properties(index)
+                if slot is None:
+                    node_slots[key] = merged.node_count
+                    merged.node_label.append(label_id)
+                    merged.node_name.append(name_id)
+                    shape_id, row = merged.node_columns.store(properties)
+                    merged.node_shape.append(shape_id)
+                    merged.node_row_index.append(row)
+                else:
+                    # The superseded values stay behind in their block
+                    combined = merged.node_properties(slot)
+                    combined.update(properties)
+                    merged.node_shape[slot], merged.node_row_index[slot] = (
+                        merged.node_columns.store(combined)
+                    )
+
+            for index in range(graph.relationship_count):
+                rels_total += 1
+                if index in graph.irregular_relationships:
+                    irregular_rels.append(graph.irregular_relationships[index])
+                    continue
+                type_id = type_ids[graph.rel_type[index]]
+                start_id = name_ids[graph.rel_start[index]]
+                end_id = name_ids[graph.rel_end[index]]
+                key = (merged.type_key(type_id), start_id, end_id)
+                slot = rel_slots.get(key)
+                properties = graph.relationship_properties(index)
+                if slot is None:
+                    rel_slots[key] = merged.relationship_count
+                    merged.rel_type.append(type_id)
+                    merged.rel_start.append(start_id)
+                    merged.rel_end.append(end_id)
+                    shape_id, row = merged.rel_columns.store(properties)
+                    merged.rel_shape.append(shape_id)
+                    merged.rel_row_index.append(row)
+                else:
+                    combined = merged.relationship_properties(slot)
+                    combined.update(properties)
+                    merged.rel_shape[slot], merged.rel_row_index[slot] = (
+                        merged.rel_columns.store(combined)
+                    )
+
+        merged.extend(irregular_nodes, irregular_rels)
+        logger.info(
+            f"Merged {nodes_total} nodes into {merged.node_count} and "
+            f"{rels_total} relationships into {merged.relationship_count}"
+        )
+        return merged
+
+    def renamable(self) -> "CompactGraph":
+        """
+        Get a shallow copy whose names can be rewritten without rebuilding records.
+
+        The copy has its own node name and endpoint ID columns and irregular
+        relationships, and shares the string tables and property columns,
+        which it must not change, so it can also be made of a mapped graph.
+
+        Returns:
+            Graph sharing the records of this one
+        """
+        graph = copy.copy(self)
+        graph.node_name = array("i", self.node_name)
+        graph.rel_start = array("i", self.rel_start)
+        graph.rel_end = array("i", self.rel_end)
+        graph.irregular_relationships = dict(self.irregular_relationships)
+        return graph
+
+    @property
+    def node_count(self) -> int:
+        """Number of node records."""
+        return len(self.node_shape)
+
+    @property
+    def relationship_count(self) -> int:
+        """Number of relationship records."""
+        return len(self.rel_shape)
+
+    def extend(
+        self, nodes: Iterable[Any], relationships: Iterable[Any]
+    ) -> None:
+        """
+        Append node and relationship records, keeping their order.
+
+        Args:
+            nodes: Node dictionaries
+            relationships: Relationship dictionaries
+        """
+        for node in nodes:
+            self.add_node(node)
+        for rel in relationships:
+            self.add_relationship(rel)
+
+    def add_node(self, node: Any) -> int:
+        """
+        Append a node record.
+
+        Args:
+            node: Node dictionary
+
+        Returns:
+            Index of the node
+        """
+        index = self.node_count
+        if (
+            isinstance(node, dict)
+            and type(node.get("node_type")) is str
+            and _is_name(node.get("name"))
+        ):
+            self.node_label.append(self.labels.intern(node["node_type"]))
+            self.node_name.append(self.names.intern(node["name"]))
+            shape_id, row = self.node_columns.store(node, NODE_FIELDS)
+        else:
+            self.irregular_nodes[index] = node
+            self.node_label.append(_IRREGULAR)
+            self.node_name.append(_IRREGULAR)
+            shape_id, row = _IRREGULAR, _IRREGULAR
+        self.node_shape.append(shape_id)
+        self.node_row_index.append(row)
+        return index
+
+    def add_relationship(self, rel: Any) -> int:
+        """
+        Append a relationship record.
+
+        Args:
+            rel: Relationship dictionary
+
+        Returns:
+            Index of the relationship
+        """
+        index = self.relationship_count
+        if (
+            isinstance(rel, dict)
+            and type(rel.get("relationship_type")) is str
+            and _is_name(rel.get("start"))
+            and _is_name(rel.get("end"))
+        ):
+            self.rel_type.append(self.types.intern(rel["relationship_type"]))
+            self.rel_start.append(self.names.intern(rel["start"]))
+            self.rel_end.append(self.names.intern(rel["end"]))
+            shape_id, row = self.rel_columns.store(rel, RELATIONSHIP_FIELDS)
+        else:
+            self.irregular_relationships[index] = rel
+            for column in (self.rel_type, self.rel_start, self.rel_end):
+                column.append(_IRREGULAR)
+            shape_id, row = _IRREGULAR, _IRREGULAR
+        self.rel_shape.append(shape_id)
+        self.rel_row_index.append(row)
+        return index
+
+    def label_key(self, label_id: int) -> str:
+        """Get the sanitized label of a label ID."""
+        key = self._label_keys.get(label_id)
+        if key is None:
+            key = self._label_keys[label_id] = sanitize_label(self.labels[label_id])
+        return key
+
+    def type_key(self, type_id: int) -> str:
+        """Get the sanitized relationship type of a type ID."""
+        key = self._type_keys.get(type_id)
+        if key is None:
+            key = self._type_keys[type_id] = sanitize_label(self.types[type_id])
+        return key
+
+    def node_properties(self, index: int) -> Dict[str, Any]:
+        """Build the properties of a regular node, without its identity fields."""
+        return self.node_columns.properties(self.node_shape[index], self.node_row_index[index])
+
+    def relationship_properties(self, index: int) -> Dict[str, Any]:
+        """Build the properties of a regular relationship, without its identity fields."""
+        return self.rel_columns.properties(self.rel_shape[index], self.rel_row_index[index])
+
+    def node(self, index: int) -> Any:
+        """
+        Build the node record at an index.
+
+        Args:
+            index: Node index
+
+        Returns:
+            Node dictionary in the payload format
+        """
+        if index in self.irregular_nodes:
+            return self.irregular_nodes[index]
+        return {
+            "name": self.names[self.node_name[index]],
+            "node_type": self.labels[self.node_label[index]],
+            **self.node_properties(index),
+        }
+
+    def relationship(self, index: int) -> Any:
+        """
+        Build the relationship record at an index.
+
+        Args:
+            index: Relationship index
+
+        Returns:
+            Relationship dictionary in the payload format
+        """
+        if index in self.irregular_relationships:
+            return self.irregular_relationships[index]
+        return {
+            "start": self.names[self.rel_start[index]],
+            "end": self.names[self.rel_end[index]],
+            "relationship_type": self.types[self.rel_type[index]],
+            **self.relationship_properties(index),
+        }
+
+    def node_row(self, index: int) -> Dict[str, Any]:
+        """Build the ``{name, props}`` write row of a node."""
+        node = self.node(index)
+        properties = {k: v for k, v in node.items() if k != "node_type"}
+        return {"name": node["name"], "props": properties}
+
+    def relationship_row(self, index: int) -> Dict[str, Any]:
+        """Build the ``{start, end, props}`` write row of a relationship."""
+        if index in self.irregular_relationships:
+            rel = self.irregular_relationships[index]
+            properties = {k: v for k, v in rel.items() if k not in RELATIONSHIP_FIELDS}
+            return {"start": rel["start"], "end": rel["end"], "props": properties}
+        return {
+            "start": self.names[self.rel_start[index]],
+            "end": self.names[self.rel_end[index]],
+            "props": self.relationship_properties(index),
+        }
+
+    @property
+    def nodes(self) -> RecordView:
+        """Node records in input order."""
+        return RecordView(self, range(self.node_count), self.node)
+
+    @property
+    def relationships(self) -> RecordView:
+        """Relationship records in input order."""
+        return RecordView(self, range(self.relationship_count), self.relationship)
+
+    def to_payload(self) -> Dict[str, List[Any]]:
+        """
+        Build the payload the graph holds.
+
+        Returns:
+            Dictionary containing node and relationship dictionaries
+        """
+        return {"nodes": list(self.nodes), "relationships": list(self.relationships)}
+
+    def name_labels(
+        self, indices: Iterable[int], name_labels: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Map the names of nodes to their sanitized labels.
+
+        Like :func:`node_labels`, the first label of a name wins.
+
+        Args:
+            indices: Node indices
+            name_labels: Existing map to extend, if any
+
+        Returns:
+            Dictionary mapping node names to sanitized labels
+        """
+        if name_labels is None:
+            name_labels = {}
+        for index in indices:
+            if index in self.irregular_nodes:
+                node = self.irregular_nodes[index]
+                if isinstance(node, dict) and "name" in node and "node_type" in node:
+                    name_labels.setdefault(node["name"], sanitize_label(node["node_type"]))
+                continue
+            name_labels.setdefault(
+                self.names[self.node_name[index]], self.label_key(self.node_label[index])
+            )
+        return name_labels
+
+    def group_node_rows(self, indices: Iterable[int]) -> Dict[str, RecordView]:
+        """
+        Group nodes into views of ``{name, props}`` rows by sanitized label.
+
+        Only node indices are grouped; the rows are built when a view is read.
+
+        Args:
+            indices: Node indices
+
+        Returns:
+            Dictionary mapping each label to a view of its rows
+        """
+        groups: Dict[str, array] = {}
+
+        for index in indices:
+            if index in self.irregular_nodes:
+                node = self.irregular_nodes[index]
+                if not isinstance(node, dict) or "name" not in node or "node_type" not in node:
+                    logger.warning("Skipping node missing required fields: name or node_type")
+                    continue
+                label = sanitize_label(node["node_type"])
+            else:
+                label = self.label_key(self.node_label[index])
+            groups.setdefault(label, array("i")).append(index)
+
+        return {
+            label: RecordView(self, group, self.node_row) for label, group in groups.items()
+        }
+
+    def group_relationship_rows(
+        self, indices: Iterable[int], name_labels: Dict[str, str]
+    ) -> Dict[RelationshipKey, RecordView]:
+        """
+        Group relationships into views of ``{start, end, props}`` rows.
+
+        Rows are grouped by sanitized type and endpoint labels; relationships
+        whose endpoints are not in ``name_labels`` are skipped.
+
+        Args:
+            indices: Relationship indices
+            name_labels: Dictionary mapping node names to sanitized labels
+
+        Returns:
+            Dictionary mapping ``(rel_type, start_label, end_label)`` to a
+            view of its rows
+        """
+        groups: Dict[RelationshipKey, array] = {}
+
+        for index in indices:
+            if index in self.irregular_relationships:
+                rel = self.irregular_relationships[index]
+                if not isinstance(rel, dict) or not all(k in rel for k in RELATIONSHIP_FIELDS):
+                    logger.warning("Skipping relationship missing required fields")
+                    continue
+                rel_type, start, end = rel["relationship_type"], rel["start"], rel["end"]
+                rel_type = sanitize_label(rel_type)
+            else:
+                rel_type = self.type_key(self.rel_type[index])
+                start = self.names[self.rel_start[index]]
+                end = self.names[self.rel_end[index]]
+
+            if start not in name_labels or end not in name_labels:
+                continue
+            key = (rel_type, name_labels[start], name_labels[end])
+            groups.setdefault(key, array("i")).append(index)
+
+        return {
+            key: RecordView(self, group, self.relationship_row) for key, group in groups.items()
+        }
+
+
+def _load_shard(shard: Tuple[str, int, Optional[int]]) -> CompactGraph:
+    """Parse one file, or one byte range of an NDJSON file, into a graph."""
+    return CompactGraph.from_file(*shard)
+
+
+def load_graphs(
+    file_paths: List[str],
+    processes: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> List[CompactGraph]:
+    """
+    Parse input files into compact graphs in parallel worker processes.
+
+    NDJSON files larger than ``shard_size`` are split at line boundaries, so
+    a single large file is parsed by several workers too. Workers send back
+    the compact columns rather than the parsed records.
+
+    Args:
+        file_paths: Paths to the JSON or NDJSON files
+        processes: Number of worker processes (default: number of CPUs)
+        shard_size: Approximate number of bytes of an NDJSON shard
+
+    Returns:
+        Graphs of the files and their shards, in load order
+    """
+    shards = [
+        (path, start, end)
+        for path in file_paths
+        for start, end in split_lines(path, shard_size)
+    ]
+    if len(shards) == 1 or processes == 1:
+        return [_load_shard(shard) for shard in shards]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_load_shard, shards))
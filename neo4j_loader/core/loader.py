@@ -6,19 +6,108 @@ including connection management, node creation, and relationship creation.
 """
 
 import logging
-from typing import Dict, List, Any, Tuple
+import time
+from typing import Dict, List, Any, Hashable, Iterable, Iterator, Optional, Set, Tuple, Union
 
 from neo4j import GraphDatabase, Session, Transaction
 from neo4j.exceptions import ServiceUnavailable
 
+from .base import BaseLoader
+from .checkpoint import Checkpoint, uncommitted
+from .dead_letter import DeadLetterFile
+from .delta import DeltaIndex
+from .graph import CompactGraph, RecordView
+from .metrics import LoadMetrics, server_counters
+from .pipeline import PipelineScheduler
+from .pool import WriterPool, partition_disjoint, write_with_retry
+from .queries import (
+    DB_LABELS_QUERY,
+    RelationshipKey,
+    chunk,
+    first_labels,
+    group_node_rows,
+    group_relationship_rows,
+    lookup_labels_query,
+    missing_endpoints,
+    node_batch_query,
+    node_labels,
+    relationship_batch_nodes,
+    relationship_batch_query,
+    report_unresolved,
+)
+from .schema import SchemaManager
+from .sizing import BatchSizer
+from ..utils.file_utils import iter_json_batches
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+
+# Streamed rows are held back per label or type until they fill a batch, up
+# to this many input batches in total
+STREAM_BUFFER_BATCHES = 10
+
+
+class _RowBuffer:
+    """Grouped rows of a streamed phase, held back until they fill a batch."""
+
+    def __init__(self, batch_size: int, capacity: int) -> None:
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self.rows: Dict[Hashable, List[Dict[str, Any]]] = {}
+        # Input offset of the earliest record each key still holds
+        self.starts: Dict[Hashable, int] = {}
+        self.size = 0
+
+    def add(self, groups: Dict[Hashable, List[Dict[str, Any]]], start: int) -> None:
+        """Add the grouped rows of an input batch beginning at an offset."""
+        for key, rows in groups.items():
+            if rows:
+                self.rows.setdefault(key, []).extend(rows)
+                self.starts.setdefault(key, start)
+                self.size += len(rows)
+
+    def take(self, flush: bool = False) -> Dict[Hashable, List[Dict[str, Any]]]:
+        """
+        Remove the keys that are ready to be written.
+
+        Args:
+            flush: Whether to take every key rather than only the full ones
 
-class Neo4jLoader:
+        Returns:
+            Dictionary mapping keys to all of their rows
+        """
+        if flush or self.size >= self.capacity:
+            keys = list(self.rows)
+        else:
+            keys = [key for key, rows in self.rows.items() if len(rows) >= self.batch_size]
+        taken = {key: self.rows.pop(key) for key in keys}
+        for key, rows in taken.items():
+            del self.starts[key]
+            self.size -= len(rows)
+        return taken
+
+    def committed(self, end: int) -> int:
+        """Get the input offset before which every record has been written."""
+        return min(self.starts.values(), default=end)
+
+
+class Neo4jLoader(BaseLoader):
     """Handles loading data into Neo4j from a structured JSON file."""
 
     def __init__(
-        self, uri: str, username: str, password: str, encrypted: bool = True
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        encrypted: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = 1,
+        metrics: Optional[LoadMetrics] = None,
+        dead_letters: Optional[DeadLetterFile] = None,
+        pipeline: bool = True,
+        sizer: Optional[BatchSizer] = None,
+        driver: Any = None,
     ) -> None:
         """
         Initialize the Neo4jLoader with connection parameters.
@@ -28,13 +117,32 @@ class Neo4jLoader:
             username: Neo4j username
             password: Neo4j password
             encrypted: Whether to use encryption for the connection
+            batch_size: Maximum number of rows sent per write transaction;
+                with a sizer, the size of the first batch of every key
+            workers: Number of concurrent writer threads
+            metrics: Metrics collector shared with the caller; a new one is
+                created when omitted
+            dead_letters: File receiving records the database rejects; when
+                omitted they are only logged
+            pipeline: Whether relationship batches may start while nodes are
+                still being written; only used with several workers and
+                when not resuming from checkpointed offsets
+            sizer: Batch sizer adapting the rows per transaction of every
+                label and relationship type; ``batch_size`` is fixed when
+                omitted
+            driver: Open driver to use instead of connecting; it stays owned
+                by the caller and is left open by :meth:`close`
         """
-        self.uri = uri
-        self.username = username
-        self.password = password
-        self.encrypted = encrypted
-        self.driver = None
-        self.connect()
+        super().__init__(
+            uri, username, password, encrypted, batch_size, metrics, dead_letters,
+            pipeline, sizer, driver,
+        )
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.workers = workers
+        if self._owns_driver:
+            self.connect()
 
     def connect(self) -> None:
         """
@@ -57,184 +165,599 @@ class Neo4jLoader:
             raise
 
     def close(self) -> None:
-        """Close the Neo4j database connection."""
-        if self.driver:
+        """Close the Neo4j database connection, unless the caller owns the driver."""
+        if self.driver and self._owns_driver:
             self.driver.close()
             logger.info("Neo4j connection closed")
 
-    def load_data(self, json_data: Dict[str, List[Dict[str, Any]]]) -> Tuple[int, int]:
+    def load_data(
+        self,
+        json_data: Union[CompactGraph, Dict[str, List[Dict[str, Any]]]],
+        checkpoint: Optional[Checkpoint] = None,
+        delta: Optional[DeltaIndex] = None,
+    ) -> Tuple[int, int]:
         """
         Load data from parsed JSON into Neo4j.
 
+        The payload is held as a :class:`CompactGraph`; a dictionary payload
+        is converted first. Rows are built one batch at a time while writing.
+
         Args:
-            json_data: Dictionary containing nodes and relationships
+            json_data: Compact graph, or dictionary containing nodes and
+                relationships
+            checkpoint: Checkpoint recording committed records per phase; when
+                given, records it already covers are skipped
+            delta: Delta index of previously written content hashes; when
+                given, only new or changed records are written
 
         Returns:
             Tuple containing count of created nodes and relationships
         """
         nodes_count = 0
         rels_count = 0
+        rels_matched = 0
+        self._delta = delta
 
         try:
-            # Process nodes
-            if "nodes" in json_data:
-                nodes_count = self._create_nodes(json_data["nodes"])
+            nodes, relationships, name_labels = self._prepare(json_data, delta)
+
+            # Resolve relationship endpoint labels before anything is written
+            if relationships:
+                with self.metrics.phase("resolve"):
+                    self._resolve_endpoint_labels(relationships, name_labels)
+
+            if self._pipelined(nodes, relationships, checkpoint, self.workers):
+                nodes_count, rels_count, rels_matched = self._load_pipelined(
+                    nodes, relationships, name_labels, checkpoint
+                )
                 logger.info(f"Successfully created {nodes_count} nodes")
+                logger.info(
+                    f"Successfully created {rels_count} relationships "
+                    f"({rels_matched} already existed)"
+                )
+            else:
+                if nodes:
+                    with self.metrics.phase("nodes"):
+                        nodes_count = self._write_node_groups(
+                            self._node_groups(nodes, checkpoint)
+                        )
+                    logger.info(f"Successfully created {nodes_count} nodes")
+
+                if relationships:
+                    with self.metrics.phase("relationships"):
+                        rels_count, rels_matched = self._write_relationship_groups(
+                            self._relationship_groups(relationships, name_labels, checkpoint)
+                        )
+                    logger.info(
+                        f"Successfully created {rels_count} relationships "
+                        f"({rels_matched} already existed)"
+                    )
+
+            self._finish(checkpoint, delta)
+            return nodes_count, rels_count
+
+        except Exception as e:
+            logger.error(f"Error loading data: {e}")
+            raise
+        finally:
+            self._delta = None
+            self._progress = {}
+
+    def _load_pipelined(
+        self,
+        nodes: RecordView,
+        relationships: RecordView,
+        name_labels: Dict[str, str],
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Tuple[int, int, int]:
+        """
+        Write nodes and relationships with overlapping phases.
+
+        Each relationship batch is released as soon as the node batches
+        holding its endpoints have committed, instead of after every node.
+
+        Args:
+            nodes: Nodes of a compact graph
+            relationships: Relationships of the same graph
+            name_labels: Dictionary mapping node names to sanitized labels
+            checkpoint: Checkpoint recording committed records per phase
+
+        Returns:
+            Tuple containing count of created nodes, created relationships
+            and already existing relationships
+        """
+        node_batches, relationship_batches, dependencies = self._plan_pipeline(
+            nodes, relationships, name_labels, checkpoint
+        )
+        scheduler = PipelineScheduler(self.driver, self.workers, self.metrics)
+        nodes_count, created, merged = scheduler.run(
+            node_batches,
+            relationship_batches,
+            dependencies,
+            self._write_node_batch,
+            self._write_relationship_batch,
+        )
+        return nodes_count, created, merged - created
+
+    def load_file_stream(
+        self,
+        file_path: str,
+        checkpoint: Optional[Checkpoint] = None,
+        delta: Optional[DeltaIndex] = None,
+        schema: Optional[SchemaManager] = None,
+    ) -> Tuple[int, int]:
+        """
+        Stream a JSON file into Neo4j without loading it into memory.
+
+        The ``nodes`` and ``relationships`` arrays are parsed incrementally
+        and written as they fill batches, so memory is bounded by a few
+        batches rather than the file size. The file is parsed once per array.
+
+        Args:
+            file_path: Path to the JSON file
+            checkpoint: Checkpoint recording committed records per phase; when
+                given, records it already covers are skipped
+            delta: Delta index of previously written content hashes; when
+                given, only new or changed records are written
+            schema: Schema manager creating the ``name`` constraint of every
+                label before its first nodes are written, if any
 
-            # Process relationships
-            if "relationships" in json_data:
-                rels_count = self._create_relationships(json_data["relationships"])
-                logger.info(f"Successfully created {rels_count} relationships")
+        Returns:
+            Tuple containing count of created nodes and relationships
+        """
+        return self.load_batches(
+            iter_json_batches(file_path, "nodes", self.batch_size),
+            iter_json_batches(file_path, "relationships", self.batch_size),
+            checkpoint,
+            delta,
+            schema,
+        )
+
+    def load_batches(
+        self,
+        node_batches: Iterable[List[Dict[str, Any]]],
+        relationship_batches: Iterable[List[Dict[str, Any]]],
+        checkpoint: Optional[Checkpoint] = None,
+        delta: Optional[DeltaIndex] = None,
+        schema: Optional[SchemaManager] = None,
+    ) -> Tuple[int, int]:
+        """
+        Write streams of node and relationship batches into Neo4j.
+
+        All node batches are written before the first relationship batch is
+        read. Only a name-to-label map of the nodes is kept to resolve
+        relationship endpoints; names it lacks are looked up in the database
+        once. Rows are held back per label or relationship key until they
+        fill a batch, so mixed input batches do not fragment into many small
+        transactions; at most ``STREAM_BUFFER_BATCHES`` input batches are
+        held at a time. Unresolved relationships are reported per batch
+        instead of before the first write. Batches must be produced in the
+        same order on every run for checkpoints to resume correctly.
+
+        Args:
+            node_batches: Batches of node dictionaries
+            relationship_batches: Batches of relationship dictionaries
+            checkpoint: Checkpoint recording committed records per phase; when
+                given, records it already covers are skipped
+            delta: Delta index of previously written content hashes; when
+                given, only new or changed records are written
+            schema: Schema manager creating the ``name`` constraint of every
+                label before its first nodes are written, if any
 
+        Returns:
+            Tuple containing count of created nodes and relationships
+        """
+        nodes_count = 0
+        rels_count = 0
+        rels_matched = 0
+        name_labels: Dict[str, str] = {}
+        looked_up: Set[str] = set()
+        schema_labels: Set[str] = set()
+        capacity = max(self.plan_size, self.batch_size * STREAM_BUFFER_BATCHES)
+        self._delta = delta
+
+        try:
+            # Committed node batches are still read to rebuild the label map
+            node_batches = self._labelled(node_batches, name_labels)
+            # Phase times include parsing, which is interleaved with writing
+            with self.metrics.phase("nodes"):
+                buffer = _RowBuffer(self.plan_size, capacity)
+                start = end = checkpoint.offset("nodes") if checkpoint else 0
+                for batch, end in uncommitted("nodes", node_batches, checkpoint):
+                    if delta:
+                        batch = delta.changed("nodes", batch)
+                    buffer.add(group_node_rows(batch), start)
+                    nodes_count += self._write_streamed_nodes(
+                        buffer.take(), schema, schema_labels
+                    )
+                    if checkpoint:
+                        checkpoint.commit("nodes", buffer.committed(end))
+                    start = end
+                nodes_count += self._write_streamed_nodes(
+                    buffer.take(flush=True), schema, schema_labels
+                )
+                if checkpoint:
+                    checkpoint.commit("nodes", end)
+            logger.info(f"Successfully created {nodes_count} nodes")
+
+            with self.metrics.phase("relationships"):
+                buffer = _RowBuffer(self.plan_size, capacity)
+                start = end = checkpoint.offset("relationships") if checkpoint else 0
+                for batch, end in uncommitted("relationships", relationship_batches, checkpoint):
+                    if delta:
+                        batch = delta.changed("relationships", batch)
+                    with self.metrics.phase("resolve"):
+                        self._resolve_endpoint_labels(batch, name_labels, looked_up)
+                    buffer.add(group_relationship_rows(batch, name_labels), start)
+                    created, matched = self._write_relationship_groups(buffer.take())
+                    rels_count += created
+                    rels_matched += matched
+                    if checkpoint:
+                        checkpoint.commit("relationships", buffer.committed(end))
+                    start = end
+                created, matched = self._write_relationship_groups(buffer.take(flush=True))
+                rels_count += created
+                rels_matched += matched
+                if checkpoint:
+                    checkpoint.commit("relationships", end)
+            logger.info(
+                f"Successfully created {rels_count} relationships "
+                f"({rels_matched} already existed)"
+            )
+
+            self._finish(checkpoint, delta)
             return nodes_count, rels_count
 
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
+        finally:
+            self._delta = None
 
-    def _create_nodes(self, nodes: List[Dict[str, Any]]) -> int:
+    @staticmethod
+    def _labelled(
+        batches: Iterable[List[Dict[str, Any]]], name_labels: Dict[str, str]
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Create nodes in Neo4j from the provided list.
+        Pass node batches through while adding their names to a label map.
 
         Args:
-            nodes: List of node dictionaries with properties
+            batches: Node batches
+            name_labels: Dictionary mapping node names to labels, updated in place
+
+        Yields:
+            The unchanged node batches
+        """
+        for batch in batches:
+            node_labels(batch, name_labels)
+            yield batch
+
+    def _write_streamed_nodes(
+        self,
+        rows_by_label: Dict[str, List[Dict[str, Any]]],
+        schema: Optional[SchemaManager],
+        schema_labels: Set[str],
+    ) -> int:
+        """
+        Write grouped node rows, first creating the schema of new labels.
+
+        Args:
+            rows_by_label: Dictionary mapping sanitized labels to their rows
+            schema: Schema manager, or None to write without it
+            schema_labels: Labels whose schema is already in place, updated
+                in place
 
         Returns:
             Number of nodes created
         """
-        created_count = 0
+        if schema:
+            labels = set(rows_by_label) - schema_labels
+            if labels:
+                with self.metrics.phase("schema"):
+                    schema.ensure_schema(labels)
+                schema_labels |= labels
+        return self._write_node_groups(rows_by_label)
+
+    def _resolve_endpoint_labels(
+        self,
+        relationships: List[Dict[str, Any]],
+        name_labels: Dict[str, str],
+        looked_up: Optional[Set[str]] = None,
+    ) -> None:
+        """
+        Complete ``name_labels`` with every relationship endpoint name.
 
-        with self.driver.session() as session:
-            for node in nodes:
-                try:
-                    # Extract node type and name (required fields)
-                    if "name" not in node or "node_type" not in node:
-                        logger.warning("Skipping node missing required fields: name or node_type")
-                        continue
-
-                    node_name = node.pop("name")
-                    node_type = node.pop("node_type")
-                    
-                    # Create the node with a MERGE operation to avoid duplicates
-                    result = session.execute_write(
-                        self._create_node_tx, node_name, node_type, node
-                    )
-                    created_count += result
-                    logger.debug(f"Created node: {node_name} ({node_type})")
-                except Exception as e:
-                    logger.error(f"Error creating node {node.get('name', 'unknown')}: {e}")
+        Names are resolved from the nodes of the same payload first. Names not
+        found there are looked up in the database in one read transaction,
+        with a label-qualified match per existing label. Edges
+        whose endpoints still cannot be resolved are reported here, before any
+        write starts, and will be skipped.
 
-        return created_count
+        Args:
+            relationships: List of relationship dictionaries from the payload
+            name_labels: Dictionary mapping node names to sanitized labels,
+                updated in place
+            looked_up: Names already looked up in the database, which are not
+                looked up again; updated in place
+        """
+        missing = missing_endpoints(relationships, name_labels)
+        if looked_up is not None:
+            missing = [name for name in missing if name not in looked_up]
+            looked_up.update(missing)
+        if missing:
+            with self.driver.session() as session:
+                name_labels.update(session.execute_read(self._lookup_labels_tx, missing))
+
+        report_unresolved(relationships, name_labels)
 
     @staticmethod
-    def _create_node_tx(tx: Transaction, name: str, label: str, properties: Dict[str, Any]) -> int:
+    def _lookup_labels_tx(tx: Transaction, names: List[str]) -> Dict[str, str]:
         """
-        Create a node in Neo4j within a transaction.
+        Look up the labels of existing nodes by name within a transaction.
 
         Args:
             tx: Neo4j transaction
-            name: Name of the node
-            label: Label (type) of the node
-            properties: Node properties
+            names: Node names to look up
 
         Returns:
-            Number of nodes created (0 or 1)
+            Dictionary mapping the names that were found to their first label
         """
-        # Sanitize the label to remove any special characters
-        label = label.replace("/", "_").replace(" ", "_")
-        
-        query = (
-            f"MERGE (n:{label} {{name: $name}}) "
-            "SET n += $properties "
-            "RETURN count(n) as count"
-        )
-        
-        # Include name in properties for consistency
-        all_properties = {"name": name, **properties}
-        
-        result = tx.run(query, name=name, properties=all_properties)
-        record = result.single()
-        return record["count"] if record else 0
+        query = lookup_labels_query(record["label"] for record in tx.run(DB_LABELS_QUERY))
+        if query is None:
+            return {}
+        return first_labels(tx.run(query, names=names))
+
+    def _write_node_groups(self, rows_by_label: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        Write node rows grouped by label.
 
-    def _create_relationships(self, relationships: List[Dict[str, Any]]) -> int:
+        Each label is written in batches of at most ``plan_size`` rows, split
+        further to the sizes the sizer adapted to it, one transaction each.
+
+        Args:
+            rows_by_label: Dictionary mapping sanitized labels to their rows
+
+        Returns:
+            Number of nodes created
         """
-        Create relationships in Neo4j from the provided list.
+        # Each label is written by a single worker, different labels in parallel
+        pool = WriterPool(self.driver, self.workers)
+        return sum(pool.run(rows_by_label.items(), self._write_node_label))
+
+    def _write_node_label(
+        self, session: Session, label: str, rows: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Write all node rows of one label in batches through a session.
 
         Args:
-            relationships: List of relationship dictionaries
+            session: Neo4j session
+            label: Sanitized label (type) of the nodes
+            rows: List of ``{"name": ..., "props": {...}}`` rows
 
         Returns:
-            Number of relationships created
+            Number of nodes created
         """
         created_count = 0
 
-        with self.driver.session() as session:
-            for rel in relationships:
-                try:
-                    # Check for required fields
-                    if not all(k in rel for k in ["start", "end", "relationship_type"]):
-                        logger.warning("Skipping relationship missing required fields")
-                        continue
-
-                    # Extract relationship details
-                    start_node = rel["start"]
-                    end_node = rel["end"]
-                    rel_type = rel["relationship_type"]
-                    
-                    # Extract additional properties if any
-                    properties = {k: v for k, v in rel.items() 
-                                  if k not in ["start", "end", "relationship_type"]}
-
-                    # Create the relationship
-                    result = session.execute_write(
-                        self._create_relationship_tx,
-                        start_node,
-                        end_node,
-                        rel_type,
-                        properties,
-                    )
-                    created_count += result
-                    logger.debug(
-                        f"Created relationship: ({start_node})-[:{rel_type}]->({end_node})"
-                    )
-                except Exception as e:
-                    logger.error(f"Error creating relationship: {e}")
+        for batch in chunk(rows, self.plan_size):
+            created_count += self._write_node_batch(session, label, batch)
 
         return created_count
 
-    @staticmethod
-    def _create_relationship_tx(
-        tx: Transaction, start_node: str, end_node: str, rel_type: str, properties: Dict[str, Any]
+    def _write_node_batch(
+        self, session: Session, label: str, batch: List[Dict[str, Any]]
     ) -> int:
         """
-        Create a relationship in Neo4j within a transaction.
+        Write one planned batch of node rows.
+
+        With a batch sizer, the batch is written in transactions of the size
+        currently adapted to its label.
 
         Args:
-            tx: Neo4j transaction
-            start_node: Name of the start node
-            end_node: Name of the end node
-            rel_type: Type of relationship
-            properties: Relationship properties
-
-        Returns:
-            Number of relationships created (0 or 1)
-        """
-        # Sanitize the relationship type to remove any special characters
-        rel_type = rel_type.replace("/", "_").replace(" ", "_")
-        
-        # Use MATCH to find the nodes and MERGE to create the relationship
-        query = (
-            "MATCH (a {name: $start_node}), (b {name: $end_node}) "
-            f"MERGE (a)-[r:{rel_type}]->(b) "
-            "SET r += $properties "
-            "RETURN count(r) as count"
+            session: Neo4j session
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Number of nodes created
+        """
+        if self.sizer:
+            created = sum(self.sizer.write(
+                ("nodes", label), batch, lambda rows: self._write_node_rows(session, label, rows)
+            ))
+        else:
+            created = self._write_node_rows(session, label, batch)
+        self._committed("nodes", batch)
+        return created
+
+    def _write_node_rows(
+        self, session: Session, label: str, batch: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Write node rows in one transaction, isolating rejected rows by bisection.
+
+        A batch that still fails after its retries is split in half and each
+        half is written on its own, so the valid rows commit in a few larger
+        transactions while the rejected ones are narrowed down to single
+        rows and sent to the dead-letter file.
+
+        Args:
+            session: Neo4j session
+            label: Sanitized label (type) of the nodes
+            batch: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Number of nodes created
+        """
+        start = time.perf_counter()
+        try:
+            # Create the batch with a MERGE operation to avoid duplicates
+            (created, counters), retries = write_with_retry(
+                session, self._create_node_batch_tx, label, batch
+            )
+        except Exception as e:
+            if not self._node_rows_failed(label, batch, e, time.perf_counter() - start):
+                return 0
+            middle = len(batch) // 2
+            return self._write_node_rows(
+                session, label, batch[:middle]
+            ) + self._write_node_rows(session, label, batch[middle:])
+
+        return self._node_rows_written(
+            label, batch, created, counters, time.perf_counter() - start, retries
         )
-        
-        result = tx.run(
-            query,
-            start_node=start_node,
-            end_node=end_node,
-            properties=properties,
+
+    @staticmethod
+    def _create_node_batch_tx(
+        tx: Transaction, label: str, rows: List[Dict[str, Any]]
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Create a batch of nodes sharing one label within a transaction.
+
+        Args:
+            tx: Neo4j transaction
+            label: Sanitized label (type) of the nodes
+            rows: List of ``{"name": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing number of nodes created, not counting nodes
+            that already existed, and the server counters of the statement
+        """
+        # Views of a compact graph are built into rows here, one batch at a time
+        result = tx.run(node_batch_query(label), rows=list(rows))
+        counters = server_counters(result.consume().counters)
+        return counters["nodes_created"], counters
+
+    def _write_relationship_groups(
+        self, rows_by_key: Dict[RelationshipKey, List[Dict[str, Any]]]
+    ) -> Tuple[int, int]:
+        """
+        Write relationship rows grouped by type and endpoint labels.
+
+        Each key is written in batches like :meth:`_write_node_groups`; rows
+        whose endpoints could not be resolved were left out when grouping.
+
+        Args:
+            rows_by_key: Dictionary mapping ``(rel_type, start_label,
+                end_label)`` to rows
+
+        Returns:
+            Tuple containing count of created and already existing relationships
+        """
+        created_count = 0
+        matched_count = 0
+        batches = self._plan(rows_by_key)
+
+        # Batches in the same round share no endpoint node, so they can be
+        # written concurrently without lock contention or deadlocks
+        if self.workers > 1:
+            rounds = partition_disjoint(batches, relationship_batch_nodes)
+        else:
+            rounds = [batches]
+
+        pool = WriterPool(self.driver, self.workers)
+        for batch_round in rounds:
+            for created, merged in pool.run(batch_round, self._write_relationship_batch):
+                created_count += created
+                matched_count += merged - created
+
+        return created_count, matched_count
+
+    def _write_relationship_batch(
+        self,
+        session: Session,
+        key: Tuple[str, str, str],
+        batch: List[Dict[str, Any]],
+    ) -> Tuple[int, int]:
+        """
+        Write one planned batch of relationship rows.
+
+        With a batch sizer, the batch is written in transactions of the size
+        currently adapted to its relationship type and endpoint labels.
+
+        Args:
+            session: Neo4j session
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of created and merged relationships
+        """
+        if self.sizer:
+            results = self.sizer.write(
+                ("relationships",) + key,
+                batch,
+                lambda rows: self._write_relationship_rows(session, key, rows),
+            )
+            created = sum(created for created, _ in results)
+            merged = sum(merged for _, merged in results)
+        else:
+            created, merged = self._write_relationship_rows(session, key, batch)
+        self._committed("relationships", batch)
+        return created, merged
+
+    def _write_relationship_rows(
+        self,
+        session: Session,
+        key: Tuple[str, str, str],
+        batch: List[Dict[str, Any]],
+    ) -> Tuple[int, int]:
+        """
+        Write relationship rows in one transaction through a session.
+
+        A batch that still fails after its retries is bisected like a node
+        batch, and rows rejected on their own go to the dead-letter file.
+
+        Args:
+            session: Neo4j session
+            key: Tuple of sanitized relationship type, start label and end label
+            batch: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of created and merged relationships
+        """
+        start = time.perf_counter()
+        try:
+            (merged, counters), retries = write_with_retry(
+                session, self._create_relationship_batch_tx, *key, batch
+            )
+        except Exception as e:
+            if not self._relationship_rows_failed(key, batch, e, time.perf_counter() - start):
+                return 0, 0
+            middle = len(batch) // 2
+            first = self._write_relationship_rows(session, key, batch[:middle])
+            second = self._write_relationship_rows(session, key, batch[middle:])
+            return first[0] + second[0], first[1] + second[1]
+
+        return self._relationship_rows_written(
+            key, batch, merged, counters, time.perf_counter() - start, retries
         )
+
+    @staticmethod
+    def _create_relationship_batch_tx(
+        tx: Transaction,
+        rel_type: str,
+        start_label: str,
+        end_label: str,
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Create a batch of relationships sharing one type within a transaction.
+
+        Args:
+            tx: Neo4j transaction
+            rel_type: Sanitized type of the relationships
+            start_label: Sanitized label of the start nodes
+            end_label: Sanitized label of the end nodes
+            rows: List of ``{"start": ..., "end": ..., "props": {...}}`` rows
+
+        Returns:
+            Tuple containing count of merged (created or matched)
+            relationships and the server counters of the statement
+        """
+        query = relationship_batch_query(rel_type, start_label, end_label)
+        result = tx.run(query, rows=list(rows))
         record = result.single()
-        return record["count"] if record else 0 
\ No newline at end of file
+        merged = record["count"] if record else 0
+        return merged, server_counters(result.consume().counters)
@@ -0,0 +1,39 @@
+"""
+Payload merging module for multi-file Neo4j data loading.
+
+This module contains the function that combines several parsed payloads into one
+before anything is written, so entities that appear in more than one file are
+sent to Neo4j once per run.
+"""
+
+from typing import Dict, List, Any, Iterable
+
+from .graph import CompactGraph
+
+
+def merge_payloads(
+    payloads: Iterable[Dict[str, List[Dict[str, Any]]]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merge several payloads into one, collapsing duplicate entities.
+
+    Nodes are merged by sanitized label and name, relationships by sanitized
+    type and endpoint names; these are the identities the loader MERGEs on.
+    Property precedence follows payload order: a later payload overrides the
+    values of properties it also defines and keeps the others, which is the
+    result loading the files one after another would have produced. The
+    first occurrence keeps its position in the output.
+
+    Records that are not objects, or whose identifying fields are missing or
+    not strings (names may also be integers), are kept as they are so the
+    loader can report them as usual. The payloads are merged as compact
+    graphs by :meth:`CompactGraph.merge`, so both apply the same rules.
+
+    Args:
+        payloads: Parsed payloads, in precedence order
+
+    Returns:
+        Dictionary containing the merged nodes and relationships
+    """
+    graphs = (CompactGraph.from_payload(payload) for payload in payloads)
+    return CompactGraph.merge(graphs).to_payload()
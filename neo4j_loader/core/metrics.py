@@ -0,0 +1,198 @@
+"""
+Metrics module for Neo4j data loading.
+
+This module contains the LoadMetrics class that records wall time, row
+counts, retries and server counters per phase and per batch, so a slow load
+can be traced to parsing, the network, locking or server commit time.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_COUNTERS = ("nodes_created", "properties_set", "relationships_created")
+
+
+def server_counters(counters: Any) -> Dict[str, int]:
+    """
+    Extract the counters the loader reports from a result summary.
+
+    Args:
+        counters: ``SummaryCounters`` of a consumed result
+
+    Returns:
+        Dictionary of the reported counter values
+    """
+    return {name: getattr(counters, name, 0) for name in SERVER_COUNTERS}
+
+
+class LoadMetrics:
+    """Collects per-phase and per-batch timings for one load run."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.batches: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _phase(self, phase: str) -> Dict[str, Any]:
+        """Get or create the totals of a phase."""
+        if phase not in self.phases:
+            self.phases[phase] = {
+                "wall_time": 0.0,
+                "batches": 0,
+                "rows": 0,
+                "retries": 0,
+                "failed_batches": 0,
+                "failed_rows": 0,
+                **{name: 0 for name in SERVER_COUNTERS},
+            }
+        return self.phases[phase]
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """
+        Time a phase of the load; repeated entries accumulate.
+
+        Args:
+            phase: Phase name, e.g. ``parse``, ``nodes`` or ``relationships``
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, time.perf_counter() - start)
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """
+        Add wall time to a phase that was not timed with :meth:`phase`.
+
+        Args:
+            phase: Phase name, e.g. ``nodes`` or ``relationships``
+            seconds: Wall time to add
+        """
+        with self._lock:
+            self._phase(phase)["wall_time"] += seconds
+
+    def record_batch(
+        self,
+        phase: str,
+        group: str,
+        rows: int,
+        seconds: float,
+        retries: int = 0,
+        counters: Optional[Dict[str, int]] = None,
+        failed: bool = False,
+    ) -> None:
+        """
+        Record one written batch.
+
+        The rows of a failed batch are counted as ``failed_rows`` rather
+        than ``rows``, since they are written again, or dead-lettered, by
+        the batches it is split into.
+
+        Args:
+            phase: Phase name, ``nodes`` or ``relationships``
+            group: Label or relationship type of the batch
+            rows: Number of rows in the batch
+            seconds: Wall time of the write transaction, including retries
+            retries: Number of times the transaction was retried
+            counters: Server counters of the committed transaction
+            failed: Whether the batch failed to commit
+        """
+        counters = counters or {}
+        batch = {
+            "phase": phase,
+            "group": group,
+            "rows": rows,
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 and not failed else None,
+            "retries": retries,
+            "failed": failed,
+            **{name: counters.get(name, 0) for name in SERVER_COUNTERS},
+        }
+        logger.debug(
+            f"{phase} batch {group}: {rows} rows in {seconds:.3f}s, {retries} retries"
+        )
+
+        with self._lock:
+            self.batches.append(batch)
+            totals = self._phase(phase)
+            totals["batches"] += 1
+            if failed:
+                totals["failed_batches"] += 1
+                totals["failed_rows"] += rows
+            else:
+                totals["rows"] += rows
+            totals["retries"] += retries
+            for name in SERVER_COUNTERS:
+                totals[name] += batch[name]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get all metrics in a JSON-serializable form.
+
+        Returns:
+            Dictionary with per-phase totals and the list of batches
+        """
+        phases = {}
+        for name, totals in self.phases.items():
+            wall_time = totals["wall_time"]
+            phases[name] = {
+                **totals,
+                "wall_time": round(wall_time, 6),
+                "rows_per_second": round(totals["rows"] / wall_time, 1) if wall_time > 0 else None,
+            }
+        return {"phases": phases, "batches": self.batches}
+
+    def summary_table(self) -> str:
+        """
+        Format the per-phase totals as a text table.
+
+        Returns:
+            Table with one row per phase
+        """
+        headers = [
+            "phase", "batches", "rows", "wall s", "rows/s", "retries",
+            "failed", "failed rows", "nodes+", "props set", "rels+",
+        ]
+        rows = [headers]
+        for name, totals in self.as_dict()["phases"].items():
+            rows.append([
+                name,
+                str(totals["batches"]),
+                str(totals["rows"]),
+                f"{totals['wall_time']:.3f}",
+                f"{totals['rows_per_second']:.1f}" if totals["rows_per_second"] else "-",
+                str(totals["retries"]),
+                str(totals["failed_batches"]),
+                str(totals["failed_rows"]),
+                str(totals["nodes_created"]),
+                str(totals["properties_set"]),
+                str(totals["relationships_created"]),
+            ])
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+        lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def log_summary(self) -> None:
+        """Log the summary table."""
+        logger.info("Load summary:\n" + self.summary_table())
+
+    def write_json(self, path: str) -> None:
+        """
+        Write all metrics to a JSON file.
+
+        Args:
+            path: Path to the metrics file
+        """
+        with open(path, "w") as file:
+            json.dump(self.as_dict(), file, indent=2)
+        logger.info(f"Metrics written to {path}")
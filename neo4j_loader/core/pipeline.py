@@ -0,0 +1,377 @@
+"""
+Pipelined write scheduling module for Neo4j data loading.
+
+This module contains the PipelineScheduler class that writes node and
+relationship batches on the same writer threads instead of in two strict
+phases. A relationship batch is released as soon as the node batches holding
+its endpoints have committed, so relationship writes overlap with the nodes
+still being written for other labels and the load takes about as long as the
+slower of the two phases rather than their sum.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Awaitable, Callable, Deque, Hashable, Optional, Set, Tuple
+
+from neo4j import Driver, Session
+
+from .graph import RecordView
+from .metrics import LoadMetrics
+from .pool import gather_or_cancel
+from .queries import RelationshipKey, relationship_batch_nodes
+
+logger = logging.getLogger(__name__)
+
+NodeBatch = Tuple[str, RecordView]
+RelationshipBatch = Tuple[RelationshipKey, RecordView]
+
+
+def relationship_dependencies(
+    node_batches: List[NodeBatch],
+    relationship_batches: List[RelationshipBatch],
+    name_labels: Dict[str, str],
+) -> List[Set[int]]:
+    """
+    Find the node batches every relationship batch has to wait for.
+
+    An endpoint depends on the first batch writing a node with its name and
+    resolved label. Endpoints that no batch writes, such as nodes already in
+    the database or skipped as unchanged, add no dependency. Batches holding
+    records the graph keeps as they are, and relationship batches with such
+    records, conservatively wait for all of them.
+
+    Args:
+        node_batches: ``(label, rows)`` node batches over one compact graph
+        relationship_batches: ``(key, rows)`` relationship batches over the
+            same graph
+        name_labels: Dictionary mapping node names to sanitized labels
+
+    Returns:
+        Set of node batch positions per relationship batch
+    """
+    if not node_batches:
+        return [set() for _ in relationship_batches]
+
+    graph = node_batches[0][1].graph
+    first_batch = array("i", [-1]) * len(graph.names)
+    irregular_batches: Set[int] = set()
+
+    for position, (label, rows) in enumerate(node_batches):
+        for index in rows.indices:
+            if index in graph.irregular_nodes:
+                irregular_batches.add(position)
+                continue
+            name_id = graph.node_name[index]
+            if first_batch[name_id] < 0 and name_labels.get(graph.names[name_id]) == label:
+                first_batch[name_id] = position
+
+    dependencies = []
+    for _, rows in relationship_batches:
+        needed = set(irregular_batches)
+        for index in rows.indices:
+            if index in graph.irregular_relationships:
+                needed.update(range(len(node_batches)))
+                break
+            for name_id in (graph.rel_start[index], graph.rel_end[index]):
+                if first_batch[name_id] >= 0:
+                    needed.add(first_batch[name_id])
+        dependencies.append(needed)
+    return dependencies
+
+
+class PipelineScheduler:
+    """Writes node and relationship batches concurrently, respecting endpoints."""
+
+    def __init__(
+        self, driver: Driver, workers: int, metrics: Optional[LoadMetrics] = None
+    ) -> None:
+        """
+        Initialize the PipelineScheduler.
+
+        Args:
+            driver: Connected Neo4j driver; :meth:`run_async` leaves sessions
+                to its write functions and does not use it
+            workers: Number of writer threads, each with its own session, or
+                of asyncio tasks
+            metrics: Metrics receiving the wall time of both phases
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.driver = driver
+        self.workers = workers
+        self.metrics = metrics
+
+    def run(
+        self,
+        node_batches: List[NodeBatch],
+        relationship_batches: List[RelationshipBatch],
+        dependencies: List[Set[int]],
+        write_node_batch: Callable[[Session, str, RecordView], int],
+        write_relationship_batch: Callable[
+            [Session, RelationshipKey, RecordView], Tuple[int, int]
+        ],
+    ) -> Tuple[int, int, int]:
+        """
+        Write every batch and collect the counts.
+
+        Node batches of one label are written one at a time, in order, and
+        take precedence because they unblock relationships; idle writers
+        take relationship batches whose dependencies have committed. As with
+        :func:`partition_disjoint`, relationship batches in flight together
+        never share an endpoint node. A connection error stops all writers
+        and is raised once the running batches have finished.
+
+        Args:
+            node_batches: ``(label, rows)`` node batches
+            relationship_batches: ``(key, rows)`` relationship batches
+            dependencies: Node batch positions each relationship batch waits for
+            write_node_batch: Function writing a node batch, returning the
+                number of nodes created
+            write_relationship_batch: Function writing a relationship batch,
+                returning the created and merged counts
+
+        Returns:
+            Tuple of nodes created, relationships created and relationships
+            merged (created or matched)
+        """
+        state = _PipelineState(node_batches, relationship_batches, dependencies)
+        start = time.perf_counter()
+
+        def worker() -> None:
+            with self.driver.session() as session:
+                while True:
+                    task = state.next_task()
+                    if task is None:
+                        return
+                    kind, position = task
+                    try:
+                        if kind == "node":
+                            result = write_node_batch(session, *node_batches[position])
+                        else:
+                            result = write_relationship_batch(
+                                session, *relationship_batches[position]
+                            )
+                    except BaseException as e:
+                        state.fail(e)
+                        return
+                    state.complete(kind, position, result)
+
+        workers = max(1, min(self.workers, len(node_batches) + len(relationship_batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                future.result()
+
+        if state.error is not None:
+            raise state.error
+        return self._finish(state, start)
+
+    async def run_async(
+        self,
+        node_batches: List[NodeBatch],
+        relationship_batches: List[RelationshipBatch],
+        dependencies: List[Set[int]],
+        write_node_batch: Callable[[str, RecordView], Awaitable[int]],
+        write_relationship_batch: Callable[
+            [RelationshipKey, RecordView], Awaitable[Tuple[int, int]]
+        ],
+    ) -> Tuple[int, int, int]:
+        """
+        Write every batch from asyncio tasks and collect the counts.
+
+        Batches are scheduled as by :meth:`run`, on ``workers`` tasks of the
+        running event loop instead of threads. The write functions are
+        coroutine functions that open their own sessions.
+
+        Args:
+            node_batches: ``(label, rows)`` node batches
+            relationship_batches: ``(key, rows)`` relationship batches
+            dependencies: Node batch positions each relationship batch waits for
+            write_node_batch: Coroutine function writing a node batch,
+                returning the number of nodes created
+            write_relationship_batch: Coroutine function writing a
+                relationship batch, returning the created and merged counts
+
+        Returns:
+            Tuple of nodes created, relationships created and relationships
+            merged (created or matched)
+        """
+        state = _PipelineState(node_batches, relationship_batches, dependencies)
+        changed = asyncio.Condition()
+        start = time.perf_counter()
+
+        async def worker() -> None:
+            while True:
+                async with changed:
+                    task = state.take()
+                    while task is None:
+                        if state.finished:
+                            return
+                        await changed.wait()
+                        task = state.take()
+                kind, position = task
+                try:
+                    if kind == "node":
+                        result = await write_node_batch(*node_batches[position])
+                    else:
+                        result = await write_relationship_batch(*relationship_batches[position])
+                except Exception as e:
+                    state.fail(e)
+                else:
+                    state.complete(kind, position, result)
+                async with changed:
+                    changed.notify_all()
+
+        workers = max(1, min(self.workers, len(node_batches) + len(relationship_batches)))
+        await gather_or_cancel(worker() for _ in range(workers))
+
+        if state.error is not None:
+            raise state.error
+        return self._finish(state, start)
+
+    def _finish(self, state: "_PipelineState", start: float) -> Tuple[int, int, int]:
+        """
+        Record the phase times of a finished run and get its counts.
+
+        Args:
+            state: State of the run
+            start: Time the run started
+
+        Returns:
+            Tuple of nodes created, relationships created and relationships
+            merged (created or matched)
+        """
+        end = time.perf_counter()
+        if self.metrics:
+            nodes_done = state.nodes_done_at or start
+            self.metrics.record_phase("nodes", nodes_done - start)
+            self.metrics.record_phase(
+                "relationships", end - (state.relationships_started_at or end)
+            )
+        overlap = (state.nodes_done_at or start) - (state.relationships_started_at or end)
+        logger.info(
+            f"Pipelined {len(state.node_labels)} node and {len(state.relationship_batches)} "
+            f"relationship batches in {end - start:.3f}s "
+            f"({max(overlap, 0):.3f}s of overlap)"
+        )
+        return state.nodes_created, state.rels_created, state.rels_merged
+
+
+class _PipelineState:
+    """Shared scheduling state of one PipelineScheduler run."""
+
+    def __init__(
+        self,
+        node_batches: List[NodeBatch],
+        relationship_batches: List[RelationshipBatch],
+        dependencies: List[Set[int]],
+    ) -> None:
+        self.relationship_batches = relationship_batches
+        self.condition = threading.Condition()
+        self.error: Optional[BaseException] = None
+
+        # Node batches of each label, in order; a label has one in flight at most
+        self.node_labels = [label for label, _ in node_batches]
+        self.label_queues: Dict[str, Deque[int]] = {}
+        for position, label in enumerate(self.node_labels):
+            self.label_queues.setdefault(label, deque()).append(position)
+        self.busy_labels: Set[str] = set()
+        self.nodes_pending = len(node_batches)
+
+        # Uncommitted node batches each relationship batch still waits for,
+        # and the relationship batches waiting on each node batch
+        self.waiting: Dict[int, List[int]] = {}
+        self.remaining = [len(needed) for needed in dependencies]
+        for rel_position, needed in enumerate(dependencies):
+            for node_position in needed:
+                self.waiting.setdefault(node_position, []).append(rel_position)
+        self.ready = [position for position, count in enumerate(self.remaining) if not count]
+        self.rels_pending = len(relationship_batches)
+
+        # Endpoint keys of ready and running relationship batches
+        self.keys: Dict[int, Set[Hashable]] = {}
+        self.in_flight_keys: Set[Hashable] = set()
+
+        self.nodes_created = 0
+        self.rels_created = 0
+        self.rels_merged = 0
+        self.nodes_done_at: Optional[float] = None
+        self.relationships_started_at: Optional[float] = None
+        if not node_batches:
+            self.nodes_done_at = time.perf_counter()
+
+    @property
+    def finished(self) -> bool:
+        """Whether every batch was written or the run failed."""
+        return self.error is not None or not (self.nodes_pending or self.rels_pending)
+
+    def take(self) -> Optional[Tuple[str, int]]:
+        """
+        Pick the next runnable task, or None if nothing can start yet.
+
+        Callers hold ``condition``, or run on a single event loop.
+        """
+        if self.error is not None:
+            return None
+        for label, positions in self.label_queues.items():
+            if positions and label not in self.busy_labels:
+                self.busy_labels.add(label)
+                return "node", positions.popleft()
+
+        for offset, position in enumerate(self.ready):
+            keys = self.keys.get(position)
+            if keys is None:
+                keys = self.keys[position] = relationship_batch_nodes(
+                    self.relationship_batches[position]
+                )
+            if self.in_flight_keys.isdisjoint(keys):
+                del self.ready[offset]
+                self.in_flight_keys.update(keys)
+                if self.relationships_started_at is None:
+                    self.relationships_started_at = time.perf_counter()
+                return "relationship", position
+        return None
+
+    def next_task(self) -> Optional[Tuple[str, int]]:
+        """Wait for a runnable task; returns None when the run is over."""
+        with self.condition:
+            while True:
+                if self.finished:
+                    return None
+                task = self.take()
+                if task is not None:
+                    return task
+                self.condition.wait()
+
+    def complete(self, kind: str, position: int, result: Any) -> None:
+        """Record a written batch and release what was waiting for it."""
+        with self.condition:
+            if kind == "node":
+                self.busy_labels.discard(self.node_labels[position])
+                self.nodes_created += result
+                self.nodes_pending -= 1
+                for rel_position in self.waiting.pop(position, []):
+                    self.remaining[rel_position] -= 1
+                    if not self.remaining[rel_position]:
+                        self.ready.append(rel_position)
+                if not self.nodes_pending:
+                    self.nodes_done_at = time.perf_counter()
+            else:
+                created, merged = result
+                self.rels_created += created
+                self.rels_merged += merged
+                self.rels_pending -= 1
+                self.in_flight_keys.difference_update(self.keys.pop(position))
+            self.condition.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        """Stop the run after an error."""
+        with self.condition:
+            if self.error is None:
+                self.error = error
+            self.condition.notify_all()
@@ -0,0 +1,217 @@
+"""
+Parallel writer pool for Neo4j data loading.
+
+This module contains the WriterPool class that spreads write batches across a
+thread pool with one session per worker, and the helpers that partition
+relationship batches so concurrent transactions never lock the same node and
+run concurrent asyncio writes.
+"""
+
+import asyncio
+import logging
+import queue
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Hashable, Iterable, List, Sequence, Set, Tuple
+
+from neo4j import Driver, Session
+from neo4j.exceptions import TransientError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 5
+BASE_BACKOFF = 0.1
+MAX_BACKOFF = 5.0
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Get the delay before a retry, doubling with every attempt.
+
+    The delay is jittered so that workers which failed together do not retry
+    in lockstep and collide again.
+
+    Args:
+        attempt: Zero-based number of the failed attempt
+
+    Returns:
+        Delay in seconds
+    """
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def write_with_retry(
+    session: Session,
+    transaction_function: Callable[..., Any],
+    *args: Any,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> Tuple[Any, int]:
+    """
+    Run a managed write transaction, retrying transient errors.
+
+    ``execute_write`` already retries transient errors for a limited time;
+    this adds a few more attempts with exponential backoff for deadlocks that
+    persist past that window, which happens when many workers write to
+    densely connected nodes.
+
+    Args:
+        session: Neo4j session
+        transaction_function: Transaction function to run
+        *args: Arguments passed to the transaction function
+        max_retries: Number of additional attempts after a transient error
+
+    Returns:
+        Tuple of the return value of the transaction function and the number
+        of retries, counting those made by the driver itself
+
+    Raises:
+        TransientError: If the transaction still fails after all retries
+    """
+    calls = 0
+
+    def counted(tx: Any, *tx_args: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        return transaction_function(tx, *tx_args)
+
+    for attempt in range(max_retries + 1):
+        try:
+            return session.execute_write(counted, *args), calls - 1
+        except TransientError as e:
+            if attempt == max_retries:
+                raise
+            logger.warning(f"Transient error, retrying ({attempt + 1}/{max_retries}): {e}")
+            time.sleep(backoff_delay(attempt))
+
+
+def partition_disjoint(
+    batches: Sequence[Any], keys_of: Callable[[Any], Set[Hashable]]
+) -> List[List[Any]]:
+    """
+    Partition batches into rounds whose batches touch disjoint keys.
+
+    Each batch is placed in the first round that shares no key with it, so
+    batches in the same round can be written concurrently without competing
+    for the same node locks. Rounds must be run one after another.
+
+    Args:
+        batches: Batches to partition
+        keys_of: Function returning the set of node keys a batch touches
+
+    Returns:
+        List of rounds, each a list of batches
+    """
+    rounds: List[List[Any]] = []
+    round_keys: List[Set[Hashable]] = []
+
+    for batch in batches:
+        keys = keys_of(batch)
+        for index, used in enumerate(round_keys):
+            if used.isdisjoint(keys):
+                rounds[index].append(batch)
+                used.update(keys)
+                break
+        else:
+            rounds.append([batch])
+            round_keys.append(set(keys))
+
+    return rounds
+
+
+class WriterPool:
+    """Runs write tasks across worker threads, one session per worker."""
+
+    def __init__(self, driver: Driver, workers: int = 1) -> None:
+        """
+        Initialize the WriterPool.
+
+        Sessions are taken from the driver's own connection pool, so no
+        additional connections are opened beyond what the driver manages.
+
+        Args:
+            driver: Connected Neo4j driver
+            workers: Number of worker threads
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.driver = driver
+        self.workers = workers
+
+    def run(
+        self,
+        tasks: Iterable[Tuple[Any, ...]],
+        task_function: Callable[..., Any],
+    ) -> List[Any]:
+        """
+        Run every task and collect the results.
+
+        Each worker opens one session and calls ``task_function(session,
+        *task)`` for tasks taken from a shared queue until it is empty.
+
+        Args:
+            tasks: Argument tuples, one per task
+            task_function: Function called with a session and a task's arguments
+
+        Returns:
+            List of task results, in completion order
+        """
+        tasks = list(tasks)
+        workers = min(self.workers, len(tasks))
+
+        if workers <= 1:
+            with self.driver.session() as session:
+                return [task_function(session, *task) for task in tasks]
+
+        pending: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+        for task in tasks:
+            pending.put(task)
+
+        def worker() -> List[Any]:
+            results = []
+            with self.driver.session() as session:
+                while True:
+                    try:
+                        task = pending.get_nowait()
+                    except queue.Empty:
+                        return results
+                    results.append(task_function(session, *task))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            return [result for future in futures for result in future.result()]
+
+
+async def gather_or_cancel(awaitables: Iterable[Awaitable[Any]]) -> List[Any]:
+    """
+    Await several coroutines concurrently, cancelling the rest if one fails.
+
+    Unlike a bare ``asyncio.gather``, a failure or a cancellation of the
+    caller does not leave the other tasks running unobserved: they are
+    cancelled and awaited before the error is raised.
+
+    Args:
+        awaitables: Coroutines or futures to run
+
+    Returns:
+        List of their results, in order
+
+    Raises:
+        Exception: The first error of a failed task
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        if tasks:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+    return [task.result() for task in tasks]
@@ -0,0 +1,334 @@
+"""
+Query building module for Neo4j data loading.
+
+This module contains the Cypher statements and the payload grouping logic
+shared by the synchronous and asynchronous loaders, so both send identical
+batches and queries to the database.
+
+Write statements have a fixed shape per label or relationship type: rows and
+properties are only ever passed as parameters. Each statement is built once
+and cached, so the server sees the same text for every batch and reuses its
+cached plan instead of replanning.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
+
+from .graph import RecordView
+from ..utils.cypher_utils import sanitize_label
+
+logger = logging.getLogger(__name__)
+
+RELATIONSHIP_FIELDS = ["start", "end", "relationship_type"]
+
+DB_LABELS_QUERY = "CALL db.labels() YIELD label RETURN label"
+
+# Labels the write statements can use without quoting
+_PLAIN_LABEL = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+RelationshipKey = Tuple[str, str, str]
+
+
+def lookup_labels_query(labels: Iterable[str]) -> Optional[str]:
+    """
+    Build the statement that finds the labels of existing nodes by name.
+
+    Each label is matched on its own, so every lookup uses the ``name``
+    index of that label instead of scanning all nodes. Labels that are not
+    plain identifiers are skipped, as the write statements could not match
+    them either.
+
+    Args:
+        labels: Labels present in the database, e.g. from ``db.labels()``
+
+    Returns:
+        Cypher statement taking a ``$names`` list and returning ``name`` and
+        ``label`` for every match, or None when no label can be looked up
+    """
+    plain = tuple(sorted({label for label in labels if _PLAIN_LABEL.match(label)}))
+    return _lookup_labels_query(plain) if plain else None
+
+
+@lru_cache(maxsize=None)
+def _lookup_labels_query(labels: Tuple[str, ...]) -> str:
+    """Build and cache the lookup statement of a sorted label tuple."""
+    return " UNION ALL ".join(
+        "UNWIND $names AS name "
+        f"MATCH (n:{label} {{name: name}}) "
+        f"RETURN name, '{label}' AS label"
+        for label in labels
+    )
+
+
+def first_labels(records: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map each name returned by a label lookup to the first label found.
+
+    Args:
+        records: Records with ``name`` and ``label`` fields
+
+    Returns:
+        Dictionary mapping the names that were found to a label
+    """
+    found: Dict[str, str] = {}
+    for record in records:
+        found.setdefault(record["name"], record["label"])
+    return found
+
+
+@lru_cache(maxsize=None)
+def node_batch_query(label: str) -> str:
+    """
+    Build the statement that merges a batch of nodes sharing one label.
+
+    Statements are cached per label.
+
+    Args:
+        label: Sanitized label (type) of the nodes
+
+    Returns:
+        Cypher statement taking a ``$rows`` list of ``{name, props}`` maps
+    """
+    return (
+        "UNWIND $rows AS row "
+        f"MERGE (n:{label} {{name: row.name}}) "
+        "SET n += row.props "
+        "RETURN count(n) as count"
+    )
+
+
+@lru_cache(maxsize=None)
+def relationship_batch_query(rel_type: str, start_label: str, end_label: str) -> str:
+    """
+    Build the statement that merges a batch of relationships of one type.
+
+    Endpoints are matched with label-qualified patterns so the ``name``
+    index of each label is used. Statements are cached per type and
+    endpoint labels.
+
+    Args:
+        rel_type: Sanitized type of the relationships
+        start_label: Sanitized label of the start nodes
+        end_label: Sanitized label of the end nodes
+
+    Returns:
+        Cypher statement taking a ``$rows`` list of ``{start, end, props}`` maps
+    """
+    return (
+        "UNWIND $rows AS row "
+        f"MATCH (a:{start_label} {{name: row.start}}) "
+        f"MATCH (b:{end_label} {{name: row.end}}) "
+        f"MERGE (a)-[r:{rel_type}]->(b) "
+        "SET r += row.props "
+        "RETURN count(r) as count"
+    )
+
+
+def node_labels(
+    nodes: Iterable[Dict[str, Any]], name_labels: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Map node names to their sanitized labels.
+
+    A view of a compact graph is mapped from its columns.
+
+    Args:
+        nodes: Node dictionaries from the payload
+        name_labels: Existing map to extend, if any
+
+    Returns:
+        Dictionary mapping node names to sanitized labels
+    """
+    if isinstance(nodes, RecordView):
+        return nodes.graph.name_labels(nodes.indices, name_labels)
+    if name_labels is None:
+        name_labels = {}
+    for node in nodes:
+        if "name" in node and "node_type" in node:
+            name_labels.setdefault(node["name"], sanitize_label(node["node_type"]))
+    return name_labels
+
+
+def missing_endpoints(
+    relationships: Iterable[Dict[str, Any]], name_labels: Dict[str, str]
+) -> List[str]:
+    """
+    Collect the endpoint names that are not in a name-to-label map.
+
+    Args:
+        relationships: Relationship dictionaries from the payload
+        name_labels: Dictionary mapping node names to sanitized labels
+
+    Returns:
+        Sorted list of unknown endpoint names
+    """
+    return sorted({
+        rel[key]
+        for rel in relationships
+        for key in ("start", "end")
+        if key in rel and rel[key] not in name_labels
+    })
+
+
+def report_unresolved(
+    relationships: Iterable[Dict[str, Any]], name_labels: Dict[str, str]
+) -> int:
+    """
+    Log every relationship whose endpoints cannot be resolved to a label.
+
+    Args:
+        relationships: Relationship dictionaries from the payload
+        name_labels: Dictionary mapping node names to sanitized labels
+
+    Returns:
+        Number of unresolved relationships
+    """
+    unresolved = [
+        rel for rel in relationships
+        if rel.get("start") not in name_labels or rel.get("end") not in name_labels
+    ]
+    if unresolved:
+        logger.warning(
+            f"{len(unresolved)} relationships reference unknown nodes and will be skipped"
+        )
+        for rel in unresolved:
+            logger.warning(
+                f"Unresolved relationship: ({rel.get('start')})"
+                f"-[:{rel.get('relationship_type')}]->({rel.get('end')})"
+            )
+    return len(unresolved)
+
+
+def group_node_rows(nodes: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group nodes into ``{name, props}`` rows by sanitized label.
+
+    A view of a compact graph is grouped by index; its rows are only built
+    when they are read, one batch at a time.
+
+    Args:
+        nodes: Node dictionaries from the payload
+
+    Returns:
+        Dictionary mapping each label to its rows
+    """
+    if isinstance(nodes, RecordView):
+        return nodes.graph.group_node_rows(nodes.indices)
+
+    rows_by_label: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    for node in nodes:
+        # Extract node type and name (required fields)
+        if "name" not in node or "node_type" not in node:
+            logger.warning("Skipping node missing required fields: name or node_type")
+            continue
+
+        properties = {k: v for k, v in node.items() if k != "node_type"}
+        rows_by_label[sanitize_label(node["node_type"])].append(
+            {"name": node["name"], "props": properties}
+        )
+
+    return rows_by_label
+
+
+def group_relationship_rows(
+    relationships: Iterable[Dict[str, Any]], name_labels: Dict[str, str]
+) -> Dict[RelationshipKey, List[Dict[str, Any]]]:
+    """
+    Group relationships into ``{start, end, props}`` rows by type and endpoint labels.
+
+    Relationships whose endpoints are not in ``name_labels`` are skipped;
+    they are reported by :func:`report_unresolved` before writing starts.
+    A view of a compact graph is grouped by index like in
+    :func:`group_node_rows`.
+
+    Args:
+        relationships: Relationship dictionaries from the payload
+        name_labels: Dictionary mapping node names to sanitized labels
+
+    Returns:
+        Dictionary mapping ``(rel_type, start_label, end_label)`` to rows
+    """
+    if isinstance(relationships, RecordView):
+        return relationships.graph.group_relationship_rows(relationships.indices, name_labels)
+
+    rows_by_key: Dict[RelationshipKey, List[Dict[str, Any]]] = defaultdict(list)
+
+    for rel in relationships:
+        # Check for required fields
+        if not all(k in rel for k in RELATIONSHIP_FIELDS):
+            logger.warning("Skipping relationship missing required fields")
+            continue
+
+        if rel["start"] not in name_labels or rel["end"] not in name_labels:
+            continue
+
+        # Extract additional properties if any
+        properties = {k: v for k, v in rel.items() if k not in RELATIONSHIP_FIELDS}
+        key = (
+            sanitize_label(rel["relationship_type"]),
+            name_labels[rel["start"]],
+            name_labels[rel["end"]],
+        )
+        rows_by_key[key].append(
+            {"start": rel["start"], "end": rel["end"], "props": properties}
+        )
+
+    return rows_by_key
+
+
+def chunk(rows: List[Any], size: int) -> List[List[Any]]:
+    """
+    Split rows into consecutive batches.
+
+    Args:
+        rows: Rows to split
+        size: Maximum number of rows per batch
+
+    Returns:
+        List of batches
+    """
+    return [rows[offset:offset + size] for offset in range(0, len(rows), size)]
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Group a stream of records into consecutive batches.
+
+    Args:
+        items: Records to group
+        size: Maximum number of records per batch
+
+    Yields:
+        Lists of at most ``size`` records
+    """
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def relationship_batch_nodes(
+    batch: Tuple[RelationshipKey, List[Dict[str, Any]]]
+) -> Set[Tuple[str, str]]:
+    """
+    Collect the endpoint nodes a relationship batch touches.
+
+    Args:
+        batch: Tuple of ``(rel_type, start_label, end_label)`` and rows
+
+    Returns:
+        Set of ``(label, name)`` node keys
+    """
+    (_, start_label, end_label), rows = batch
+    nodes = {(start_label, row["start"]) for row in rows}
+    nodes.update((end_label, row["end"]) for row in rows)
+    return nodes
+
@@ -0,0 +1,325 @@
+"""
+Entity resolution module for Neo4j data loading.
+
+This module contains the EntityResolver class that folds near-duplicate node
+names (case variants, trailing punctuation, parenthetical qualifiers such as
+"Y Combinator (YC)") into one canonical node before anything is written.
+Qualifiers are only dropped where they tell no two names apart, and symbols
+that are part of a name, as in "C++" and "C#", are kept.
+Names are grouped through a hash index of normalized blocking keys, so the
+whole payload is resolved in a single linear pass instead of by comparing
+every pair of names.
+"""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+from .graph import CompactGraph
+from .queries import RELATIONSHIP_FIELDS
+
+logger = logging.getLogger(__name__)
+
+Normalizer = Callable[[str], str]
+
+_PARENTHETICAL = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]")
+# Sentence punctuation trailing a name; symbols such as "+" and "#" are kept
+_TRAILING_PUNCTUATION = ".,;:!?"
+# A corporate suffix with its comma and periods, e.g. ", Inc." or " L.L.C."
+_CORPORATE_SUFFIX = re.compile(
+    r",?\s+([a-z](?:\.[a-z])+|inc|corp|co|ltd|llc|plc|gmbh|ag|sa|nv|bv)\.?\s*\Z",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def strip_parenthetical(name: str) -> str:
+    """Remove parenthetical qualifiers, e.g. ``Y Combinator (YC)`` -> ``Y Combinator``."""
+    stripped = _PARENTHETICAL.sub("", name)
+    # A name that is only a qualifier keeps it
+    return stripped if stripped.strip() else name
+
+
+def casefold(name: str) -> str:
+    """Fold case, e.g. ``OpenAI`` and ``openai``."""
+    return name.casefold()
+
+
+def strip_punctuation(name: str) -> str:
+    """
+    Remove trailing punctuation and the periods of a corporate suffix.
+
+    ``Tesla, Inc.`` becomes ``Tesla Inc`` and ``y combinator.`` becomes
+    ``y combinator``, while ``C++`` and ``C#`` keep the symbols that tell
+    them apart from ``C``.
+    """
+    name = _CORPORATE_SUFFIX.sub(
+        lambda match: " " + match.group(1).replace(".", ""), name.rstrip()
+    )
+    return name.rstrip(_TRAILING_PUNCTUATION)
+
+
+def collapse_whitespace(name: str) -> str:
+    """Collapse runs of whitespace and trim both ends."""
+    return _WHITESPACE.sub(" ", name).strip()
+
+
+NORMALIZERS: Dict[str, Normalizer] = {
+    "strip_parenthetical": strip_parenthetical,
+    "casefold": casefold,
+    "strip_punctuation": strip_punctuation,
+    "collapse_whitespace": collapse_whitespace,
+}
+
+DEFAULT_NORMALIZERS: Tuple[Normalizer, ...] = (
+    strip_parenthetical,
+    casefold,
+    strip_punctuation,
+    collapse_whitespace,
+)
+
+
+class EntityResolver:
+    """Folds nodes whose names normalize to the same key into one node."""
+
+    def __init__(
+        self,
+        normalizers: Sequence[Normalizer] = DEFAULT_NORMALIZERS,
+        alias_property: str = "aliases",
+    ) -> None:
+        """
+        Initialize the EntityResolver.
+
+        Args:
+            normalizers: Functions applied in order to a name to build its
+                blocking key; names with equal keys are duplicates
+            alias_property: Node property receiving the folded name variants
+        """
+        if not normalizers:
+            raise ValueError("at least one normalizer is required")
+
+        self.normalizers = tuple(normalizers)
+        self.alias_property = alias_property
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], alias_property: str = "aliases") -> "EntityResolver":
+        """
+        Create a resolver from registered normalizer names.
+
+        Args:
+            names: Keys of ``NORMALIZERS``, in application order
+            alias_property: Node property receiving the folded name variants
+
+        Returns:
+            Configured resolver
+
+        Raises:
+            ValueError: If a name is not a registered normalizer
+        """
+        names = list(names)
+        unknown = [name for name in names if name not in NORMALIZERS]
+        if unknown:
+            raise ValueError(
+                f"Unknown normalizers {unknown}; choose from {sorted(NORMALIZERS)}"
+            )
+        return cls([NORMALIZERS[name] for name in names], alias_property)
+
+    def key(self, name: Any, keep_qualifiers: bool = False) -> Optional[str]:
+        """
+        Build the blocking key of a name.
+
+        Args:
+            name: Node name
+            keep_qualifiers: Whether to skip ``strip_parenthetical``
+
+        Returns:
+            Normalized key, or None for names that are not strings or
+            normalize to nothing
+        """
+        if not isinstance(name, str):
+            return None
+        for normalizer in self.normalizers:
+            if not (keep_qualifiers and normalizer is strip_parenthetical):
+                name = normalizer(name)
+        return name or None
+
+    def resolve(
+        self, json_data: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fold duplicate nodes of a parsed payload and rewrite relationship endpoints.
+
+        Args:
+            json_data: Dictionary containing nodes and relationships
+
+        Returns:
+            New dictionary containing the resolved nodes and relationships,
+            as :meth:`resolve_graph` leaves them
+        """
+        return self.resolve_graph(CompactGraph.from_payload(json_data)).to_payload()
+
+    def resolve_graph(self, graph: CompactGraph) -> CompactGraph:
+        """
+        Fold duplicate nodes of a graph and rewrite relationship endpoints.
+
+        Nodes are blocked by sanitized label and name key. A block whose names
+        carry different parenthetical qualifiers, such as ``Global
+        (Distributed)`` and ``Global (Social Media)``, is split by the
+        qualified key, so the qualifier is kept. The canonical name
+        of a block is its shortest variant, which is usually the one without
+        qualifiers, then the one used most often by node records and
+        relationship endpoints. The other variants are
+        added to the alias property of the canonical node. Endpoints naming a
+        folded variant are rewritten to the canonical name. Endpoints naming
+        no node at all are rewritten when their key matches exactly one
+        canonical node. Folded records are combined by
+        :meth:`CompactGraph.merge`, so later records override shared
+        properties. Records that are not objects or have no string name,
+        label or endpoints are left as they are for validation to report.
+
+        Names are replaced as name IDs in a renamable copy of the graph, so
+        no record is rebuilt except those of nodes that receive aliases; the
+        graph itself is not changed and may be a mapped one.
+
+        Args:
+            graph: Graph holding the nodes and relationships
+
+        Returns:
+            New graph holding the resolved nodes and relationships
+        """
+        names = graph.names
+        keys: Dict[int, Optional[str]] = {}
+
+        def key_of(name_id: int) -> Optional[str]:
+            if name_id not in keys:
+                keys[name_id] = self.key(names[name_id])
+            return keys[name_id]
+
+        def regular_nodes() -> Iterator[Tuple[int, str, int]]:
+            """(index, sanitized label, name ID) of every node that can be resolved."""
+            for index in range(graph.node_count):
+                if index in graph.irregular_nodes:
+                    continue
+                name_id = graph.node_name[index]
+                if key_of(name_id) is not None:
+                    yield index, graph.label_key(graph.node_label[index]), name_id
+
+        usage: Counter = Counter()
+        for index in range(graph.relationship_count):
+            if index in graph.irregular_relationships:
+                rel = graph.irregular_relationships[index]
+                if isinstance(rel, dict):
+                    usage.update(
+                        names.ids[rel[field]]
+                        for field in ("start", "end")
+                        if isinstance(rel.get(field), str) and rel[field] in names.ids
+                    )
+                continue
+            usage[graph.rel_start[index]] += 1
+            usage[graph.rel_end[index]] += 1
+
+        # Blocking index: (label, key) -> name IDs of the variants
+        blocks: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        for _, label, name_id in regular_nodes():
+            blocks[(label, key_of(name_id))].add(name_id)
+            usage[name_id] += 1
+
+        # Names whose qualifiers differ are told apart by keeping them
+        if strip_parenthetical in self.normalizers:
+            for (label, key), variants in list(blocks.items()):
+                qualified = {
+                    self.key(names[name_id], keep_qualifiers=True)
+                    for name_id in variants
+                    if _PARENTHETICAL.search(names[name_id])
+                }
+                if len(qualified) > 1:
+                    del blocks[(label, key)]
+                    for name_id in variants:
+                        blocks[(label, self.key(names[name_id], keep_qualifiers=True))].add(name_id)
+
+        block_of: Dict[Tuple[str, int], Tuple[str, str]] = {}
+        canonical: Dict[Tuple[str, str], int] = {}
+        aliases: Dict[Tuple[str, str], List[str]] = {}
+        by_key: Dict[str, Set[int]] = defaultdict(set)
+        for block, variants in blocks.items():
+            name_id = min(
+                variants,
+                key=lambda variant: (len(names[variant]), -usage[variant], names[variant]),
+            )
+            canonical[block] = name_id
+            aliases[block] = sorted(names[variant] for variant in variants - {name_id})
+            by_key[key_of(name_id)].add(name_id)
+            for variant in variants:
+                block_of[(block[0], variant)] = block
+
+        # Plain name ID -> canonical name ID, for names that are unambiguous
+        renamed: Dict[int, Optional[int]] = {}
+        for (label, variant), block in block_of.items():
+            target = canonical[block]
+            if renamed.get(variant, target) != target:
+                # The same name folds differently under two labels
+                target = None
+            renamed[variant] = target
+
+        def endpoint(name_id: int) -> int:
+            if name_id in renamed:
+                target = renamed[name_id]
+            else:
+                targets = by_key.get(key_of(name_id))
+                target = next(iter(targets)) if targets and len(targets) == 1 else None
+            # Remembered, since endpoints repeat
+            renamed[name_id] = target
+            return name_id if target is None else target
+
+        resolved = graph.renamable()
+        for index, label, name_id in regular_nodes():
+            resolved.node_name[index] = canonical[block_of[(label, name_id)]]
+        for index in range(graph.relationship_count):
+            if index not in graph.irregular_relationships:
+                resolved.rel_start[index] = endpoint(graph.rel_start[index])
+                resolved.rel_end[index] = endpoint(graph.rel_end[index])
+
+        def endpoint_name(name: Any) -> Any:
+            if not isinstance(name, str):
+                return name
+            if name in names.ids:
+                return names[endpoint(names.ids[name])]
+            targets = by_key.get(self.key(name))
+            return names[next(iter(targets))] if targets and len(targets) == 1 else name
+
+        for index, rel in graph.irregular_relationships.items():
+            if isinstance(rel, dict) and all(field in rel for field in RELATIONSHIP_FIELDS):
+                resolved.irregular_relationships[index] = dict(
+                    rel, start=endpoint_name(rel["start"]), end=endpoint_name(rel["end"])
+                )
+
+        merged = CompactGraph.merge([resolved])
+
+        # Aliases are added to the combined canonical nodes of the new graph
+        alias_names = {
+            (label, names[canonical[(label, key)]]): variants
+            for (label, key), variants in aliases.items()
+            if variants
+        }
+        for index in range(merged.node_count):
+            if index in merged.irregular_nodes:
+                continue
+            variants = alias_names.get(
+                (merged.label_key(merged.node_label[index]), merged.names[merged.node_name[index]])
+            )
+            if variants:
+                properties = merged.node_properties(index)
+                existing = properties.get(self.alias_property)
+                existing = existing if isinstance(existing, list) else []
+                properties[self.alias_property] = sorted(set(existing) | set(variants))
+                merged.node_shape[index], merged.node_row_index[index] = (
+                    merged.node_columns.store(properties)
+                )
+
+        folded = sum(len(variants) for variants in aliases.values())
+        logger.info(
+            f"Entity resolution folded {folded} name variants into "
+            f"{sum(1 for variants in aliases.values() if variants)} canonical nodes"
+        )
+        return merged
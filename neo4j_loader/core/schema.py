@@ -0,0 +1,144 @@
+"""
+Schema management module for Neo4j data loading.
+
+This module contains the SchemaManager class that creates the constraints and
+indexes the loader relies on, so that every MERGE on ``name`` is index-backed
+instead of a label scan.
+"""
+
+import logging
+from typing import Dict, List, Any, Iterable, Set
+
+from neo4j import Driver, Transaction
+from neo4j.exceptions import ClientError
+
+from ..utils.cypher_utils import sanitize_label
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaManager:
+    """Creates ``name`` uniqueness constraints and indexes for node labels."""
+
+    def __init__(self, driver: Driver) -> None:
+        """
+        Initialize the SchemaManager with an open driver.
+
+        Args:
+            driver: Connected Neo4j driver
+        """
+        self.driver = driver
+
+    @staticmethod
+    def collect_labels(json_data: Dict[str, Iterable[Dict[str, Any]]]) -> Set[str]:
+        """
+        Collect the distinct sanitized node labels in a payload.
+
+        Args:
+            json_data: Dictionary containing nodes and relationships; the
+                nodes may be any iterable, e.g. a streaming reader
+
+        Returns:
+            Set of sanitized labels
+        """
+        return {
+            sanitize_label(node["node_type"])
+            for node in json_data.get("nodes", [])
+            if "node_type" in node
+        }
+
+    def ensure_schema(self, labels: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Idempotently create a ``name`` uniqueness constraint for every label.
+
+        Labels whose existing data already violates uniqueness fall back to a
+        plain range index on ``name``. Every statement runs in its own write
+        transaction, which routing drivers (``neo4j://``) send to the leader.
+
+        Args:
+            labels: Sanitized node labels
+
+        Returns:
+            Dictionary with the labels whose schema was ``created``, already
+            ``existing``, or created as an ``index`` fallback
+        """
+        report: Dict[str, List[str]] = {"created": [], "existing": [], "index": []}
+
+        with self.driver.session() as session:
+            existing = session.execute_read(self._indexed_labels_tx)
+
+            for label in sorted(set(labels)):
+                if label in existing:
+                    report["existing"].append(label)
+                    continue
+                try:
+                    session.execute_write(self._create_constraint_tx, label)
+                    report["created"].append(label)
+                except ClientError as e:
+                    logger.warning(
+                        f"Could not create uniqueness constraint for {label}, "
+                        f"falling back to a range index: {e}"
+                    )
+                    session.execute_write(self._create_index_tx, label)
+                    report["index"].append(label)
+
+        logger.info(
+            f"Schema ready: {len(report['created'])} constraints created, "
+            f"{len(report['index'])} indexes created, "
+            f"{len(report['existing'])} labels already indexed"
+        )
+        if report["existing"]:
+            logger.debug(f"Labels already indexed: {', '.join(report['existing'])}")
+        return report
+
+    @staticmethod
+    def _indexed_labels_tx(tx: Transaction) -> Set[str]:
+        """
+        Find labels that already have a single-property index on ``name``.
+
+        Uniqueness constraints are backed by such an index, so this covers
+        both constraints and plain indexes.
+
+        Args:
+            tx: Neo4j transaction
+
+        Returns:
+            Set of labels with an index on ``name``
+        """
+        result = tx.run(
+            "SHOW INDEXES YIELD entityType, labelsOrTypes, properties "
+            "WHERE entityType = 'NODE' AND properties = ['name'] "
+            "RETURN labelsOrTypes"
+        )
+        labels: Set[str] = set()
+        for record in result:
+            labels.update(record["labelsOrTypes"] or [])
+        return labels
+
+    @staticmethod
+    def _create_constraint_tx(tx: Transaction, label: str) -> None:
+        """
+        Create a ``name`` uniqueness constraint for a label.
+
+        Args:
+            tx: Neo4j transaction
+            label: Sanitized node label
+        """
+        tx.run(
+            f"CREATE CONSTRAINT {label}_name_unique IF NOT EXISTS "
+            f"FOR (n:{label}) REQUIRE n.name IS UNIQUE"
+        ).consume()
+
+    @staticmethod
+    def _create_index_tx(tx: Transaction, label: str) -> None:
+        """
+        Create a range index on ``name`` for a label.
+
+        Args:
+            tx: Neo4j transaction
+            label: Sanitized node label
+        """
+        tx.run(
+            f"CREATE INDEX {label}_name_index IF NOT EXISTS "
+            f"FOR (n:{label}) ON (n.name)"
+        ).consume()
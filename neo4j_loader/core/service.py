@@ -0,0 +1,445 @@
+"""
+Loader service module for Neo4j data loading.
+
+This module contains the LoaderService class, which keeps one connected
+Neo4jLoader warm and works through a queue of load jobs, and the HTTP front
+end that accepts jobs over TCP or a local Unix socket. Small jobs that arrive
+close together are merged and written as one load, so they share batches and
+transactions instead of each paying for its own.
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import signal
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .loader import Neo4jLoader
+from .merge import merge_payloads
+from .metrics import LoadMetrics
+from .schema import SchemaManager
+from .validation import validate_payload
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCE_WINDOW = 0.05
+DEFAULT_MAX_GROUP_ROWS = 50000
+DEFAULT_JOB_HISTORY = 1000
+
+# Validation errors a job may still be loaded with: its relationships may
+# reference nodes an earlier job already wrote
+_LOADABLE_ERRORS = {"dangling_reference"}
+
+
+class Job:
+    """A load job and its status."""
+
+    def __init__(self, job_id: str, payload: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Initialize a queued job.
+
+        Args:
+            job_id: Job identifier
+            payload: Dictionary containing nodes and relationships
+        """
+        self.id = job_id
+        self.payload: Optional[Dict[str, List[Dict[str, Any]]]] = payload
+        self.nodes = len(payload.get("nodes", []))
+        self.relationships = len(payload.get("relationships", []))
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.group: Optional[Dict[str, Any]] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+
+    @property
+    def rows(self) -> int:
+        """Number of records in the job."""
+        return self.nodes + self.relationships
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the job status in a JSON-serializable form.
+
+        Returns:
+            Dictionary with the status and timings of the job; ``group``
+            holds the counters and metrics of the whole load the job was
+            written in, shared by every job listed in ``group["jobs"]``
+        """
+        status = {
+            "id": self.id,
+            "status": self.status,
+            "nodes": self.nodes,
+            "relationships": self.relationships,
+            "queue_seconds": None,
+            "load_seconds": None,
+            "error": self.error,
+            "group": self.group,
+        }
+        if self.started_at is not None:
+            status["queue_seconds"] = round(self.started_at - self.submitted_at, 6)
+        if self.started_at is not None and self.finished_at is not None:
+            status["load_seconds"] = round(self.finished_at - self.started_at, 6)
+        return status
+
+
+class LoaderService:
+    """Runs load jobs on one warm loader, coalescing jobs that arrive together."""
+
+    def __init__(
+        self,
+        loader: Neo4jLoader,
+        ensure_schema: bool = True,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        max_group_rows: int = DEFAULT_MAX_GROUP_ROWS,
+        job_history: int = DEFAULT_JOB_HISTORY,
+    ) -> None:
+        """
+        Initialize the LoaderService.
+
+        Args:
+            loader: Connected loader; its driver and connection pool are
+                reused by every job
+            ensure_schema: Whether to create name constraints for labels the
+                service has not seen before loading them
+            coalesce_window: Seconds to wait for more jobs after the first
+                job of a group arrives
+            max_group_rows: Records after which a group is closed early
+            job_history: Number of finished jobs whose status is kept
+        """
+        if coalesce_window < 0:
+            raise ValueError("coalesce_window must not be negative")
+        if max_group_rows < 1:
+            raise ValueError("max_group_rows must be at least 1")
+
+        self.loader = loader
+        self.schema = SchemaManager(loader.driver) if ensure_schema else None
+        self.coalesce_window = coalesce_window
+        self.max_group_rows = max_group_rows
+        self.job_history = job_history
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._schema_labels: Set[str] = set()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread that runs the queued jobs."""
+        self._worker = threading.Thread(target=self._run, name="loader-service", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Finish the queued jobs and stop the worker thread."""
+        self._queue.put(None)
+        if self._worker:
+            self._worker.join()
+
+    def submit(self, payload: Dict[str, List[Dict[str, Any]]]) -> Job:
+        """
+        Queue a load job.
+
+        Args:
+            payload: Dictionary containing nodes and relationships
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the payload is not a nodes/relationships object or
+                has records that cannot be loaded
+        """
+        if not isinstance(payload, dict) or not all(
+            isinstance(payload.get(key, []), list) for key in ("nodes", "relationships")
+        ):
+            raise ValueError("payload must be an object with nodes and relationships lists")
+
+        # Rejected here, a bad record cannot fail the jobs coalesced with it
+        report = validate_payload(payload.get("nodes", []), payload.get("relationships", []))
+        errors = [error for error in report["errors"] if error["kind"] not in _LOADABLE_ERRORS]
+        if errors:
+            problems = "; ".join(
+                f"{error['phase']}[{error['index']}]: {error['message']}" for error in errors[:5]
+            )
+            more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+            raise ValueError(f"invalid payload: {problems}{more}")
+
+        job = Job(str(next(self._ids)), payload)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        logger.debug(f"Queued job {job.id} with {job.rows} records")
+        return job
+
+    def job(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job by identifier.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if it is unknown or no longer kept
+        """
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """
+        List the kept jobs, oldest first.
+
+        Returns:
+            List of jobs
+        """
+        with self._jobs_lock:
+            return list(self._jobs.values())
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting to run."""
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        """Run job groups until the service is stopped."""
+        while True:
+            group, stopping = self._next_group()
+            if group:
+                self._run_group(group)
+            if stopping:
+                return
+
+    def _next_group(self) -> Tuple[List[Job], bool]:
+        """
+        Collect the jobs of the next load.
+
+        Waits for a job, then keeps taking jobs that arrive within the
+        coalesce window until the group holds ``max_group_rows`` records.
+
+        Returns:
+            Tuple of the jobs in the group and whether the service is stopping
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        group = [first]
+        rows = first.rows
+        deadline = time.monotonic() + self.coalesce_window
+        while rows < self.max_group_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if job is None:
+                return group, True
+            group.append(job)
+            rows += job.rows
+        return group, False
+
+    def _run_group(self, group: List[Job]) -> None:
+        """
+        Load the jobs of a group as one payload and report to each job.
+
+        Jobs are merged in submission order, so a later job overrides the
+        properties it shares with an earlier one, as separate loads would.
+        Every job of the group shares its outcome and counters. If a merged
+        load fails, its jobs are loaded again one at a time, so only the
+        jobs that fail on their own are reported as failed.
+
+        Args:
+            group: Jobs to load together
+        """
+        started_at = time.time()
+        for job in group:
+            job.status = "running"
+            job.started_at = started_at
+
+        metrics = LoadMetrics()
+        self.loader.metrics = metrics
+        dead_letters = self.loader.dead_letters
+        rejected_before = dead_letters.count if dead_letters else 0
+        group_status: Dict[str, Any] = {"jobs": [job.id for job in group]}
+
+        try:
+            if len(group) == 1:
+                payload = group[0].payload
+            else:
+                payload = merge_payloads(job.payload for job in group)
+            group_status["nodes"] = len(payload.get("nodes", []))
+            group_status["relationships"] = len(payload.get("relationships", []))
+
+            if self.schema:
+                labels = SchemaManager.collect_labels(payload) - self._schema_labels
+                if labels:
+                    with metrics.phase("schema"):
+                        self.schema.ensure_schema(labels)
+                    self._schema_labels |= labels
+
+            nodes_created, rels_created = self.loader.load_data(payload)
+            group_status["nodes_created"] = nodes_created
+            group_status["relationships_created"] = rels_created
+            status, error = "done", None
+        except Exception as e:
+            if len(group) > 1:
+                logger.warning(
+                    f"Error loading jobs {', '.join(group_status['jobs'])} together, "
+                    f"loading them one at a time: {e}"
+                )
+                for job in group:
+                    self._run_group([job])
+                return
+            logger.error(f"Error loading job {group[0].id}: {e}")
+            status, error = "failed", str(e)
+
+        if dead_letters:
+            group_status["rejected"] = dead_letters.count - rejected_before
+        group_status["metrics"] = metrics.as_dict()["phases"]
+
+        finished_at = time.time()
+        for job in group:
+            job.status = status
+            job.error = error
+            job.group = group_status
+            job.finished_at = finished_at
+            job.payload = None
+            job.done.set()
+        logger.info(
+            f"{status.capitalize()} {len(group)} job(s) in {finished_at - started_at:.3f}s"
+        )
+        self._forget_old_jobs()
+
+    def _forget_old_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit."""
+        with self._jobs_lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+            for job_id in finished[: max(len(finished) - self.job_history, 0)]:
+                del self._jobs[job_id]
+
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP interface of a LoaderService.
+
+    ``POST /jobs`` queues a payload and answers with the job status;
+    ``?wait=true`` answers once the job has finished. ``GET /jobs/<id>``
+    reports one job, ``GET /jobs`` every kept job and ``GET /health`` the
+    queue length.
+    """
+
+    server_version = "neo4j-loader"
+
+    @property
+    def service(self) -> LoaderService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _reply(self, code: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/health":
+            self._reply(200, {"status": "ok", "queued": self.service.queued})
+        elif path == "/jobs":
+            self._reply(200, [job.as_dict() for job in self.service.jobs()])
+        elif path.startswith("/jobs/"):
+            job = self.service.job(path[len("/jobs/"):])
+            if job is None:
+                self._reply(404, {"error": "unknown job"})
+            else:
+                self._reply(200, job.as_dict())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self._reply(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = self.service.submit(json.loads(self.rfile.read(length) or b"null"))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._reply(400, {"error": str(e)})
+            return
+
+        if parse_qs(url.query).get("wait", ["false"])[0].lower() in ("1", "true", "yes"):
+            job.done.wait()
+            self._reply(200, job.as_dict())
+        else:
+            self._reply(202, job.as_dict())
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket."""
+
+    daemon_threads = True
+
+
+def serve(
+    service: LoaderService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+) -> None:
+    """
+    Serve a LoaderService over HTTP until interrupted.
+
+    Args:
+        service: Service to expose
+        host: Interface to listen on when no socket path is given
+        port: TCP port to listen on when no socket path is given
+        socket_path: Path of a Unix socket to listen on instead of TCP
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _ServiceRequestHandler)
+        address = socket_path
+    else:
+        server = ThreadingHTTPServer((host, port), _ServiceRequestHandler)
+        address = f"http://{host}:{port}"
+    server.service = service
+
+    def interrupt(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    # Stop as cleanly on SIGTERM (e.g. from systemd) as on Ctrl-C
+    signal.signal(signal.SIGTERM, interrupt)
+
+    service.start()
+    logger.info(f"Loader service listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down loader service")
+    finally:
+        server.server_close()
+        service.stop()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
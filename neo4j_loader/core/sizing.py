@@ -0,0 +1,299 @@
+"""
+Adaptive batch sizing module for Neo4j data loading.
+
+This module contains the BatchSizer class that adjusts the number of rows
+written per transaction for every label and relationship type. Sizes follow
+the commit latency measured for each key towards a latency target, batches
+are cut short before their parameters exceed a byte ceiling, and an optional
+throttle caps the write rate so a load leaves capacity for other traffic on
+the same cluster.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Awaitable, Callable, Hashable, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_LATENCY = 0.5
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+# Bounds of the size change after one observed commit
+MIN_STEP = 0.5
+MAX_STEP = 2.0
+
+# Bytes of a PackStream marker and size header, and of a packed number
+_HEADER_BYTES = 5
+_SCALAR_BYTES = 9
+
+_END = object()
+
+
+def _string_bytes(value: str) -> int:
+    """Get the UTF-8 length of a string without encoding ASCII text."""
+    return len(value) if value.isascii() else len(value.encode("utf-8", "surrogatepass"))
+
+
+def parameter_bytes(value: Any) -> int:
+    """
+    Estimate the size of a value sent as a query parameter.
+
+    The estimate follows the Bolt PackStream encoding: strings count their
+    UTF-8 length, numbers a fixed width and containers a small header plus
+    their items. It is meant for comparing batches, not exact accounting.
+
+    Args:
+        value: Parameter value
+
+    Returns:
+        Approximate serialized size in bytes
+    """
+    kind = type(value)
+    if kind is str:
+        return _HEADER_BYTES + _string_bytes(value)
+    if kind is dict:
+        total = _HEADER_BYTES
+        for key, item in value.items():
+            total += (_HEADER_BYTES + _string_bytes(key)) if type(key) is str else _SCALAR_BYTES
+            item_kind = type(item)
+            if item_kind is str:
+                total += _HEADER_BYTES + _string_bytes(item)
+            elif item_kind is int or item_kind is float:
+                total += _SCALAR_BYTES
+            else:
+                total += parameter_bytes(item)
+        return total
+    if kind is list or kind is tuple:
+        return _HEADER_BYTES + sum(parameter_bytes(item) for item in value)
+    if kind is bytes or kind is bytearray:
+        return _HEADER_BYTES + len(value)
+    if value is None or kind is bool:
+        return 1
+    if isinstance(value, str):
+        return _HEADER_BYTES + _string_bytes(value)
+    return _SCALAR_BYTES
+
+
+class BatchSizer:
+    """Adapts batch sizes per key to a latency target and a byte ceiling."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        target_latency: Optional[float] = DEFAULT_TARGET_LATENCY,
+        max_bytes: Optional[int] = DEFAULT_MAX_BATCH_BYTES,
+        max_rows_per_second: Optional[float] = None,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the BatchSizer.
+
+        Args:
+            batch_size: Rows of the first batch of every key
+            target_latency: Commit latency in seconds batch sizes are steered
+                towards; when None, sizes stay at ``batch_size``
+            max_bytes: Ceiling of the estimated parameter bytes of a batch;
+                a single row larger than this is still written on its own
+            max_rows_per_second: Write rate cap shared by all writers, if any
+            min_size: Smallest batch size the latency target may lead to
+            max_size: Largest batch size the latency target may lead to;
+                defaults to ten times ``batch_size``
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if target_latency is not None and target_latency <= 0:
+            raise ValueError("target_latency must be positive")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if max_rows_per_second is not None and max_rows_per_second <= 0:
+            raise ValueError("max_rows_per_second must be positive")
+
+        self.batch_size = batch_size
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.max_rows_per_second = max_rows_per_second
+        self.min_size = max(1, min(min_size, batch_size))
+        self.max_size = max(batch_size, max_size or batch_size * 10)
+        self.sizes: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._next_write = 0.0
+
+    @property
+    def plan_size(self) -> int:
+        """Rows per planned batch, which writes split further as needed."""
+        return self.max_size if self.target_latency else self.batch_size
+
+    def size(self, key: Hashable) -> int:
+        """
+        Get the current batch size of a key.
+
+        Args:
+            key: Phase and label or relationship type, e.g. ``("nodes", "Company")``
+
+        Returns:
+            Number of rows of the next batch
+        """
+        with self._lock:
+            return int(self.sizes.get(key, self.batch_size))
+
+    def observe(self, key: Hashable, rows: int, seconds: float) -> None:
+        """
+        Adjust the size of a key after a batch was committed.
+
+        The size is scaled by the ratio of the latency target to the measured
+        latency, by at most a factor of two either way per batch, so a few
+        slow commits do not collapse it. Batches cut short by the byte
+        ceiling or at the end of the rows only lower the size.
+
+        Args:
+            key: Phase and label or relationship type
+            rows: Rows of the committed batch
+            seconds: Commit latency of the batch
+        """
+        if not self.target_latency or rows < 1:
+            return
+        step = min(max(self.target_latency / max(seconds, 1e-6), MIN_STEP), MAX_STEP)
+        with self._lock:
+            current = self.sizes.get(key, self.batch_size)
+            if step < 1:
+                size = min(current, rows) * step
+            else:
+                size = current * step if rows >= int(current) else current
+            self.sizes[key] = min(max(size, self.min_size), self.max_size)
+
+    def batches(self, key: Hashable, rows: Iterable[Any]) -> Iterator[Tuple[List[Any], int]]:
+        """
+        Split rows into batches of the current size of a key.
+
+        Each batch is cut short before its estimated parameter bytes exceed
+        the ceiling. Sizes are read lazily, so observations made while the
+        previous batch was written apply to the next one.
+
+        Args:
+            key: Phase and label or relationship type
+            rows: Rows to split; a view is built into rows one batch at a time
+
+        Yields:
+            Tuples of a batch and its estimated parameter bytes
+        """
+        rows = iter(rows)
+        # Row that did not fit under the byte ceiling, opening the next batch
+        pending: Optional[Tuple[Any, int]] = None
+        while True:
+            size = self.size(key)
+            batch: List[Any] = []
+            total = 0
+            if pending is not None:
+                batch.append(pending[0])
+                total = pending[1]
+                pending = None
+            while len(batch) < size:
+                row = next(rows, _END)
+                if row is _END:
+                    break
+                row_bytes = parameter_bytes(row) if self.max_bytes else 0
+                if batch and self.max_bytes and total + row_bytes > self.max_bytes:
+                    pending = (row, row_bytes)
+                    break
+                batch.append(row)
+                total += row_bytes
+            if not batch:
+                return
+            yield batch, total
+
+    def throttle(self, rows: int) -> None:
+        """
+        Wait until a batch may be written under the write rate cap.
+
+        Every batch reserves the time its rows take at the capped rate, so
+        concurrent writers share the rate instead of each using all of it.
+
+        Args:
+            rows: Rows of the batch about to be written
+        """
+        delay = self._reserve(rows)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _reserve(self, rows: int) -> float:
+        """Reserve the write time of a batch and get the delay before it may start."""
+        if not self.max_rows_per_second:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_write)
+            self._next_write = start + rows / self.max_rows_per_second
+        return start - now
+
+    def write(
+        self, key: Hashable, rows: Iterable[Any], write_batch: Callable[[List[Any]], Any]
+    ) -> List[Any]:
+        """
+        Write rows in adaptively sized batches.
+
+        Args:
+            key: Phase and label or relationship type
+            rows: Rows to write
+            write_batch: Function writing one batch and returning its result
+
+        Returns:
+            Result of every batch, in order
+        """
+        results = []
+        for batch, total in self.batches(key, rows):
+            self.throttle(len(batch))
+            start = time.perf_counter()
+            results.append(write_batch(batch))
+            self._written(key, batch, total, time.perf_counter() - start)
+        return results
+
+    async def write_async(
+        self,
+        key: Hashable,
+        rows: Iterable[Any],
+        write_batch: Callable[[List[Any]], Awaitable[Any]],
+    ) -> List[Any]:
+        """
+        Write rows in adaptively sized batches from a coroutine.
+
+        Args:
+            key: Phase and label or relationship type
+            rows: Rows to write
+            write_batch: Coroutine function writing one batch and returning
+                its result
+
+        Returns:
+            Result of every batch, in order
+        """
+        results = []
+        for batch, total in self.batches(key, rows):
+            delay = self._reserve(len(batch))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = time.perf_counter()
+            results.append(await write_batch(batch))
+            self._written(key, batch, total, time.perf_counter() - start)
+        return results
+
+    def _written(self, key: Hashable, batch: List[Any], total: int, seconds: float) -> None:
+        """Adapt the size of a key to a batch that was written."""
+        self.observe(key, len(batch), seconds)
+        logger.debug(f"Wrote {len(batch)} rows of {key} ({total} bytes) in {seconds:.3f}s")
+
+    def summary(self) -> None:
+        """Log the range of batch sizes the keys of each phase settled on."""
+        with self._lock:
+            sizes = dict(self.sizes)
+        phases: Dict[Any, List[int]] = {}
+        for key, size in sizes.items():
+            logger.debug(f"Adaptive batch size of {key}: {int(size)} rows")
+            phase = key[0] if isinstance(key, tuple) else key
+            phases.setdefault(phase, []).append(int(size))
+        for phase, values in phases.items():
+            logger.info(
+                f"Adaptive batch sizes of {phase}: {min(values)}-{max(values)} rows "
+                f"across {len(values)} keys"
+            )
@@ -0,0 +1,201 @@
+"""
+Validation module for Neo4j data loading.
+
+This module contains the pre-flight check that validates a whole payload in
+one in-memory pass, without a database, and returns a machine-readable report
+of every problem that would otherwise surface record by record during writes.
+"""
+
+import logging
+import re
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from .queries import RELATIONSHIP_FIELDS
+from ..utils.cypher_utils import sanitize_label
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 63 - 1
+_LIST_ITEM_TYPES = {str, bool, int, float}
+
+
+def _property_error(value: Any) -> Optional[str]:
+    """
+    Check whether a value can be stored as a Neo4j property.
+
+    Args:
+        value: Property value from the payload
+
+    Returns:
+        Description of the problem, or None if the value can be stored
+    """
+    value_type = type(value)
+    if value is None or value_type in (str, bool, float):
+        return None
+    if value_type is int:
+        return None if _INT_MIN <= value <= _INT_MAX else "integer outside the 64-bit range"
+    if value_type is list:
+        item_types = {type(item) for item in value}
+        if not item_types <= _LIST_ITEM_TYPES:
+            return "lists may only contain strings, numbers or booleans"
+        if len(item_types) > 1:
+            return "lists must contain values of a single type"
+        if int in item_types and any(not _INT_MIN <= item <= _INT_MAX for item in value):
+            return "integer outside the 64-bit range"
+        return None
+    if value_type is dict:
+        return "maps cannot be stored as properties"
+    return f"unsupported value type {value_type.__name__}"
+
+
+class _Report:
+    """Accumulates validation problems."""
+
+    def __init__(self) -> None:
+        self.errors: List[Dict[str, Any]] = []
+        self.warnings: List[Dict[str, Any]] = []
+        self._label_cache: Dict[str, bool] = {}
+
+    def add(self, severity: str, kind: str, phase: str, index: int, message: str, **extra: Any) -> None:
+        target = self.errors if severity == "error" else self.warnings
+        target.append({"kind": kind, "phase": phase, "index": index, "message": message, **extra})
+
+    def valid_identifier(self, raw: Any) -> bool:
+        """Check, with caching, whether a label or type is usable once sanitized."""
+        if not isinstance(raw, str):
+            return False
+        valid = self._label_cache.get(raw)
+        if valid is None:
+            valid = self._label_cache[raw] = bool(_IDENTIFIER.match(sanitize_label(raw)))
+        return valid
+
+    def check_properties(
+        self, phase: str, index: int, record: Dict[str, Any], reserved: Iterable[str]
+    ) -> None:
+        for key, value in record.items():
+            if key in reserved:
+                continue
+            problem = _property_error(value)
+            if problem:
+                self.add("error", "invalid_property", phase, index, problem, field=key)
+
+
+def validate_payload(
+    nodes: Iterable[Dict[str, Any]], relationships: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Validate nodes and relationships in a single pass without a database.
+
+    Checks required fields, that labels and relationship types are valid
+    Cypher identifiers after sanitization, that every property value can be
+    stored by Neo4j, duplicate and ambiguous node names, and relationship
+    endpoints that reference no node in the payload. Nodes are consumed
+    before relationships, so both may be streaming iterators.
+
+    Args:
+        nodes: Node dictionaries
+        relationships: Relationship dictionaries
+
+    Returns:
+        Report with ``valid``, record counts, and ``errors`` and ``warnings``
+        lists; each problem has ``kind``, ``phase``, ``index`` and ``message``
+    """
+    report = _Report()
+    first_index: Dict[Tuple[str, Any], int] = {}
+    names: Dict[Any, str] = {}
+    nodes_count = 0
+    rels_count = 0
+
+    for index, node in enumerate(nodes):
+        nodes_count += 1
+        if not isinstance(node, dict):
+            report.add("error", "invalid_record", "nodes", index, "node must be an object")
+            continue
+
+        missing = [field for field in ("name", "node_type") if field not in node]
+        if missing:
+            report.add(
+                "error", "missing_field", "nodes", index,
+                f"missing required fields: {', '.join(missing)}", fields=missing,
+            )
+        name = node.get("name")
+        if "name" in node and (not isinstance(name, str) or not name):
+            report.add("error", "invalid_name", "nodes", index, "name must be a non-empty string")
+        if "node_type" in node and not report.valid_identifier(node["node_type"]):
+            report.add(
+                "error", "invalid_label", "nodes", index,
+                f"node_type {node['node_type']!r} is not a valid label", name=name,
+            )
+
+        report.check_properties("nodes", index, node, ("node_type",))
+
+        if missing or not isinstance(name, str):
+            continue
+        label = sanitize_label(node["node_type"]) if isinstance(node["node_type"], str) else None
+        key = (label, name)
+        if key in first_index:
+            report.add(
+                "warning", "duplicate_node", "nodes", index,
+                f"duplicate node {name!r}; properties are merged into the first",
+                name=name, first_index=first_index[key],
+            )
+            continue
+        first_index[key] = index
+        if name in names and names[name] != label:
+            report.add(
+                "warning", "ambiguous_name", "nodes", index,
+                f"name {name!r} is also used by a {names[name]} node; "
+                "relationships resolve it to the first",
+                name=name,
+            )
+        names.setdefault(name, label)
+
+    for index, rel in enumerate(relationships):
+        rels_count += 1
+        if not isinstance(rel, dict):
+            report.add("error", "invalid_record", "relationships", index, "relationship must be an object")
+            continue
+
+        missing = [field for field in RELATIONSHIP_FIELDS if field not in rel]
+        if missing:
+            report.add(
+                "error", "missing_field", "relationships", index,
+                f"missing required fields: {', '.join(missing)}", fields=missing,
+            )
+        if "relationship_type" in rel and not report.valid_identifier(rel["relationship_type"]):
+            report.add(
+                "error", "invalid_relationship_type", "relationships", index,
+                f"relationship_type {rel['relationship_type']!r} is not a valid type",
+            )
+        for field in ("start", "end"):
+            if field not in rel:
+                continue
+            if not isinstance(rel[field], str):
+                report.add(
+                    "error", "invalid_endpoint", "relationships", index,
+                    f"{field} must be a node name", field=field,
+                )
+            elif rel[field] not in names:
+                report.add(
+                    "error", "dangling_reference", "relationships", index,
+                    f"{field} {rel[field]!r} does not match any node", field=field,
+                )
+
+        report.check_properties("relationships", index, rel, RELATIONSHIP_FIELDS)
+
+    result = {
+        "valid": not report.errors,
+        "nodes": nodes_count,
+        "relationships": rels_count,
+        "error_count": len(report.errors),
+        "warning_count": len(report.warnings),
+        "errors": report.errors,
+        "warnings": report.warnings,
+    }
+    logger.info(
+        f"Validated {nodes_count} nodes and {rels_count} relationships: "
+        f"{len(report.errors)} errors, {len(report.warnings)} warnings"
+    )
+    return result
@@ -1,76 +1,65 @@
-import json
-from neo4j import GraphDatabase
+"""
+Legacy entry point for loading a JSON file into Neo4j.
+
+This module keeps the original ``load_data(json_file_path)`` function and
+script usage, running them on the shared Neo4jLoader so they send the same
+cached, parameterized batch statements as the main command line interface.
+"""
+
+import logging
 import os
+import sys
+from typing import Optional, Tuple
+
+from .core.loader import Neo4jLoader
+from .utils.file_utils import load_json_file
+
+logger = logging.getLogger(__name__)
+
+
+def load_data(
+    json_file_path: str,
+    uri: str = "bolt://localhost:7687",
+    user: str = "neo4j",
+    password: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Load a JSON file into Neo4j.
 
-def sanitize_label(label):
-    """Sanitize label by replacing spaces with underscores and removing special characters"""
-    return label.replace(' ', '_').replace('/', '_').replace('-', '_')
+    ``Entity_Type`` is stored as a node property, as it is by the main
+    loader, rather than as a second label.
 
-def load_data(json_file_path):
-    # Neo4j connection details
-    uri = "bolt://localhost:7687"
-    user = "neo4j"
-    password = "8aPaBe8X3mGEsYcXzvUhHwjrC9rV64LmrSVXIE_X-Wk"
-    
-    # Read JSON data
-    with open(json_file_path, 'r') as file:
-        data = json.load(file)
-    
-    # Connect to Neo4j
-    driver = GraphDatabase.driver(uri, auth=(user, password))
-    
+    Args:
+        json_file_path: Path to the JSON file
+        uri: The URI for the Neo4j database
+        user: Neo4j username
+        password: Neo4j password; read from NEO4J_PASSWORD if omitted
+
+    Returns:
+        Tuple containing count of created nodes and relationships
+    """
+    password = password or os.environ.get("NEO4J_PASSWORD")
+    if not password:
+        raise ValueError("Neo4j password not provided; set NEO4J_PASSWORD")
+
+    data = load_json_file(json_file_path)
+    loader = Neo4jLoader(uri, user, password, encrypted=False)
     try:
-        with driver.session() as session:
-            # Create nodes
-            for node in data['nodes']:
-                # Create labels from node_type
-                labels = [sanitize_label(node['node_type'])]
-                if 'Entity_Type' in node:
-                    labels.append(sanitize_label(node['Entity_Type']))
-                
-                # Create properties
-                properties = {k: v for k, v in node.items() if k not in ['node_type', 'Entity_Type']}
-                
-                # Create Cypher query
-                labels_str = ':'.join(labels)
-                properties_str = ', '.join(f"{k}: ${k}" for k in properties.keys())
-                query = f"MERGE (n:{labels_str} {{name: $name}}) SET n += {{{properties_str}}}"
-                
-                # Execute query
-                session.run(query, **properties)
-            
-            # Create relationships
-            for rel in data['relationships']:
-                # Create relationship properties
-                rel_properties = {k: v for k, v in rel.items() if k not in ['start', 'end', 'relationship_type']}
-                
-                # Create Cypher query
-                rel_type = sanitize_label(rel['relationship_type'])
-                properties_str = ', '.join(f"{k}: ${k}" for k in rel_properties.keys())
-                query = f"""
-                MATCH (start {{name: $start}})
-                MATCH (end {{name: $end}})
-                MERGE (start)-[r:{rel_type}]->(end)
-                SET r += {{{properties_str}}}
-                """
-                
-                # Execute query
-                session.run(query, start=rel['start'], end=rel['end'], **rel_properties)
-            
-            print(f"Successfully loaded data from {json_file_path}")
-            
+        counts = loader.load_data(data)
+        print(f"Successfully loaded data from {json_file_path}")
+        return counts
     finally:
-        driver.close()
+        loader.close()
+
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) != 2:
-        print("Usage: python load_data.py <json_file_path>")
+        print("Usage: python -m neo4j_loader.load_data <json_file_path>")
         sys.exit(1)
-    
+
     json_file_path = sys.argv[1]
     if not os.path.exists(json_file_path):
         print(f"Error: File {json_file_path} does not exist")
         sys.exit(1)
-    
-    load_data(json_file_path) 
\ No newline at end of file
+
+    load_data(json_file_path)
@@ -0,0 +1,3 @@
+"""
+Tests for the Neo4j data loader.
+"""
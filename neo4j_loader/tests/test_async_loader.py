@@ -0,0 +1,65 @@
+"""
+Tests for the asynchronous loader.
+"""
+
+import asyncio
+
+import pytest
+
+from ..benchmarks.fake_driver import AsyncFakeDriver, FakeDriver
+from ..core.async_loader import AsyncNeo4jLoader
+from ..core.checkpoint import Checkpoint
+from ..core.loader import Neo4jLoader
+from ..core.pool import gather_or_cancel
+from ..core.sizing import BatchSizer
+
+
+def _payload():
+    nodes = [
+        {"name": f"{label}{i}", "node_type": label, "rank": i}
+        for i in range(20)
+        for label in ("Person", "Company")
+    ]
+    relationships = [
+        {"start": f"Person{i}", "end": f"Company{(i * 7) % 20}", "relationship_type": "WORKS_AT"}
+        for i in range(20)
+    ]
+    return {"nodes": nodes, "relationships": relationships}
+
+
+def test_pipelined_load_with_sizer_and_checkpoint(tmp_path):
+    reference = FakeDriver()
+    Neo4jLoader.from_driver(reference, batch_size=3).load_data(_payload())
+
+    driver = AsyncFakeDriver()
+    loader = AsyncNeo4jLoader.from_driver(
+        driver, batch_size=3, max_in_flight=4, sizer=BatchSizer(3, target_latency=0.5)
+    )
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"), "input")
+    assert asyncio.run(loader.load_data(_payload(), checkpoint)) == (40, 20)
+
+    assert driver.graph.nodes == reference.graph.nodes
+    assert driver.graph.relationships == reference.graph.relationships
+    assert loader.metrics.as_dict()["phases"]["nodes"]["rows"] == 40
+
+
+def test_failed_batch_cancels_the_rest_of_its_round():
+    cancelled = []
+
+    async def slow(position):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(position)
+            raise
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("write failed")
+
+    async def run():
+        with pytest.raises(RuntimeError, match="write failed"):
+            await gather_or_cancel([slow(0), fail(), slow(2)])
+
+    asyncio.run(run())
+    assert sorted(cancelled) == [0, 2]
@@ -0,0 +1,58 @@
+"""
+Tests for the neo4j-admin import exporter.
+"""
+
+import csv
+import json
+
+from ..core.bulk_import import BulkImportExporter
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+def test_export_combines_repeats_and_types_lists(tmp_path):
+    payload = {
+        "nodes": [
+            {"name": "Ada", "node_type": "Person", "age": 36, "tags": ["a", "b"]},
+            42,
+            {"name": "Acme", "node_type": "Company", "ranks": [1, 2], "scores": [1, 2.5]},
+            {"name": "Ada", "node_type": "Person", "age": 37, "flags": [True, False]},
+        ],
+        "relationships": [
+            {"start": "Ada", "end": "Acme", "relationship_type": "WORKS_AT", "since": 1990},
+            {"start": "Ada", "end": "Nobody", "relationship_type": "WORKS_AT"},
+            {"start": "Ada", "end": "Acme", "relationship_type": "WORKS_AT", "role": "CEO"},
+        ],
+    }
+    input_path = tmp_path / "graph.json"
+    input_path.write_text(json.dumps(payload))
+    output_dir = tmp_path / "import"
+
+    assert BulkImportExporter(str(output_dir)).export(str(input_path)) == (2, 1)
+
+    assert _rows(output_dir / "nodes_Person_header.csv") == [
+        [":ID", "name:string", "age:long", "tags:string[]", "flags:boolean[]"]
+    ]
+    # The repeated node is written once, later values winning
+    assert _rows(output_dir / "nodes_Person.csv") == [["1", "Ada", "37", "a;b", "true;false"]]
+    assert _rows(output_dir / "nodes_Company_header.csv") == [
+        [":ID", "name:string", "ranks:long[]", "scores:double[]"]
+    ]
+    assert _rows(output_dir / "nodes_Company.csv") == [["2", "Acme", "1;2", "1;2.5"]]
+
+    assert _rows(output_dir / "relationships_WORKS_AT_header.csv") == [
+        [":START_ID", ":END_ID", "since:long", "role:string"]
+    ]
+    assert _rows(output_dir / "relationships_WORKS_AT.csv") == [["1", "2", "1990", "CEO"]]
+
+    lines = (output_dir / "import.args").read_text().splitlines()
+    assert lines[:2] == ["--multiline-fields=true", "--array-delimiter=;"]
+    assert sorted(lines[2:]) == [
+        f"--nodes=Company={output_dir / 'nodes_Company_header.csv'},{output_dir / 'nodes_Company.csv'}",
+        f"--nodes=Person={output_dir / 'nodes_Person_header.csv'},{output_dir / 'nodes_Person.csv'}",
+        "--relationships=WORKS_AT="
+        f"{output_dir / 'relationships_WORKS_AT_header.csv'},{output_dir / 'relationships_WORKS_AT.csv'}",
+    ]
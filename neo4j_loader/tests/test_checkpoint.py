@@ -0,0 +1,96 @@
+"""
+Tests for resuming loads from a checkpoint.
+"""
+
+import pytest
+
+from ..benchmarks.fake_driver import FakeDriver
+from ..core.checkpoint import Checkpoint
+from ..core.loader import Neo4jLoader
+from ..core.sizing import BatchSizer
+
+
+def _payload():
+    nodes = [
+        {"name": f"{label}{i}", "node_type": label, "rank": i}
+        for i in range(20)
+        for label in ("Person", "Company")
+    ]
+    relationships = [
+        {"start": f"Person{i}", "end": f"Company{(i * 7) % 20}", "relationship_type": "WORKS_AT"}
+        for i in range(20)
+    ]
+    return {"nodes": nodes, "relationships": relationships}
+
+
+def test_interrupted_pipelined_load_resumes(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    reference = FakeDriver()
+    Neo4jLoader.from_driver(reference, batch_size=3, workers=4).load_data(_payload())
+
+    driver = FakeDriver()
+    loader = Neo4jLoader.from_driver(driver, batch_size=3, workers=4)
+    write_rows = loader._write_relationship_rows
+    written = []
+
+    def fail_late(session, key, batch):
+        if len(written) >= 3:
+            raise RuntimeError("connection lost")
+        written.append(batch)
+        return write_rows(session, key, batch)
+
+    loader._write_relationship_rows = fail_late
+    with pytest.raises(RuntimeError):
+        loader.load_data(_payload(), Checkpoint(path, "input"))
+
+    offsets = Checkpoint(path, "input", resume=True).offsets
+    assert offsets["nodes"] > 0
+
+    sent = []
+    loader = Neo4jLoader.from_driver(driver, batch_size=3, workers=4)
+    write_nodes = loader._write_node_rows
+
+    def record(session, label, batch):
+        sent.extend(batch)
+        return write_nodes(session, label, batch)
+
+    loader._write_node_rows = record
+    loader.load_data(_payload(), Checkpoint(path, "input", resume=True))
+
+    assert len(sent) == 40 - offsets["nodes"]
+    assert driver.graph.nodes == reference.graph.nodes
+    assert driver.graph.relationships == reference.graph.relationships
+    assert not Checkpoint(path, "input", resume=True).offsets
+
+
+def test_checkpoint_keeps_adaptive_batch_sizes(tmp_path):
+    loader = Neo4jLoader.from_driver(FakeDriver(), batch_size=3, sizer=BatchSizer(3, target_latency=0.5))
+    write_rows = loader._write_node_rows
+    sizes = []
+
+    def record(session, label, batch):
+        sizes.append(len(batch))
+        return write_rows(session, label, batch)
+
+    loader._write_node_rows = record
+    loader.load_data(_payload(), Checkpoint(str(tmp_path / "checkpoint.json"), "input"))
+
+    # Checkpoint segments leave room for batches to grow past --batch-size
+    assert max(sizes) > 3
+
+
+def test_checkpoint_does_not_split_label_batches(tmp_path):
+    payload = {
+        "nodes": [{"name": f"n{i}", "node_type": f"Label{i % 20}"} for i in range(2000)],
+        "relationships": [
+            {"start": f"n{i}", "end": f"n{(i * 7) % 2000}", "relationship_type": f"TYPE{i % 5}"}
+            for i in range(2000)
+        ],
+    }
+    round_trips = []
+    for checkpoint in (None, Checkpoint(str(tmp_path / "checkpoint.json"), "input")):
+        driver = FakeDriver()
+        Neo4jLoader.from_driver(driver, batch_size=100).load_data(payload, checkpoint)
+        round_trips.append(driver.graph.round_trips)
+
+    assert round_trips[0] == round_trips[1]
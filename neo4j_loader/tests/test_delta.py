@@ -0,0 +1,61 @@
+"""
+Tests for incremental loading with a delta index.
+"""
+
+from ..benchmarks.fake_driver import FakeDriver
+from ..core.delta import DeltaIndex
+from ..core.loader import Neo4jLoader
+
+
+def _load(driver, payload, index_path):
+    delta = DeltaIndex(str(index_path), "bolt://test")
+    loader = Neo4jLoader.from_driver(driver, batch_size=10)
+    return loader.load_data(payload, delta=delta), delta
+
+
+def test_unresolved_relationship_is_sent_again(tmp_path):
+    driver = FakeDriver()
+    index_path = tmp_path / "delta.json"
+    rel = {"start": "A", "end": "B", "relationship_type": "KNOWS"}
+
+    # B is missing, so A -> B cannot be written yet
+    _load(driver, {"nodes": [{"name": "A", "node_type": "Person"}], "relationships": [rel]}, index_path)
+    assert not driver.graph.relationships
+
+    payload = {
+        "nodes": [
+            {"name": "A", "node_type": "Person"},
+            {"name": "B", "node_type": "Person"},
+        ],
+        "relationships": [rel],
+    }
+    (nodes, rels), delta = _load(driver, payload, index_path)
+    assert (nodes, rels) == (1, 1)
+    assert delta.stats["relationships"]["new"] == 1
+    assert len(driver.graph.relationships) == 1
+
+    # Everything is written now, so a third run sends nothing
+    (nodes, rels), delta = _load(driver, payload, index_path)
+    assert (nodes, rels) == (0, 0)
+    assert delta.stats["relationships"]["unchanged"] == 1
+
+
+def test_rejected_node_is_sent_again(tmp_path):
+    driver = FakeDriver()
+    index_path = tmp_path / "delta.json"
+    payload = {"nodes": [{"name": "A", "node_type": "Person"}], "relationships": []}
+
+    loader = Neo4jLoader.from_driver(driver, batch_size=10)
+    delta = DeltaIndex(str(index_path), "bolt://test")
+    failing = loader._create_node_batch_tx
+
+    def reject(tx, label, rows):
+        raise ValueError("rejected")
+
+    loader._create_node_batch_tx = reject
+    loader.load_data(payload, delta=delta)
+    loader._create_node_batch_tx = failing
+
+    (nodes, _), delta = _load(driver, payload, index_path)
+    assert nodes == 1
+    assert delta.stats["nodes"]["new"] == 1
@@ -0,0 +1,56 @@
+"""
+Tests for the transactional loader.
+"""
+
+from ..benchmarks.fake_driver import FakeDriver
+from ..core.loader import Neo4jLoader
+from ..core.queries import lookup_labels_query
+
+
+def test_endpoints_are_looked_up_per_label():
+    driver = FakeDriver(record_parameters=True)
+    loader = Neo4jLoader.from_driver(driver, batch_size=10)
+    loader.load_data({
+        "nodes": [
+            {"name": "Ada", "node_type": "Person"},
+            {"name": "Acme", "node_type": "Company"},
+        ],
+    })
+
+    # Neither endpoint is in the payload, so both are looked up in the database
+    rels = [{"start": "Ada", "end": "Acme", "relationship_type": "WORKS_AT"}]
+    loader.load_data({"nodes": [], "relationships": rels})
+
+    lookups = [query for query, parameters in driver.graph.statements if "names" in parameters]
+    assert len(lookups) == 1
+    assert "MATCH (n:Company {name: name})" in lookups[0]
+    assert "MATCH (n:Person {name: name})" in lookups[0]
+    assert "MATCH (n {" not in lookups[0]
+    assert driver.graph.relationships == {
+        ("WORKS_AT", ("Person", "Ada"), ("Company", "Acme"))
+    }
+
+
+def test_lookup_skips_labels_that_need_quoting():
+    assert lookup_labels_query(["Bad Label", "x-y"]) is None
+    assert "MATCH (n:Person " in lookup_labels_query(["Person", "Bad Label"])
+
+
+def test_failed_batches_are_not_counted_as_written_rows():
+    loader = Neo4jLoader.from_driver(FakeDriver(), batch_size=10)
+    create_batch = loader._create_node_batch_tx
+
+    def reject_bad(tx, label, rows):
+        if any(row["name"] == "bad" for row in rows):
+            raise ValueError("rejected")
+        return create_batch(tx, label, rows)
+
+    loader._create_node_batch_tx = reject_bad
+    names = ["a", "b", "bad", "c"]
+    loader.load_data({"nodes": [{"name": name, "node_type": "Person"} for name in names]})
+
+    # The batch of 4 fails, then its half of 2 and the bad row itself
+    totals = loader.metrics.as_dict()["phases"]["nodes"]
+    assert totals["rows"] == 3
+    assert totals["failed_batches"] == 3
+    assert totals["failed_rows"] == 4 + 2 + 1
@@ -0,0 +1,159 @@
+"""
+Tests for pipelined write scheduling.
+"""
+
+import threading
+import time
+
+from ..benchmarks.fake_driver import FakeDriver
+from ..core.graph import CompactGraph
+from ..core.loader import Neo4jLoader
+from ..core.pipeline import PipelineScheduler
+from ..core.queries import node_labels, relationship_batch_nodes
+
+
+def _plan(loader, payload, name_labels=None):
+    graph = CompactGraph.from_payload(payload)
+    labels = node_labels(graph.nodes)
+    labels.update(name_labels or {})
+    return loader._plan_pipeline(graph.nodes, graph.relationships, labels, None)
+
+
+class _Recorder:
+    """Wraps the loader's batch writers and checks the scheduling invariants."""
+
+    def __init__(self, loader, node_batches, relationship_batches, dependencies):
+        self.loader = loader
+        self.node_batches = node_batches
+        self.relationship_batches = relationship_batches
+        self.dependencies = dependencies
+        self.lock = threading.Lock()
+        self.busy_labels = set()
+        self.busy_keys = set()
+        self.committed = set()
+        self.events = []
+        self.max_labels_in_flight = 0
+
+    def write_node_batch(self, session, label, batch):
+        position = next(
+            position for position, (_, rows) in enumerate(self.node_batches) if rows is batch
+        )
+        with self.lock:
+            assert label not in self.busy_labels
+            self.busy_labels.add(label)
+            self.max_labels_in_flight = max(self.max_labels_in_flight, len(self.busy_labels))
+            self.events.append(("node", position))
+        time.sleep(0.002)
+        try:
+            return self.loader._write_node_batch(session, label, batch)
+        finally:
+            with self.lock:
+                self.busy_labels.discard(label)
+                self.committed.add(position)
+
+    def write_relationship_batch(self, session, key, batch):
+        position = next(
+            position for position, (_, rows) in enumerate(self.relationship_batches)
+            if rows is batch
+        )
+        keys = relationship_batch_nodes((key, batch))
+        with self.lock:
+            assert self.dependencies[position] <= self.committed
+            assert self.busy_keys.isdisjoint(keys)
+            self.busy_keys |= keys
+            self.events.append(("relationship", position))
+        time.sleep(0.002)
+        try:
+            return self.loader._write_relationship_batch(session, key, batch)
+        finally:
+            with self.lock:
+                self.busy_keys -= keys
+
+
+def test_scheduler_keeps_labels_keys_and_dependencies():
+    labels = ["Person", "Company", "City", "Tag"]
+    payload = {
+        "nodes": [
+            {"name": f"{label}{i}", "node_type": label} for label in labels for i in range(12)
+        ],
+        "relationships": [
+            {
+                "start": f"{labels[i // 12]}{i % 12}",
+                "end": f"{labels[(i // 12 + 1) % 4]}{(i * 5) % 12}",
+                "relationship_type": "LINKS",
+            }
+            for i in range(48)
+        ],
+    }
+    driver = FakeDriver()
+    loader = Neo4jLoader.from_driver(driver, batch_size=4, workers=6)
+    node_batches, relationship_batches, dependencies = _plan(loader, payload)
+    recorder = _Recorder(loader, node_batches, relationship_batches, dependencies)
+
+    counts = PipelineScheduler(driver, 6).run(
+        node_batches,
+        relationship_batches,
+        dependencies,
+        recorder.write_node_batch,
+        recorder.write_relationship_batch,
+    )
+
+    assert counts == (48, 48, 48)
+    assert len(driver.graph.relationships) == 48
+    assert recorder.max_labels_in_flight > 1
+    # Node batches of one label are written in their planned order
+    for label in labels:
+        positions = [
+            position for kind, position in recorder.events
+            if kind == "node" and node_batches[position][0] == label
+        ]
+        assert positions == sorted(positions)
+
+
+def test_relationship_batch_waits_only_for_its_endpoint_batches():
+    driver = FakeDriver()
+    loader = Neo4jLoader.from_driver(driver, batch_size=10, workers=3)
+    # Endpoints already in the database add no dependency
+    loader.load_data({"nodes": [{"name": "t1", "node_type": "Tag"}, {"name": "t2", "node_type": "Tag"}]})
+
+    payload = {
+        "nodes": [{"name": "Ada", "node_type": "Person"}, {"name": "Acme", "node_type": "Company"}],
+        "relationships": [
+            {"start": "Ada", "end": "Acme", "relationship_type": "WORKS_AT"},
+            {"start": "t1", "end": "t2", "relationship_type": "RELATED"},
+        ],
+    }
+    node_batches, relationship_batches, dependencies = _plan(
+        loader, payload, {"t1": "Tag", "t2": "Tag"}
+    )
+    person = next(p for p, (label, _) in enumerate(node_batches) if label == "Person")
+    works_at = next(p for p, (key, _) in enumerate(relationship_batches) if key[0] == "WORKS_AT")
+    related = next(p for p, (key, _) in enumerate(relationship_batches) if key[0] == "RELATED")
+    assert dependencies[related] == set()
+    assert person in dependencies[works_at]
+
+    recorder = _Recorder(loader, node_batches, relationship_batches, dependencies)
+    released = threading.Event()
+    write_node_batch = recorder.write_node_batch
+    write_relationship_batch = recorder.write_relationship_batch
+
+    def slow_person(session, label, batch):
+        # The Person batch holds WORKS_AT back until RELATED has run
+        if label == "Person":
+            assert released.wait(5)
+        return write_node_batch(session, label, batch)
+
+    def release(session, key, batch):
+        result = write_relationship_batch(session, key, batch)
+        if key[0] == "RELATED":
+            released.set()
+        return result
+
+    PipelineScheduler(driver, 3).run(
+        node_batches, relationship_batches, dependencies, slow_person, release
+    )
+
+    order = recorder.events
+    assert order.index(("relationship", related)) < order.index(("node", person))
+    assert order.index(("node", person)) < order.index(("relationship", works_at))
+    assert ("WORKS_AT", ("Person", "Ada"), ("Company", "Acme")) in driver.graph.relationships
@@ -0,0 +1,81 @@
+"""
+Tests for entity resolution.
+"""
+
+from ..core.binary import read_graph_file, write_graph_file
+from ..core.graph import CompactGraph
+from ..core.resolution import EntityResolver, strip_punctuation
+from ..core.validation import validate_payload
+
+
+def _names(payload):
+    return sorted(node["name"] for node in payload["nodes"])
+
+
+def _nodes(*names, label="Technology"):
+    return [{"name": name, "node_type": label} for name in names]
+
+
+def test_symbols_tell_names_apart():
+    resolved = EntityResolver().resolve({"nodes": _nodes("C++", "C#", "C", "c.")})
+    assert _names(resolved) == ["C", "C#", "C++"]
+
+
+def test_corporate_suffix_periods_are_dropped():
+    assert strip_punctuation("Tesla, Inc.") == "Tesla Inc"
+    assert strip_punctuation("Acme L.L.C.") == "Acme LLC"
+
+    resolved = EntityResolver().resolve({"nodes": _nodes("Tesla, Inc.", "Tesla Inc", label="Company")})
+    assert _names(resolved) == ["Tesla Inc"]
+
+
+def test_different_qualifiers_are_kept():
+    nodes = _nodes("Global (Distributed)", "Global (Social Media Cyberspace)", "Global", label="Location")
+    rel = {"start": "Acme", "end": "Global (Distributed)", "relationship_type": "LOCATED_IN"}
+    resolved = EntityResolver().resolve({"nodes": nodes, "relationships": [rel]})
+
+    assert _names(resolved) == ["Global", "Global (Distributed)", "Global (Social Media Cyberspace)"]
+    assert resolved["relationships"][0]["end"] == "Global (Distributed)"
+
+
+def test_single_qualifier_is_folded():
+    resolved = EntityResolver().resolve(
+        {"nodes": _nodes("Y Combinator (YC)", "Y Combinator", "y combinator.", label="Company")}
+    )
+    assert resolved["nodes"] == [
+        {
+            "name": "Y Combinator",
+            "node_type": "Company",
+            "aliases": ["Y Combinator (YC)", "y combinator."],
+        }
+    ]
+
+
+def test_malformed_records_are_left_for_validation():
+    payload = {
+        "nodes": [42, {"name": ["A"], "node_type": "Person"}, {"name": "B", "node_type": 7}]
+        + _nodes("A", label="Person"),
+        "relationships": ["A-B", {"start": ["A"], "end": "a", "relationship_type": "KNOWS"}],
+    }
+    resolved = EntityResolver().resolve(payload)
+
+    assert resolved["nodes"][0] == {"name": "A", "node_type": "Person"}
+    assert 42 in resolved["nodes"] and "A-B" in resolved["relationships"]
+    report = validate_payload(resolved["nodes"], resolved["relationships"])
+    assert {error["kind"] for error in report["errors"]} >= {"invalid_record", "invalid_name"}
+
+
+def test_mapped_graph_is_resolved_without_changing_it(tmp_path):
+    path = str(tmp_path / "input.graph")
+    write_graph_file(CompactGraph.from_payload({
+        "nodes": _nodes("Tesla, Inc.", "Tesla Inc", label="Company") + _nodes("Elon", label="Person"),
+        "relationships": [{"start": "Elon", "end": "Tesla, Inc.", "relationship_type": "RUNS"}],
+    }), path)
+    graph = read_graph_file(path)
+
+    resolved = EntityResolver().resolve_graph(graph)
+
+    assert [node["name"] for node in resolved.nodes] == ["Tesla Inc", "Elon"]
+    assert resolved.nodes[0]["aliases"] == ["Tesla, Inc."]
+    assert list(resolved.relationships)[0]["end"] == "Tesla Inc"
+    assert list(graph.relationships)[0]["end"] == "Tesla, Inc."
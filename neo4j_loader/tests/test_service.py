@@ -0,0 +1,47 @@
+"""
+Tests for the loader service.
+"""
+
+import pytest
+
+from ..benchmarks.fake_driver import FakeDriver
+from ..core.loader import Neo4jLoader
+from ..core.service import LoaderService
+
+
+def _job(*names):
+    return {"nodes": [{"name": name, "node_type": "Person"} for name in names]}
+
+
+def test_invalid_payload_is_rejected():
+    service = LoaderService(Neo4jLoader.from_driver(FakeDriver()), ensure_schema=False)
+
+    with pytest.raises(ValueError, match="nodes\\[0\\]"):
+        service.submit({"nodes": [42]})
+    assert not service.jobs()
+
+    # A relationship may reference a node an earlier job loaded
+    service.submit({"relationships": [{"start": "A", "end": "B", "relationship_type": "KNOWS"}]})
+    assert len(service.jobs()) == 1
+
+
+def test_failing_job_does_not_fail_its_group():
+    driver = FakeDriver()
+    loader = Neo4jLoader.from_driver(driver, batch_size=10)
+    load_data = loader.load_data
+
+    def fail_on_bad(payload, *args, **kwargs):
+        if any(node["name"] == "bad" for node in payload.get("nodes", [])):
+            raise RuntimeError("write failed")
+        return load_data(payload, *args, **kwargs)
+
+    loader.load_data = fail_on_bad
+    service = LoaderService(loader, ensure_schema=False, coalesce_window=1.0)
+    jobs = [service.submit(_job("A")), service.submit(_job("bad")), service.submit(_job("B"))]
+    service.start()
+    service.stop()
+
+    assert [job.status for job in jobs] == ["done", "failed", "done"]
+    assert jobs[1].error == "write failed"
+    assert jobs[0].group["jobs"] == [jobs[0].id]
+    assert {name for _, name in driver.graph.nodes} == {"A", "B"}
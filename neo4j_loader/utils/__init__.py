@@ -2,7 +2,28 @@
 Utility functions for Neo4j data loading.
 """
 
-from .file_utils import load_json_file
+from .file_utils import (
+    convert_to_ndjson,
+    find_json_files,
+    iter_json_array,
+    iter_json_arrays,
+    iter_json_batches,
+    iter_ndjson,
+    load_json_file,
+    open_input,
+    split_lines,
+)
 from .logging_utils import setup_logging
 
-__all__ = ["load_json_file", "setup_logging"] 
\ No newline at end of file
+__all__ = [
+    "convert_to_ndjson",
+    "find_json_files",
+    "iter_json_array",
+    "iter_json_arrays",
+    "iter_json_batches",
+    "iter_ndjson",
+    "load_json_file",
+    "open_input",
+    "setup_logging",
+    "split_lines",
+] 
\ No newline at end of file
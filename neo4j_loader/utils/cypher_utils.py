@@ -0,0 +1,19 @@
+"""
+Utility module for Cypher query construction.
+
+This module contains helpers shared by every component that builds Cypher
+statements from payload values.
+"""
+
+
+def sanitize_label(label: str) -> str:
+    """
+    Sanitize a node label or relationship type for use in a Cypher query.
+
+    Args:
+        label: Raw label or relationship type
+
+    Returns:
+        The label with special characters replaced by underscores
+    """
+    return label.replace("/", "_").replace(" ", "_")
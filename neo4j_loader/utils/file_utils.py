@@ -4,12 +4,47 @@ Utility module for file operations.
 This module contains functions for handling JSON file operations and data validation.
 """
 
+import glob
+import gzip
+import io
 import json
 import logging
-from typing import Dict, Any
+import lzma
+import os
+import sys
+from typing import Dict, Any, BinaryIO, IO, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# NDJSON files are split into shards of about this many bytes for parsing
+DEFAULT_SHARD_SIZE = 64 << 20
+
+# Path that reads NDJSON from standard input
+STDIN = "-"
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# Leading bytes of the compressed formats inputs are decompressed from
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+COMPRESSION_EXTENSIONS = (".gz", ".zst", ".xz")
+
+# NDJSON ``kind`` values and the arrays of the JSON format they belong to
+NDJSON_KINDS = {"node": "nodes", "relationship": "relationships"}
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = tuple(_WHITESPACE + ",]}")
+
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """
@@ -26,7 +61,7 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         json.JSONDecodeError: If the file isn't valid JSON
     """
     try:
-        with open(file_path, "r") as file:
+        with open_input(file_path, text=True) as file:
             data = json.load(file)
         logger.info(f"Successfully loaded JSON file: {file_path}")
         return data
@@ -35,4 +70,501 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         raise
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON file {file_path}: {e}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+
+def find_json_files(directory: str, pattern: str = "*.json") -> List[str]:
+    """
+    Find the input files in a directory.
+
+    Args:
+        directory: Directory to search
+        pattern: Glob pattern relative to the directory; ``**`` matches
+            subdirectories
+
+    Returns:
+        Sorted list of matching file paths
+
+    Raises:
+        FileNotFoundError: If the directory doesn't exist or nothing matches
+    """
+    if not os.path.isdir(directory):
+        logger.error(f"Directory not found: {directory}")
+        raise FileNotFoundError(directory)
+
+    paths = sorted(
+        path for path in glob.glob(os.path.join(directory, pattern), recursive=True)
+        if os.path.isfile(path)
+    )
+    if not paths:
+        logger.error(f"No files matching {pattern} in {directory}")
+        raise FileNotFoundError(os.path.join(directory, pattern))
+    return paths
+
+
+class _JsonStreamReader:
+    """Incremental reader over the top-level object of a JSON document."""
+
+    def __init__(self, file: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text."""
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at EOF."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def _expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``."""
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def _decode(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the end of the buffer may continue in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and self.buffer[end:end + 1] not in _DELIMITERS
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def _iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._peek() == "]":
+                self.pos += 1
+                return
+            self._expect(",")
+
+    def iter_key(self, key: str) -> Iterator[Any]:
+        """
+        Yield the elements of the array stored under ``key``.
+
+        Values under other keys are skipped; arrays are skipped element by
+        element so they are never held in memory as a whole.
+        """
+        for _, element in self.iter_keys((key,)):
+            yield element
+
+    def iter_keys(self, keys: Tuple[str, ...]) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield the elements of the arrays stored under ``keys`` in one pass.
+
+        Elements are yielded in document order together with their key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            name = self._decode()
+            self._expect(":")
+            is_array = self._peek() == "["
+            if name in keys and is_array:
+                for element in self._iter_array():
+                    yield name, element
+            elif is_array:
+                for _ in self._iter_array():
+                    pass
+            else:
+                self._decode()
+            if self._peek() == "}":
+                return
+            self._expect(",")
+
+
+def iter_json_array(
+    file_path: str, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse one top-level array of a JSON file.
+
+    Only the current element and a read buffer of ``chunk_size`` characters
+    are kept in memory, regardless of the size of the file. For an NDJSON
+    file, the records of the matching kind are yielded instead.
+
+    Args:
+        file_path: Path to the JSON file
+        key: Top-level key of the array, e.g. ``nodes`` or ``relationships``
+        chunk_size: Number of characters read from the file at a time
+
+    Yields:
+        Elements of the array
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file isn't valid JSON
+    """
+    if is_ndjson(file_path):
+        for name, record in iter_ndjson(file_path):
+            if name == key:
+                yield record
+        return
+    try:
+        with open_input(file_path, text=True) as file:
+            yield from _JsonStreamReader(file, chunk_size).iter_key(key)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        raise
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON file {file_path}: {e}")
+        raise
+
+
+def iter_json_arrays(
+    file_path: str, keys: Tuple[str, ...], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse several top-level arrays of a JSON file in one pass.
+
+    Unlike calling :func:`iter_json_array` once per key, the file is read
+    and decoded only once. NDJSON files and standard input are read like
+    in :func:`iter_json_array`.
+
+    Args:
+        file_path: Path to the JSON file
+        keys: Top-level keys of the arrays, e.g. ``("nodes", "relationships")``
+        chunk_size: Number of characters read from the file at a time
+
+    Yields:
+        Tuples of the key and an element of its array, in document order
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file isn't valid JSON
+    """
+    if is_ndjson(file_path):
+        for name, record in iter_ndjson(file_path):
+            if name in keys:
+                yield name, record
+        return
+    try:
+        with open_input(file_path, text=True) as file:
+            yield from _JsonStreamReader(file, chunk_size).iter_keys(keys)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        raise
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON file {file_path}: {e}")
+        raise
+
+
+def iter_json_batches(
+    file_path: str, key: str, batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Incrementally parse one top-level array of a JSON file in fixed-size batches.
+
+    Args:
+        file_path: Path to the JSON file
+        key: Top-level key of the array, e.g. ``nodes`` or ``relationships``
+        batch_size: Maximum number of elements per batch
+
+    Yields:
+        Lists of at most ``batch_size`` elements
+    """
+    batch: List[Dict[str, Any]] = []
+    for item in iter_json_array(file_path, key):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def is_ndjson(file_path: str) -> bool:
+    """
+    Check whether an input path holds NDJSON records.
+
+    Standard input and files ending in ``.ndjson`` or ``.jsonl``, also
+    before a compression extension such as ``.gz``, are read as NDJSON;
+    other files as one JSON document.
+
+    Args:
+        file_path: Input path, or ``-`` for standard input
+
+    Returns:
+        True if the input is read line by line
+    """
+    if file_path == STDIN:
+        return True
+    name, extension = os.path.splitext(file_path.lower())
+    if extension in COMPRESSION_EXTENSIONS:
+        return name.endswith(NDJSON_EXTENSIONS)
+    return extension in NDJSON_EXTENSIONS
+
+
+def split_lines(
+    file_path: str, shard_size: int = DEFAULT_SHARD_SIZE
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split an NDJSON file into byte ranges that start and end on line boundaries.
+
+    Each range can be parsed on its own by :func:`iter_ndjson`, so large
+    files can be parsed by several processes. Standard input, JSON documents,
+    compressed files and files smaller than ``shard_size`` form a single range.
+
+    Args:
+        file_path: Input path
+        shard_size: Approximate number of bytes per range
+
+    Returns:
+        ``(start, end)`` byte offsets in file order; the last end is None
+    """
+    if not is_ndjson(file_path) or file_path == STDIN or compression(file_path):
+        return [(0, None)]
+
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as file:
+        for offset in range(shard_size, size, shard_size):
+            if offset <= boundaries[-1]:
+                continue
+            # A range ends after the line running across its nominal end
+            file.seek(offset)
+            file.readline()
+            if file.tell() >= size:
+                break
+            boundaries.append(file.tell())
+
+    ends: List[Optional[int]] = boundaries[1:]
+    return list(zip(boundaries, ends + [None]))
+
+
+def _open_binary(file_path: str) -> BinaryIO:
+    """Open an input path for reading bytes; ``-`` is standard input."""
+    if file_path == STDIN:
+        return os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+    return open(file_path, "rb")
+
+
+def _detect_compression(head: bytes) -> Optional[str]:
+    """Get the compression format whose magic bytes start a header."""
+    for magic, name in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def compression(file_path: str) -> Optional[str]:
+    """
+    Detect the compression of a file from its leading bytes.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        ``gzip``, ``zstd`` or ``xz``, or None for an uncompressed file
+    """
+    with open(file_path, "rb") as file:
+        return _detect_compression(file.read(8))
+
+
+class _DecompressedInput(io.RawIOBase):
+    """Decompressed bytes of an input, closing the input along with it."""
+
+    def __init__(self, stream: BinaryIO, source: BinaryIO) -> None:
+        self.stream = stream
+        self.source = source
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        return self.stream.readinto(buffer)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self.stream.close()
+            finally:
+                self.source.close()
+        super().close()
+
+
+def _decompress(source: BinaryIO, name: str, file_path: str) -> BinaryIO:
+    """Wrap a compressed input in a stream of its decompressed bytes."""
+    if name == "gzip":
+        stream = gzip.GzipFile(fileobj=source, mode="rb")
+    elif name == "xz":
+        stream = lzma.LZMAFile(source, mode="rb")
+    elif zstandard is None:
+        raise ValueError(
+            f"{file_path} is zstd-compressed; install the zstandard package to read it"
+        )
+    else:
+        stream = zstandard.ZstdDecompressor().stream_reader(source, read_across_frames=True)
+    return io.BufferedReader(_DecompressedInput(stream, source), DEFAULT_CHUNK_SIZE)
+
+
+def open_input(file_path: str, text: bool = False) -> IO[Any]:
+    """
+    Open an input path, decompressing gzip, zstd and xz data on the fly.
+
+    The compression is detected from the leading bytes rather than the file
+    name, and data is decompressed as it is read, so a compressed input is
+    read from disk once and never held in memory as a whole. Reading zstd
+    data needs the optional ``zstandard`` package.
+
+    Args:
+        file_path: Input path, or ``-`` for standard input
+        text: Whether to decode the bytes as UTF-8 text
+
+    Returns:
+        Readable file object; a compressed input is not seekable
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the input is zstd-compressed and zstandard is missing
+    """
+    source = _open_binary(file_path)
+    try:
+        name = _detect_compression(source.peek(8)[:8])
+        stream = _decompress(source, name, file_path) if name else source
+    except BaseException:
+        source.close()
+        raise
+    if name:
+        logger.debug(f"Decompressing {name} input {file_path}")
+    if not text:
+        return stream
+    # Uncompressed files keep the default encoding of open()
+    return io.TextIOWrapper(stream, encoding="utf-8" if name else None)
+
+
+def iter_ndjson(
+    file_path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse NDJSON records, one line at a time.
+
+    Every line holds a node or relationship object tagged with a ``kind``
+    field of ``node`` or ``relationship``; the field is removed from the
+    yielded record. Blank lines are ignored and lines of another kind are
+    skipped with a warning.
+
+    Args:
+        file_path: Path to the NDJSON file, or ``-`` for standard input;
+            compressed inputs are decompressed as they are read
+        start: Byte offset of the first line to read
+        end: Byte offset after which no line starts, or None for the end of
+            the file
+
+    Yields:
+        Tuples of the array key of the record, ``nodes`` or
+        ``relationships``, and the record
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If a line isn't valid JSON
+    """
+    try:
+        with open_input(file_path) as file:
+            if start:
+                file.seek(start)
+            offset = start
+            for line in file:
+                if end is not None and offset >= end:
+                    break
+                line_start = offset
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(
+                        f"Invalid NDJSON line at byte {line_start} of {file_path}: {e}"
+                    )
+                    raise
+                kind = record.pop("kind", None) if isinstance(record, dict) else None
+                key = NDJSON_KINDS.get(kind) if isinstance(kind, str) else None
+                if key is None:
+                    logger.warning(
+                        f"Skipping NDJSON line at byte {line_start} of {file_path} "
+                        f"without a node or relationship kind"
+                    )
+                    continue
+                yield key, record
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        raise
+
+
+def convert_to_ndjson(file_path: str, output_path: str) -> Tuple[int, int]:
+    """
+    Convert a JSON file with ``nodes`` and ``relationships`` arrays to NDJSON.
+
+    The input is parsed incrementally and every record is written as one
+    line with its ``kind``, in document order. Records that are not objects
+    or already have a ``kind`` field are skipped with a warning.
+
+    Args:
+        file_path: Path to the JSON file
+        output_path: Path of the NDJSON file, or ``-`` for standard output
+
+    Returns:
+        Tuple containing the number of nodes and relationships written
+    """
+    kinds = {key: kind for kind, key in NDJSON_KINDS.items()}
+    counts = {key: 0 for key in kinds}
+    output = sys.stdout if output_path == STDIN else open(output_path, "w")
+    try:
+        for key, record in iter_json_arrays(file_path, tuple(kinds)):
+            if not isinstance(record, dict) or "kind" in record:
+                # NDJSON reserves the kind field, and every line is an object
+                logger.warning(
+                    f"Skipping {key} record that cannot be tagged with a kind: {record}"
+                )
+                continue
+            line = json.dumps({"kind": kinds[key], **record}, ensure_ascii=False, default=str)
+            output.write(line)
+            output.write("\n")
+            counts[key] += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    logger.info(
+        f"Converted {counts['nodes']} nodes and {counts['relationships']} "
+        f"relationships from {file_path} to {output_path}"
+    )
+    return counts["nodes"], counts["relationships"]